@@ -10,11 +10,16 @@ from . import lending
 from . import staking
 from . import algofi_client
 from . import algofi_user
+from . import arbitrage
+from . import archive
 from . import asset_amount
 from . import asset_config
+from . import decoding
 from . import globals
+from . import router
 from . import state_utils
 from . import transaction_utils
+from . import transport
 from . import utils
 
 # metadata
@@ -26,11 +31,16 @@ __all__ = [
     "governance",
     "algofi_client",
     "algofi_user",
+    "arbitrage",
+    "archive",
     "asset_amount",
     "asset_config",
+    "decoding",
     "globals",
+    "router",
     "state_utils",
     "transaction_utils",
+    "transport",
     "utils",
 ]
 __version__ = "2.5.0"
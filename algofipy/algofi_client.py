@@ -1,11 +1,18 @@
 # IMPORTS
 
 # external
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from algosdk.v2client.indexer import IndexerClient
 
 # local
 from .algofi_user import AlgofiUser
+from .arbitrage import ArbitrageScanner
+from .archive import ArchiveIndexer
 from .asset_config import ASSET_CONFIGS
+from .decoding import get_decoder
+from .globals import DEFAULT_HISTORICAL_INDEXER_ADDRESS
+from .router import Router
+from .transport import Transport
 
 # lending
 from .lending.v2.lending_client import LendingClient
@@ -16,7 +23,16 @@ from .governance.v1.governance_client import GovernanceClient
 
 
 class AlgofiClient:
-    def __init__(self, network, algod, indexer):
+    def __init__(
+        self,
+        network,
+        algod,
+        indexer,
+        transport=None,
+        decoder=None,
+        historical_indexer=None,
+        historical_cache_path=None,
+    ):
         """A client for the algofi protocol
 
         :param network: a network configuration key
@@ -25,15 +41,46 @@ class AlgofiClient:
         :type algod: :class:`AlgodClient`
         :param indexer: Algorand indexer client
         :type indexer: :class:`IndexerClient`
+        :param transport: pooled http transport shared by all network clients
+        :type transport: :class:`Transport`, optional
+        :param decoder: response decode backend (e.g. "json" or "fast")
+        :type decoder: :class:`DecodeBackend` or :class:`Decoder`, optional
+        :param historical_indexer: indexer used for queries at a past block, given as an indexer
+            address, an indexer client or a local :class:`ArchiveIndexer`. Defaults to the public
+            AlgoExplorer archive indexer.
+        :type historical_indexer: str or :class:`IndexerClient` or :class:`ArchiveIndexer`, optional
+        :param historical_cache_path: directory in which historical lookups are archived so that
+            repeated queries are served from disk
+        :type historical_cache_path: str, optional
         """
 
         self.network = network
         self.algod = algod
         self.indexer = indexer
-        # load AlgoExplorer historical indexer
-        self.historical_indexer = IndexerClient(
-            "", "https://indexer.algoexplorerapi.io/", headers={"User-Agent": "algosdk"}
-        )
+        # load historical indexer
+        if historical_indexer is None:
+            historical_indexer = DEFAULT_HISTORICAL_INDEXER_ADDRESS
+        if isinstance(historical_indexer, str):
+            historical_indexer = IndexerClient(
+                "", historical_indexer, headers={"User-Agent": "algosdk"}
+            )
+        if historical_cache_path is not None:
+            historical_indexer = ArchiveIndexer(
+                historical_cache_path, fallback=historical_indexer
+            )
+        self.historical_indexer = historical_indexer
+
+        # route algod, indexer and analytics calls over pooled keep-alive sessions
+        self.transport = transport if transport is not None else Transport()
+        if decoder is not None:
+            self.transport.decoder = get_decoder(decoder)
+        self.transport.mount(self.algod)
+        self.transport.mount(self.indexer)
+        if isinstance(self.historical_indexer, ArchiveIndexer):
+            if self.historical_indexer.fallback is not None:
+                self.transport.mount(self.historical_indexer.fallback)
+        else:
+            self.transport.mount(self.historical_indexer)
 
         # assets
         self.assets = ASSET_CONFIGS[self.network]
@@ -53,6 +100,12 @@ class AlgofiClient:
         # governance
         self.governance = GovernanceClient(self)
 
+        # swap routing across amm pools and lending pool interfaces
+        self.router = Router(self)
+
+        # cyclic arbitrage over the router asset graph
+        self.arbitrage_scanner = ArbitrageScanner(self)
+
     def get_user(self, address):
         """Creates an :class:`AlgofiUser` object for specific address
 
@@ -63,3 +116,92 @@ class AlgofiClient:
         """
 
         return AlgofiUser(self, address)
+
+    def iter_users(self, addresses, max_workers=None, refresh_protocol=True):
+        """Loads :class:`AlgofiUser` objects for many addresses concurrently, yielding each
+        user as soon as it is loaded. Protocol state (markets, staking contracts) is loaded
+        at most once up front and shared by every user rather than reloaded per user. A user
+        that fails to load (e.g. closed account, indexer error or timeout) is yielded with the
+        raised exception instead of the user, so one bad address does not end the stream and
+        failed addresses can be retried.
+
+        :param addresses: user wallet addresses
+        :type addresses: iterable
+        :param max_workers: number of users loaded in parallel, defaults to the transport pool size
+        :type max_workers: int, optional
+        :param refresh_protocol: reload the lending and staking protocol state before loading users
+        :type refresh_protocol: bool, optional
+        :return: generator of (address, :class:`AlgofiUser` or exception) tuples, in completion order
+        :rtype: generator
+        """
+
+        if refresh_protocol:
+            self.lending.load_state()
+            self.staking.load_state()
+
+        def get_result(future):
+            try:
+                return (pending[future], future.result())
+            except Exception as e:
+                return (pending[future], e)
+
+        max_workers = max_workers or self.transport.pool_size
+        addresses = iter(addresses)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # keep a bounded window of requests in flight so large address lists
+            # are not materialized as futures all at once
+            # future -> address
+            pending = {}
+            for address in addresses:
+                future = executor.submit(
+                    AlgofiUser, self, address, refresh_protocol=False
+                )
+                pending[future] = address
+                if len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield get_result(future)
+                        del pending[future]
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield get_result(future)
+                    del pending[future]
+
+    def get_users(
+        self, addresses, max_workers=None, refresh_protocol=True, errors=None
+    ):
+        """Loads :class:`AlgofiUser` objects for many addresses concurrently, see
+        :meth:`iter_users`
+
+        :param addresses: user wallet addresses
+        :type addresses: list
+        :param max_workers: number of users loaded in parallel, defaults to the transport pool size
+        :type max_workers: int, optional
+        :param refresh_protocol: reload the lending and staking protocol state before loading users
+        :type refresh_protocol: bool, optional
+        :param errors: dict filled with address -> exception for the users that failed to load,
+            if not provided any failure raises once every user has been loaded
+        :type errors: dict, optional
+        :return: dict of address -> :class:`AlgofiUser` for the loaded users
+        :rtype: dict
+        """
+
+        addresses = list(addresses)
+        users = {}
+        failures = {}
+        for address, result in self.iter_users(
+            addresses, max_workers=max_workers, refresh_protocol=refresh_protocol
+        ):
+            if isinstance(result, Exception):
+                failures[address] = result
+            else:
+                users[address] = result
+
+        if failures:
+            if errors is None:
+                raise Exception(
+                    "Error: failed to load users " + ", ".join(map(str, failures))
+                ) from next(iter(failures.values()))
+            errors.update(failures)
+        return {address: users[address] for address in addresses if address in users}
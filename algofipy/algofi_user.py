@@ -11,34 +11,56 @@ from .state_utils import *
 
 
 class AlgofiUser:
-    def __init__(self, algofi_client, address):
+    def __init__(
+        self, algofi_client, address, account_info=None, refresh_protocol=True
+    ):
         """The python representation of an algofi user
 
         :param algofi_client: a client for the algofi protocol
         :type algofi_client: :class:`AlgofiClient`
         :param address: user wallet address
         :type address: str
+        :param account_info: prefetched account info of the user wallet
+        :type account_info: dict, optional
+        :param refresh_protocol: reload the market and staking contract state the user touches,
+            otherwise the protocol state already loaded on the client is used
+        :type refresh_protocol: bool, optional
         """
 
         self.algofi_client = algofi_client
         self.address = address
 
+        # fetch the account once and share it with every subsystem
+        if account_info is None:
+            account_info = self.get_account_info()
+        self.balances = format_balances(account_info)
+
         # lending
-        self.lending = LendingUser(self.algofi_client.lending, self.address)
+        self.lending = LendingUser(
+            self.algofi_client.lending,
+            self.address,
+            account_info=account_info,
+            refresh_markets=refresh_protocol,
+        )
 
         # staking
         self.staking = StakingUser(self.algofi_client.staking, self.address)
+        self.staking.load_state(
+            account_info=account_info, refresh_staking=refresh_protocol
+        )
 
         # governance
-        self.governance = GovernanceUser(self.algofi_client.governance, self.address)
+        self.governance = GovernanceUser(
+            self.algofi_client.governance, self.address, account_info=account_info
+        )
 
-        self.load_state()
+    def get_account_info(self, block=None):
+        """Fetches the account info (balances and local states) of the user wallet
 
-    def load_state(self, block=None):
-        """Populates state on the :class:`AlgofiUser` object
-
-        :param block: block at which to query algofi user's state
+        :param block: block at which to query algofi user's account info
         :type block: int, optional
+        :return: account info dict
+        :rtype: dict
         """
 
         indexer = (
@@ -46,16 +68,37 @@ class AlgofiUser:
             if block
             else self.algofi_client.indexer
         )
-        self.balances = get_balances(indexer, self.address, block=block)
+        return get_account_info(
+            indexer, self.address, exclude="created-apps,created-assets", block=block
+        )
+
+    def load_state(self, block=None, account_info=None, refresh_protocol=True):
+        """Populates state on the :class:`AlgofiUser` object
+
+        :param block: block at which to query algofi user's state
+        :type block: int, optional
+        :param account_info: prefetched account info of the user wallet, fetched if not provided
+        :type account_info: dict, optional
+        :param refresh_protocol: reload the market and staking contract state the user touches
+        :type refresh_protocol: bool, optional
+        """
+
+        if account_info is None:
+            account_info = self.get_account_info(block=block)
+        self.balances = format_balances(account_info)
 
         # lending
-        self.lending.load_state(block=block)
+        self.lending.load_state(
+            block=block, account_info=account_info, refresh_markets=refresh_protocol
+        )
 
         # staking
-        self.staking.load_state(block=block)
+        self.staking.load_state(
+            block=block, account_info=account_info, refresh_staking=refresh_protocol
+        )
 
         # goverannce
-        self.governance.load_state(block=block)
+        self.governance.load_state(block=block, account_info=account_info)
 
     def is_opted_in_to_asset(self, asset_id):
         """Checks if user is opted is into a given asset
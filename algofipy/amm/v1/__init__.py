@@ -3,7 +3,18 @@ from . import amm_client
 from . import amm_config
 from . import approval_programs
 from . import asset
+from . import asset_registry
 from . import balance_delta
+from . import batch_quote
+from . import depth_table
 from . import logic_sig_generator
+from . import lp_valuation
 from . import pool
+from . import pool_analytics
+from . import pool_registry
+from . import pool_state
+from . import pool_tracker
+from . import price_feed
+from . import stable_swap_engine
 from . import stable_swap_math
+from . import swap_bounds
@@ -1,7 +1,8 @@
 # IMPORTS
 
 # external
-from algosdk import logic
+import time
+from concurrent.futures import ThreadPoolExecutor
 from .amm_config import (
     Network,
     POOL_STRINGS,
@@ -13,17 +14,30 @@ from .amm_config import (
     NANOSWAP_LENDING_POOLS_ASSET_PAIR_TO_APP_ID,
     CONSTANT_PRODUCT_LENDING_POOLS_ASSET_PAIR_TO_APP_ID,
     get_pool_type,
+    get_validator_index,
     PoolType,
 )
-from algofipy.state_utils import get_accounts_opted_into_app, format_state
-from .logic_sig_generator import generate_logic_sig
+from algofipy.state_utils import (
+    get_accounts_opted_into_app,
+    get_application_info,
+    format_state,
+)
+from .logic_sig_generator import get_logic_sig_address, get_logic_sig_addresses
 from .pool import Pool
 from .asset import Asset
+from .asset_registry import AssetRegistry
+from .price_feed import PriceFeed
+from .lp_valuation import LPValuation
+from .pool_registry import PoolRegistry
+from .stable_swap_engine import StableSwapEngine
 
 # local
 
 # INTERFACE
 
+# constants
+DEFAULT_POOL_POLL_INTERVAL = 30
+
 
 class AMMClient:
     def __init__(self, algofi_client):
@@ -52,8 +66,29 @@ class AMMClient:
             else TESTNET_NANOSWAP_POOLS_ASSET_PAIR_TO_APP_ID
         )
 
-    def get_pool(self, pool_type, asset1_id, asset2_id):
-        """Returns a :class:`Pool` object for given assets and pool_type
+        # shared asset metadata
+        self.asset_registry = AssetRegistry(self)
+
+        # shared dollar prices
+        self.price_feed = PriceFeed(self)
+
+        # local LP token prices from pool state
+        self.lp_valuation = LPValuation(self)
+
+        # memoized stableswap solves shared by nanoswap pools
+        self.stable_swap_engine = StableSwapEngine()
+
+        # loaded pools
+        self.pool_registry = PoolRegistry(self)
+        # last round covered by constant product pool discovery
+        self.last_pool_scan_round = None
+        # addresses of accounts opted into the constant product pool manager, None until scanned
+        self.pool_addresses = None
+
+    def get_pool(self, pool_type, asset1_id, asset2_id, refresh=True):
+        """Returns a :class:`Pool` object for given assets and pool_type with freshly loaded
+        state. Active pools are shared through the pool registry, so an already registered pool
+        has its state reloaded rather than being rebuilt.
 
         :param pool_type: a :class:`PoolType` object for the type of pool (e.g. 30bp, 100bp fee)
         :type pool_type: :class:`PoolType`
@@ -61,22 +96,16 @@ class AMMClient:
         :type asset1_id: int
         :param asset2_id: asset 2 id
         :type asset2_id: int
+        :param refresh: reload the state of an already registered pool, set to False to return
+            it with the state it was last loaded with
+        :type refresh: bool, optional
         :return: a :class:`Pool` object for given assets and pool_type
         :rtype: :class:`Pool`
         """
 
-        if asset1_id == asset2_id:
-            raise Exception("Invalid assets. must be different")
-
-        asset1 = Asset(self, asset1_id)
-        asset2 = Asset(self, asset2_id)
-
-        if asset1_id < asset2_id:
-            pool = Pool(self.algofi_client.amm, pool_type, asset1, asset2)
-        else:
-            pool = Pool(self.algofi_client.amm, pool_type, asset2, asset1)
-
-        return pool
+        return self.pool_registry.get_pool(
+            pool_type, asset1_id, asset2_id, refresh=refresh
+        )
 
     def get_asset(self, asset_id):
         """Returns an :class:`Asset` object representing the asset with given asset id
@@ -87,61 +116,278 @@ class AMMClient:
         :rtype: :class:`Asset`
         """
 
-        asset = Asset(self, asset_id)
-        return asset
+        return self.asset_registry.get_asset(asset_id)
 
-    def get_constant_product_pools(self):
-        """Returns a dict of valid constant product pools with relevant data
+    def validate_pool_account(self, account_data):
+        """Validates an account opted into the constant product pool manager as a pool
+        logic sig account
+
+        :param account_data: indexer account data of an account opted into the manager
+        :type account_data: dict
+        :return: tuple of pool type, asset 1 id, asset 2 id, pool app id and the logic sig
+            manager local state, None if the account is not a valid pool logic sig
+        :rtype: tuple
+        """
+
+        # process account data
+        account_local_state = account_data.get("apps-local-state", [])
+        if len(account_local_state) != 1:
+            return None
+        manager_app_local_state = format_state(
+            account_local_state[0].get("key-value", [])
+        )
+
+        # get pool metadata from manager local state
+        asset1_id = manager_app_local_state.get(POOL_STRINGS.asset1_id, "")
+        asset2_id = manager_app_local_state.get(POOL_STRINGS.asset2_id, "")
+        validator_index = manager_app_local_state.get(POOL_STRINGS.validator_index, "")
+        pool_app_id = manager_app_local_state.get(POOL_STRINGS.pool, "")
+        pool_type = get_pool_type(self.network, validator_index)
+
+        # check logic sig equality to ensure no duplicate pools
+        address = get_logic_sig_address(
+            asset1_id, asset2_id, self.manager_application_id, validator_index
+        )
+        if address != account_data.get("address", None):
+            return None
+
+        return (pool_type, asset1_id, asset2_id, pool_app_id, manager_app_local_state)
 
+    def load_constant_product_pools(self, pool_accounts):
+        """Loads constant product pools from the indexer data of accounts opted into the
+        pool manager. Pools are built from the scanned manager local state, with asset
+        metadata and pool application info fetched concurrently.
+
+        :param pool_accounts: indexer account data of accounts opted into the manager
+        :type pool_accounts: list
         :return: dict mapping pool app id -> :class:`Pool`
         :rtype: dict
         """
 
-        def validate_pool(account_data):
-            # process account data
-            account_local_state = account_data.get("apps-local-state", [])
-            if len(account_local_state) > 1:
-                return None
-            manager_app_local_state = format_state(account_local_state[0]["key-value"])
-
-            # get pool metadata from manager local state
-            asset1_id = manager_app_local_state.get(POOL_STRINGS.asset1_id, "")
-            asset2_id = manager_app_local_state.get(POOL_STRINGS.asset2_id, "")
-            validator_index = manager_app_local_state.get(
-                POOL_STRINGS.validator_index, ""
+        pool_data = list(
+            filter(
+                lambda x: x != None,
+                [self.validate_pool_account(account) for account in pool_accounts],
             )
-            pool_app_id = manager_app_local_state.get(POOL_STRINGS.pool, "")
-            pool_type = get_pool_type(self.network, validator_index)
+        )
 
-            # check logic sig equality to ensure no duplicate pools
-            logic_sig_bytes = generate_logic_sig(
-                asset1_id, asset2_id, self.manager_application_id, validator_index
-            )
-            address = logic.address(logic_sig_bytes)
-            if address != account_data.get("address", None):
+        # batch fetch asset metadata, destroyed assets are left out of the registry
+        asset_ids = set()
+        for (_, asset1_id, asset2_id, _, _) in pool_data:
+            asset_ids.update([asset1_id, asset2_id])
+        self.asset_registry.prefetch(asset_ids)
+
+        def load_pool(data):
+            pool_type, asset1_id, asset2_id, pool_app_id, logic_sig_local_state = data
+            if (asset1_id not in self.asset_registry) or (
+                asset2_id not in self.asset_registry
+            ):
+                # asset1, asset2, or both have been destroyed
                 return None
-
             try:
-                pool = self.get_pool(pool_type, asset1_id, asset2_id)
+                application_info = get_application_info(self.indexer, pool_app_id)
+                pool = self.pool_registry.pools.get((pool_type, asset1_id, asset2_id))
+                if pool is not None:
+                    pool.load_state(application_info=application_info)
+                else:
+                    pool = self.pool_registry.add(
+                        Pool(
+                            self,
+                            pool_type,
+                            self.get_asset(asset1_id),
+                            self.get_asset(asset2_id),
+                            logic_sig_local_state=logic_sig_local_state,
+                            application_info=application_info,
+                        )
+                    )
             except:
-                # asset1, asset2, or both have been destroyed
                 return None
-
             return (pool_app_id, pool)
 
+        with ThreadPoolExecutor(max_workers=self.pool_registry.max_workers) as executor:
+            valid_pool_data = dict(
+                list(filter(lambda x: x != None, executor.map(load_pool, pool_data)))
+            )
+
+        return valid_pool_data
+
+    def get_constant_product_pools(self):
+        """Returns a dict of valid constant product pools with relevant data
+
+        :return: dict mapping pool app id -> :class:`Pool`
+        :rtype: dict
+        """
+
+        # pools created while the scan runs are picked up by the next incremental scan
+        scan_round = self.indexer.health()["round"]
         accounts = get_accounts_opted_into_app(
             self.indexer, self.manager_application_id
         )
-        valid_pool_data = dict(
-            list(
-                filter(
-                    lambda x: x != None,
-                    [validate_pool(account) for account in accounts],
-                )
+        pools = self.load_constant_product_pools(accounts)
+        self.pool_addresses = set([account["address"] for account in accounts])
+        self.last_pool_scan_round = scan_round
+        return pools
+
+    def get_new_constant_product_pools(self):
+        """Returns the constant product pools created since the last discovery scan. Only
+        accounts that opted into the pool manager after the last scanned round are looked up.
+        The first call runs a full scan and returns every pool.
+
+        :return: dict mapping pool app id -> :class:`Pool` for newly discovered pools
+        :rtype: dict
+        """
+
+        if self.last_pool_scan_round is None:
+            return self.get_constant_product_pools()
+
+        # find logic sig accounts opting into the manager since the last scan
+        next_page = ""
+        senders = set()
+        scan_round = self.last_pool_scan_round
+        while next_page != None:
+            txn_data = self.indexer.search_transactions(
+                limit=1000,
+                next_page=next_page,
+                txn_type="appl",
+                min_round=self.last_pool_scan_round + 1,
+                application_id=self.manager_application_id,
             )
+            for txn in txn_data.get("transactions", []):
+                app_txn = txn.get("application-transaction", {})
+                if app_txn.get("on-completion", "") == "optin":
+                    senders.add(txn["sender"])
+            scan_round = max(scan_round, txn_data.get("current-round", scan_round))
+            next_page = txn_data.get("next-token", None)
+
+        def get_account(address):
+            try:
+                return self.indexer.account_info(
+                    address, exclude="assets,created-apps,created-assets"
+                )["account"]
+            except:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.pool_registry.max_workers) as executor:
+            accounts = list(
+                filter(lambda x: x != None, executor.map(get_account, senders))
+            )
+
+        known_pool_app_ids = set(self.pool_registry.pools_by_app_id)
+        pools = self.load_constant_product_pools(accounts)
+        if self.pool_addresses is not None:
+            self.pool_addresses.update(senders)
+        self.last_pool_scan_round = scan_round
+        return dict(
+            [
+                (pool_app_id, pool)
+                for (pool_app_id, pool) in pools.items()
+                if pool_app_id not in known_pool_app_ids
+            ]
         )
 
-        return valid_pool_data
+    def load_pool_addresses(self):
+        """Loads the address index of accounts opted into the constant product pool manager,
+        without loading any pool. The index is also kept up to date by
+        :meth:`get_constant_product_pools` and :meth:`get_new_constant_product_pools`.
+
+        :return: set of addresses opted into the manager
+        :rtype: set
+        """
+
+        accounts = get_accounts_opted_into_app(
+            self.indexer,
+            self.manager_application_id,
+            exclude="assets,apps-local-state,created-apps,created-assets",
+        )
+        self.pool_addresses = set([account["address"] for account in accounts])
+        return self.pool_addresses
+
+    def get_existing_pairs(self, pool_type, asset_pairs):
+        """Returns the asset pairs with a pool of given pool type. Constant product pool logic
+        sig addresses are derived in bulk and looked up in the manager address index, which is
+        loaded on first use, so thousands of candidate pairs are checked without an indexer call
+        per pair. Nanoswap and lending pools are looked up in their app id tables.
+
+        :param pool_type: a :class:`PoolType` object for the type of pool (e.g. 30bp, 100bp fee)
+        :type pool_type: :class:`PoolType`
+        :param asset_pairs: (asset 1 id, asset 2 id) pairs in any order
+        :type asset_pairs: list
+        :return: list of (smaller asset id, larger asset id) pairs with a pool
+        :rtype: list
+        """
+
+        pair_keys = [
+            PoolRegistry.get_pair_key(asset1_id, asset2_id)
+            for (asset1_id, asset2_id) in asset_pairs
+            if asset1_id != asset2_id
+        ]
+
+        if pool_type in [
+            PoolType.NANOSWAP,
+            PoolType.NANOSWAP_LENDING_POOL,
+            PoolType.CONSTANT_PRODUCT_25BP_FEE_LENDING_POOL,
+        ]:
+            if pool_type == PoolType.NANOSWAP:
+                pool_app_ids = self.nanoswap_pool_app_ids
+            elif self.network == Network.TESTNET:
+                raise Exception("Lending Pool is not on testnet")
+            elif pool_type == PoolType.NANOSWAP_LENDING_POOL:
+                pool_app_ids = NANOSWAP_LENDING_POOLS_ASSET_PAIR_TO_APP_ID
+            else:
+                pool_app_ids = CONSTANT_PRODUCT_LENDING_POOLS_ASSET_PAIR_TO_APP_ID
+            return [pair_key for pair_key in pair_keys if pair_key in pool_app_ids]
+
+        validator_index = get_validator_index(self.network, pool_type)
+        if validator_index is None:
+            raise Exception("Invalid pool type for network")
+        if self.pool_addresses is None:
+            self.load_pool_addresses()
+        addresses = get_logic_sig_addresses(
+            pair_keys, self.manager_application_id, validator_index
+        )
+        return [
+            pair_key
+            for (pair_key, address) in zip(pair_keys, addresses)
+            if address in self.pool_addresses
+        ]
+
+    def pool_exists(self, pool_type, asset1_id, asset2_id):
+        """Returns True if a pool of given pool type exists for given assets, see
+        :meth:`get_existing_pairs`
+
+        :param pool_type: a :class:`PoolType` object for the type of pool (e.g. 30bp, 100bp fee)
+        :type pool_type: :class:`PoolType`
+        :param asset1_id: asset 1 id
+        :type asset1_id: int
+        :param asset2_id: asset 2 id
+        :type asset2_id: int
+        :return: True if the pool exists
+        :rtype: bool
+        """
+
+        return len(self.get_existing_pairs(pool_type, [(asset1_id, asset2_id)])) > 0
+
+    def iter_new_constant_product_pools(
+        self, poll_interval=DEFAULT_POOL_POLL_INTERVAL, max_polls=None
+    ):
+        """Polls for newly created constant product pools, yielding each as it is discovered.
+        The first poll yields every existing pool unless a scan has already run.
+
+        :param poll_interval: seconds between polls
+        :type poll_interval: float, optional
+        :param max_polls: number of polls after which to stop, polls forever if not provided
+        :type max_polls: int, optional
+        :return: generator of newly discovered :class:`Pool` objects
+        :rtype: generator
+        """
+
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            if polls > 0:
+                time.sleep(poll_interval)
+            for pool in self.get_new_constant_product_pools().values():
+                yield pool
+            polls += 1
 
     def get_nanoswap_pools(self):
         """Returns a dict of valid nanoswap pools with relevant data
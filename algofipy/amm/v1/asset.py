@@ -2,7 +2,6 @@
 
 # external
 import pprint
-import requests as re
 
 # local
 from .amm_config import (
@@ -12,7 +11,6 @@ from .amm_config import (
     get_usdc_asset_id,
     get_stbl_asset_id,
     ALGO_ASSET_ID,
-    AMMEndpoints,
 )
 
 # INTERFACE
@@ -24,12 +22,14 @@ STBL_DECIMALS = 6
 
 
 class Asset:
-    def __init__(self, amm_client, asset_id):
+    def __init__(self, amm_client, asset_id, asset_params=None):
         """Constructor method for :class:`Asset`
         :param amm_client: a :class:`AlgofiAMMClient` for interacting with the AMM
         :type amm_client: :class:`AlgofiAMMClient`
         :param asset_id: asset id
         :type asset_id: int
+        :param asset_params: prefetched indexer asset params, fetched if not provided
+        :type asset_params: dict, optional
         """
 
         self.asset_id = asset_id
@@ -47,19 +47,20 @@ class Asset:
             self.unit_name = "ALGO"
             self.url = "https://www.algorand.com/"
         else:
-            asset_info = amm_client.indexer.asset_info(asset_id)
-            self.creator = asset_info["asset"]["params"]["creator"]
-            self.decimals = asset_info["asset"]["params"]["decimals"]
-            self.default_frozen = asset_info["asset"]["params"].get(
-                "default-frozen", False
-            )
-            self.freeze = asset_info["asset"]["params"].get("freeze", None)
-            self.manager = asset_info["asset"]["params"].get("manager", None)
-            self.name = asset_info["asset"]["params"].get("name", None)
-            self.reserve = asset_info["asset"]["params"].get("reserve", None)
-            self.total = asset_info["asset"]["params"].get("total", None)
-            self.unit_name = asset_info["asset"]["params"].get("unit-name", None)
-            self.url = asset_info["asset"]["params"].get("url", None)
+            if asset_params is None:
+                asset_params = amm_client.indexer.asset_info(asset_id)["asset"][
+                    "params"
+                ]
+            self.creator = asset_params.get("creator", None)
+            self.decimals = asset_params["decimals"]
+            self.default_frozen = asset_params.get("default-frozen", False)
+            self.freeze = asset_params.get("freeze", None)
+            self.manager = asset_params.get("manager", None)
+            self.name = asset_params.get("name", None)
+            self.reserve = asset_params.get("reserve", None)
+            self.total = asset_params.get("total", None)
+            self.unit_name = asset_params.get("unit-name", None)
+            self.url = asset_params.get("url", None)
 
     def __str__(self):
         """Returns a pretty string representation of the :class:`Asset` object
@@ -102,27 +103,26 @@ class Asset:
 
         return amount / 10**self.decimals
 
+    @property
+    def price(self):
+        """Dollar price of the asset, read from the shared price feed. Prices are not stored on
+        the asset, which is shared by every pool and interface.
+
+        :return: dollar price of the asset
+        :rtype: float
+        """
+
+        return self.amm_client.price_feed.get_price(self.asset_id)
+
     def refresh_price(self):
-        """Refreshes the dollar price of the asset"""
-
-        try:
-            prices = dict(
-                [
-                    (x["asset_id"], x["price"])
-                    for x in (
-                        re.get(AMMEndpoints.ASSETS).json()
-                        + re.get(AMMEndpoints.AMM_LP_TOKENS).json()
-                    )
-                ]
-            )
-            self.price = prices[self.asset_id]
-        except:
-            raise Exception(
-                "Failed to query price from endpoints "
-                + AMMEndpoints.ASSETS
-                + " and "
-                + AMMEndpoints.AMM_LP_TOKENS
-            )
+        """Returns the dollar price of the asset from the shared price feed, which refreshes its
+        prices once they are stale
+
+        :return: dollar price of the asset
+        :rtype: float
+        """
+
+        return self.price
 
     def to_usd(self, amount):
         """Returns a dollar amount of asset given an amount in base units
@@ -132,5 +132,4 @@ class Asset:
         :rtype: float
         """
 
-        self.refresh_price()
         return self.get_decimal_amount(amount) * self.price
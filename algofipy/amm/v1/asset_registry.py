@@ -0,0 +1,159 @@
+# IMPORTS
+
+# external
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+from .asset import Asset
+from ...asset_config import ASSET_CONFIGS
+from ...globals import ALGO_ASSET_ID
+
+# INTERFACE
+
+# constants
+DEFAULT_MAX_WORKERS = 10
+
+
+class AssetRegistry:
+    def __init__(self, amm_client, path=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Registry of shared :class:`Asset` objects. Assets are built from full indexer asset
+        params, fetched at most once and optionally persisted to disk. The network asset configs
+        only list the ids fetched by :meth:`prefetch_configured_assets`. Registry assets are
+        shared by every pool and interface and should not be modified.
+
+        :param amm_client: a :class:`AMMClient` object for interacting with the AMM
+        :type amm_client: :class:`AMMClient`
+        :param path: json file to load asset metadata from and save it to
+        :type path: str, optional
+        :param max_workers: number of assets fetched in parallel by :meth:`prefetch`
+        :type max_workers: int, optional
+        """
+
+        self.amm_client = amm_client
+        self.path = path
+        self.max_workers = max_workers
+
+        # asset id -> indexer asset params
+        self.asset_params = {}
+        # asset id -> :class:`Asset`
+        self.assets = {}
+        self._lock = threading.Lock()
+
+        # ids of the configured network assets, metadata is fetched from the indexer
+        self.configured_asset_ids = list(
+            ASSET_CONFIGS.get(self.amm_client.network, {}).keys()
+        )
+
+        if self.path is not None and os.path.exists(self.path):
+            self.load(self.path)
+
+    def __contains__(self, asset_id):
+        return asset_id in self.asset_params
+
+    def _add(self, asset_id, asset_params):
+        with self._lock:
+            self.asset_params[asset_id] = asset_params
+            return self.assets.setdefault(
+                asset_id, Asset(self.amm_client, asset_id, asset_params)
+            )
+
+    def _fetch(self, asset_id):
+        if asset_id == ALGO_ASSET_ID:
+            asset_params = {}
+        else:
+            asset_params = self.amm_client.indexer.asset_info(asset_id)["asset"][
+                "params"
+            ]
+        return self._add(asset_id, asset_params)
+
+    def get_asset(self, asset_id):
+        """Returns the shared :class:`Asset` for a given asset id, fetching it if unknown
+
+        :param asset_id: asset id
+        :type asset_id: int
+        :return: :class:`Asset` object representing the asset with given asset id
+        :rtype: :class:`Asset`
+        """
+
+        asset = self.assets.get(asset_id)
+        if asset is not None:
+            return asset
+        asset_params = self.asset_params.get(asset_id)
+        if asset_params is not None:
+            return self._add(asset_id, asset_params)
+        return self._fetch(asset_id)
+
+    def prefetch(self, asset_ids):
+        """Fetches every unknown asset in asset_ids concurrently. Assets that cannot be
+        fetched (e.g. destroyed assets) are skipped.
+
+        :param asset_ids: asset ids
+        :type asset_ids: list
+        :return: dict of asset id -> :class:`Asset` for the assets that could be loaded
+        :rtype: dict
+        """
+
+        unknown_asset_ids = [
+            asset_id for asset_id in set(asset_ids) if asset_id not in self.asset_params
+        ]
+
+        def fetch(asset_id):
+            try:
+                return self._fetch(asset_id)
+            except Exception:
+                return None
+
+        if unknown_asset_ids:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(fetch, unknown_asset_ids))
+
+        return dict(
+            [
+                (asset_id, self.get_asset(asset_id))
+                for asset_id in asset_ids
+                if asset_id in self.asset_params
+            ]
+        )
+
+    def prefetch_configured_assets(self):
+        """Fetches the metadata of every configured network asset concurrently, see
+        :meth:`prefetch`
+
+        :return: dict of asset id -> :class:`Asset` for the assets that could be loaded
+        :rtype: dict
+        """
+
+        return self.prefetch(self.configured_asset_ids)
+
+    def load(self, path=None):
+        """Loads asset metadata saved with :meth:`save`
+
+        :param path: json file to load from, defaults to the registry path
+        :type path: str, optional
+        """
+
+        with open(path or self.path) as f:
+            asset_params = json.load(f)
+        with self._lock:
+            for asset_id, params in asset_params.items():
+                self.asset_params[int(asset_id)] = params
+
+    def save(self, path=None):
+        """Saves the metadata of all known assets
+
+        :param path: json file to save to, defaults to the registry path
+        :type path: str, optional
+        """
+
+        path = path or self.path
+        if path is None:
+            raise Exception("No asset registry path given")
+        with self._lock:
+            asset_params = dict(self.asset_params)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(asset_params, f)
+        os.replace(temp_path, path)
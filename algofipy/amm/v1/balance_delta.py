@@ -1,6 +1,19 @@
 class BalanceDelta:
+    __slots__ = (
+        "_asset1_delta",
+        "_asset2_delta",
+        "_lp_delta",
+        "_num_iter",
+        "_asset1_balance",
+        "_asset2_balance",
+        "_price_delta",
+    )
+
     def __init__(self, pool, asset1_delta, asset2_delta, lp_delta, num_iter=0):
-        """Constructor method for :class:`BalanceDelta`
+        """Constructor method for :class:`BalanceDelta`. Balance deltas are read only, they keep
+        the pool balances needed for :attr:`price_delta` rather than the pool and compute the
+        price delta on first access.
+
         :param pool: a :class:`Pool` object for querying pool data
         :type pool: :class:`Pool`
         :param asset1_delta: change in the asset 1 balance of the pool
@@ -13,19 +26,58 @@ class BalanceDelta:
         :type  num_iter: int
         """
 
-        self.asset1_delta = asset1_delta
-        self.asset2_delta = asset2_delta
-        self.lp_delta = lp_delta
-        self.num_iter = num_iter
-        self.extra_compute_fee = int(num_iter / (700 / 400)) * 1000
+        self._asset1_delta = asset1_delta
+        self._asset2_delta = asset2_delta
+        self._lp_delta = lp_delta
+        self._num_iter = num_iter
 
-        if lp_delta != 0:
-            self.price_delta = 0
-        elif pool.lp_circulation == 0:
-            self.price_delta = 0
+        if (lp_delta != 0) or (pool.lp_circulation == 0):
+            self._asset1_balance = None
+            self._asset2_balance = None
+            self._price_delta = 0
         else:
-            starting_price_ratio = pool.asset1_balance / pool.asset2_balance
-            final_price_ratio = (pool.asset1_balance + asset1_delta) / (
-                pool.asset2_balance + asset2_delta
+            self._asset1_balance = pool.asset1_balance
+            self._asset2_balance = pool.asset2_balance
+            self._price_delta = None
+
+    @property
+    def asset1_delta(self):
+        return self._asset1_delta
+
+    @property
+    def asset2_delta(self):
+        return self._asset2_delta
+
+    @property
+    def lp_delta(self):
+        return self._lp_delta
+
+    @property
+    def num_iter(self):
+        return self._num_iter
+
+    @property
+    def extra_compute_fee(self):
+        """Fee for the extra compute of the stableswap loop iterations
+
+        :return: extra compute fee in microalgos
+        :rtype: int
+        """
+
+        return int(self._num_iter / (700 / 400)) * 1000
+
+    @property
+    def price_delta(self):
+        """Relative change in the pool price, computed on first access
+
+        :return: price delta
+        :rtype: float
+        """
+
+        if self._price_delta is None:
+            starting_price_ratio = self._asset1_balance / self._asset2_balance
+            final_price_ratio = (self._asset1_balance + self._asset1_delta) / (
+                self._asset2_balance + self._asset2_delta
             )
-            self.price_delta = abs((starting_price_ratio / final_price_ratio) - 1)
+            self._price_delta = abs((starting_price_ratio / final_price_ratio) - 1)
+        return self._price_delta
@@ -0,0 +1,426 @@
+# IMPORTS
+
+# external
+import math
+import numpy as np
+
+# INTERFACE
+
+# largest integer exactly representable as a float64, the scalar quotes go through floats
+MAX_EXACT_FLOAT_INT = 2**53
+
+
+class BatchQuote:
+    __slots__ = (
+        "asset1_delta",
+        "asset2_delta",
+        "lp_delta",
+        "num_iter",
+        "_asset1_balances",
+        "_asset2_balances",
+        "_price_delta",
+        "_extra_compute_fee",
+    )
+
+    def __init__(
+        self,
+        asset1_delta,
+        asset2_delta,
+        lp_delta,
+        num_iter,
+        asset1_balances=None,
+        asset2_balances=None,
+    ):
+        """Quotes for many amounts held as arrays, one entry per quoted amount. Each entry
+        matches the corresponding field of the scalar :class:`BalanceDelta`. Price deltas and
+        extra compute fees are computed on first access.
+
+        :param asset1_delta: change in the asset 1 balance of the pool
+        :type asset1_delta: :class:`numpy.ndarray`
+        :param asset2_delta: change in the asset 2 balance of the pool
+        :type asset2_delta: :class:`numpy.ndarray`
+        :param lp_delta: change in the lp balance of the pool
+        :type lp_delta: :class:`numpy.ndarray`
+        :param num_iter: estimated number of stableswap loop iterations
+        :type num_iter: :class:`numpy.ndarray`
+        :param asset1_balances: asset 1 pool balance each entry was quoted against, price deltas are 0 if not provided
+        :type asset1_balances: :class:`numpy.ndarray`, optional
+        :param asset2_balances: asset 2 pool balance each entry was quoted against, price deltas are 0 if not provided
+        :type asset2_balances: :class:`numpy.ndarray`, optional
+        """
+
+        self.asset1_delta = asset1_delta
+        self.asset2_delta = asset2_delta
+        self.lp_delta = lp_delta
+        self.num_iter = num_iter
+        self._asset1_balances = asset1_balances
+        self._asset2_balances = asset2_balances
+        self._price_delta = None
+        self._extra_compute_fee = None
+
+    def __len__(self):
+        return len(self.asset1_delta)
+
+    @property
+    def extra_compute_fee(self):
+        """Fee for the extra compute of the stableswap loop iterations of each entry
+
+        :return: extra compute fees in microalgos
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if self._extra_compute_fee is None:
+            self._extra_compute_fee = (self.num_iter / (700 / 400)).astype(
+                np.int64
+            ) * 1000
+        return self._extra_compute_fee
+
+    @property
+    def price_delta(self):
+        """Relative change in the pool price of each entry
+
+        :return: price deltas
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if self._price_delta is None:
+            if self._asset1_balances is None:
+                self._price_delta = np.zeros(len(self), dtype=np.float64)
+            else:
+                self._price_delta = _get_price_delta(
+                    self._asset1_balances,
+                    self._asset2_balances,
+                    self.asset1_delta,
+                    self.asset2_delta,
+                )
+        return self._price_delta
+
+
+def _fits_float(*bounds):
+    return all(bound < MAX_EXACT_FLOAT_INT for bound in bounds)
+
+
+def _as_int_arrays(*values):
+    # broadcast amounts and balances against each other, as int64 when the inputs
+    # are integer arrays and python ints otherwise
+    arrays = [np.asarray(value).reshape(-1) for value in values]
+    if all(array.dtype.kind == "i" for array in arrays):
+        return [array.astype(np.int64) for array in np.broadcast_arrays(*arrays)]
+    arrays = np.broadcast_arrays(*[array.astype(object) for array in arrays])
+    return [_as_object(array) for array in arrays]
+
+
+def _as_object(array):
+    return np.array([int(x) for x in array], dtype=object)
+
+
+def _floor_div_product(a, b, d):
+    # floor(a * b / d) for int64 arrays below 2**53 whose result is below 2**52, exact
+    # even when a * b overflows int64. The float estimate is off by a few units at most,
+    # so the remainder is small and is computed exactly by wrapping int64 arithmetic.
+    with np.errstate(over="ignore"):
+        q = np.floor(a.astype(np.float64) * b / d).astype(np.int64)
+        r = a * b - q * d
+        while True:
+            low = r < 0
+            high = r >= d
+            if not (np.any(low) or np.any(high)):
+                return q
+            q = q - low + high
+            r = r + low * d - high * d
+
+
+def _get_bounds(array):
+    return int(np.min(array)), int(np.max(array))
+
+
+def _get_price_delta(balance1, balance2, asset1_delta, asset2_delta):
+    final_balance1 = balance1 + asset1_delta
+    final_balance2 = balance2 + asset2_delta
+    if balance1.dtype != object and _fits_float(
+        int(np.max(np.abs(balance1))),
+        int(np.max(np.abs(balance2))),
+        int(np.max(np.abs(final_balance1))),
+        int(np.max(np.abs(final_balance2))),
+    ):
+        # every value converts to float exactly, so this matches python int division
+        starting_price_ratio = balance1 / balance2
+        final_price_ratio = final_balance1 / final_balance2
+        return np.abs((starting_price_ratio / final_price_ratio) - 1)
+    return np.array(
+        [
+            abs((int(b1) / int(b2)) / (int(f1) / int(f2)) - 1)
+            for (b1, b2, f1, f2) in zip(
+                balance1, balance2, final_balance1, final_balance2
+            )
+        ],
+        dtype=np.float64,
+    )
+
+
+def get_swap_exact_for_quotes(
+    swap_fee, swap_in_amounts, swap_in_balances, swap_out_balances
+):
+    """Computes constant product swap exact for quotes for arrays of amounts and balances.
+    Uses int64 arithmetic when amounts and balances are below 2**53, python ints otherwise.
+
+    :param swap_fee: pool swap fee
+    :type swap_fee: float
+    :param swap_in_amounts: amounts of incoming asset to swap
+    :type swap_in_amounts: array-like
+    :param swap_in_balances: pool balances of the incoming asset
+    :type swap_in_balances: array-like
+    :param swap_out_balances: pool balances of the outgoing asset
+    :type swap_out_balances: array-like
+    :return: tuple of swap in amounts, swap out amounts, swap in balances and swap out balances arrays
+    :rtype: tuple
+    """
+
+    amounts, balances_in, balances_out = _as_int_arrays(
+        swap_in_amounts, swap_in_balances, swap_out_balances
+    )
+    if len(amounts) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+
+    (min_amount, max_amount), (_, max_in), (_, max_out) = [
+        _get_bounds(array) for array in [amounts, balances_in, balances_out]
+    ]
+    if min_amount >= 0 and _fits_float(max_amount, max_in + max_amount, max_out):
+        amounts, balances_in, balances_out = [
+            array.astype(np.int64) for array in [amounts, balances_in, balances_out]
+        ]
+        amounts_less_fees = amounts - np.ceil(amounts * swap_fee).astype(np.int64)
+        swap_out_amounts = _floor_div_product(
+            balances_out, amounts_less_fees, balances_in + amounts_less_fees
+        )
+    else:
+        amounts, balances_in, balances_out = [
+            _as_object(array) for array in [amounts, balances_in, balances_out]
+        ]
+        amounts_less_fees = [
+            amount - int(math.ceil(amount * swap_fee)) for amount in amounts
+        ]
+        swap_out_amounts = np.array(
+            [
+                int((balance_out * less_fees) // (balance_in + less_fees))
+                for (balance_in, balance_out, less_fees) in zip(
+                    balances_in, balances_out, amounts_less_fees
+                )
+            ],
+            dtype=object,
+        )
+    return amounts, swap_out_amounts, balances_in, balances_out
+
+
+def get_swap_for_exact_quotes(
+    swap_fee, swap_out_amounts, swap_in_balances, swap_out_balances
+):
+    """Computes constant product swap for exact quotes for arrays of amounts and balances.
+    Uses int64 arithmetic when amounts and balances are below 2**53, python ints otherwise.
+
+    :param swap_fee: pool swap fee
+    :type swap_fee: float
+    :param swap_out_amounts: amounts of outgoing asset
+    :type swap_out_amounts: array-like
+    :param swap_in_balances: pool balances of the incoming asset
+    :type swap_in_balances: array-like
+    :param swap_out_balances: pool balances of the outgoing asset
+    :type swap_out_balances: array-like
+    :return: tuple of swap in amounts, swap out amounts, swap in balances and swap out balances arrays
+    :rtype: tuple
+    """
+
+    amounts, balances_in, balances_out = _as_int_arrays(
+        swap_out_amounts, swap_in_balances, swap_out_balances
+    )
+    if len(amounts) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    if np.any(amounts >= balances_out):
+        raise Exception("Error: swap out amount must be less than the pool balance")
+
+    (min_amount, max_amount), (_, max_in), (_, max_out) = [
+        _get_bounds(array) for array in [amounts, balances_in, balances_out]
+    ]
+    use_int64 = min_amount >= 0 and _fits_float(max_amount, max_in, max_out)
+    if use_int64:
+        amounts, balances_in, balances_out = [
+            array.astype(np.int64) for array in [amounts, balances_in, balances_out]
+        ]
+        # swap in amounts must stay below 2**52 to be exact as floats
+        use_int64 = (
+            np.max(balances_in.astype(np.float64) * amounts / (balances_out - amounts))
+            < 2**52
+        )
+    if use_int64:
+        amounts_less_fees = (
+            _floor_div_product(balances_in, amounts, balances_out - amounts) - 1
+        )
+        swap_in_amounts = np.ceil(amounts_less_fees // (1 - swap_fee)).astype(np.int64)
+    else:
+        amounts, balances_in, balances_out = [
+            _as_object(array) for array in [amounts, balances_in, balances_out]
+        ]
+        swap_in_amounts = np.array(
+            [
+                math.ceil(
+                    (int((balance_in * amount) // (balance_out - amount)) - 1)
+                    // (1 - swap_fee)
+                )
+                for (balance_in, balance_out, amount) in zip(
+                    balances_in, balances_out, amounts
+                )
+            ],
+            dtype=object,
+        )
+    return swap_in_amounts, amounts, balances_in, balances_out
+
+
+def get_stable_swap_quotes(
+    stable_swap_engine,
+    amplification_factor,
+    swap_fee,
+    swap_in_is_asset1,
+    exact_in,
+    amounts,
+    asset1_balances,
+    asset2_balances,
+    warm_start=False,
+):
+    """Computes nanoswap swap quotes for arrays of amounts and balances, solving D once per
+    distinct pool state with a :class:`StableSwapEngine`
+
+    :param stable_swap_engine: stableswap solver
+    :type stable_swap_engine: :class:`StableSwapEngine`
+    :param amplification_factor: pool amplification factor
+    :type amplification_factor: int
+    :param swap_fee: pool swap fee
+    :type swap_fee: float
+    :param swap_in_is_asset1: True if asset 1 is swapped in, False if asset 2 is swapped in
+    :type swap_in_is_asset1: bool
+    :param exact_in: True for swap exact for quotes, False for swap for exact quotes
+    :type exact_in: bool
+    :param amounts: swap in amounts if exact_in, swap out amounts otherwise
+    :type amounts: array-like
+    :param asset1_balances: asset 1 pool balances
+    :type asset1_balances: array-like
+    :param asset2_balances: asset 2 pool balances
+    :type asset2_balances: array-like
+    :param warm_start: warm start the y solves, see :meth:`StableSwapEngine.get_y`
+    :type warm_start: bool, optional
+    :return: batch quote
+    :rtype: :class:`BatchQuote`
+    """
+
+    amounts, balances1, balances2 = [
+        _as_object(array)
+        for array in _as_int_arrays(amounts, asset1_balances, asset2_balances)
+    ]
+
+    # i, j and the new amount of token i for each quote
+    if exact_in:
+        amounts_less_fees = [
+            amount - int(math.ceil(amount * swap_fee)) for amount in amounts
+        ]
+        i, j = (0, 1) if swap_in_is_asset1 else (1, 0)
+        balances_in = balances1 if swap_in_is_asset1 else balances2
+        xs = [b + less for (b, less) in zip(balances_in, amounts_less_fees)]
+    else:
+        i, j = (0, 1) if swap_in_is_asset1 else (1, 0)
+        balances_out = balances2 if swap_in_is_asset1 else balances1
+        xs = [b - amount for (b, amount) in zip(balances_out, amounts)]
+
+    # solve each distinct pool state as one batch
+    groups = {}
+    for k, balances in enumerate(zip(balances1, balances2)):
+        groups.setdefault(balances, []).append(k)
+    ys = [None] * len(amounts)
+    num_iter = np.zeros(len(amounts), dtype=np.int64)
+    for balances, rows in groups.items():
+        _, num_iter_D, results = stable_swap_engine.get_y_batch(
+            i,
+            j,
+            [xs[k] for k in rows],
+            list(balances),
+            amplification_factor,
+            warm_start=warm_start,
+        )
+        for k, (y, num_iter_y) in zip(rows, results):
+            ys[k] = y
+            num_iter[k] = num_iter_D + num_iter_y
+
+    # balances of token j
+    balances_j = balances2 if j == 1 else balances1
+    if exact_in:
+        swap_in_amounts = amounts
+        swap_out_amounts = np.array(
+            [b - y for (b, y) in zip(balances_j, ys)], dtype=object
+        )
+    else:
+        # mirrors the scalar quote, which takes y against the swap in balance
+        swap_in_amounts = np.array(
+            [
+                math.ceil((y - b) // (1 - swap_fee))
+                for (b, y) in zip(balances1 if swap_in_is_asset1 else balances2, ys)
+            ],
+            dtype=object,
+        )
+        swap_out_amounts = amounts
+
+    if swap_in_is_asset1:
+        swap_in_balances, swap_out_balances = balances1, balances2
+    else:
+        swap_in_balances, swap_out_balances = balances2, balances1
+    return build_swap_batch_quote(
+        swap_in_is_asset1,
+        swap_in_amounts,
+        swap_out_amounts,
+        swap_in_balances,
+        swap_out_balances,
+        num_iter=num_iter,
+    )
+
+
+def build_swap_batch_quote(
+    swap_in_is_asset1,
+    swap_in_amounts,
+    swap_out_amounts,
+    swap_in_balances,
+    swap_out_balances,
+    num_iter=None,
+):
+    """Builds a :class:`BatchQuote` for swaps from the amounts and pool balances of each swap
+
+    :param swap_in_is_asset1: True if asset 1 is swapped in, False if asset 2 is swapped in
+    :type swap_in_is_asset1: bool
+    :param swap_in_amounts: amounts of incoming asset
+    :type swap_in_amounts: :class:`numpy.ndarray`
+    :param swap_out_amounts: amounts of outgoing asset
+    :type swap_out_amounts: :class:`numpy.ndarray`
+    :param swap_in_balances: pool balances of the incoming asset
+    :type swap_in_balances: :class:`numpy.ndarray`
+    :param swap_out_balances: pool balances of the outgoing asset
+    :type swap_out_balances: :class:`numpy.ndarray`
+    :param num_iter: estimated number of stableswap loop iterations of each swap, zero if not provided
+    :type num_iter: :class:`numpy.ndarray`, optional
+    :return: batch quote
+    :rtype: :class:`BatchQuote`
+    """
+
+    if swap_in_is_asset1:
+        asset1_delta, asset2_delta = -1 * swap_in_amounts, swap_out_amounts
+        balance1, balance2 = swap_in_balances, swap_out_balances
+    else:
+        asset1_delta, asset2_delta = swap_out_amounts, -1 * swap_in_amounts
+        balance1, balance2 = swap_out_balances, swap_in_balances
+
+    size = len(swap_in_amounts)
+    return BatchQuote(
+        asset1_delta,
+        asset2_delta,
+        np.zeros(size, dtype=np.int64),
+        np.zeros(size, dtype=np.int64) if num_iter is None else num_iter,
+        asset1_balances=balance1,
+        asset2_balances=balance2,
+    )
@@ -0,0 +1,146 @@
+# IMPORTS
+
+# external
+import numpy as np
+
+# local
+from .amm_config import PoolType
+
+# INTERFACE
+
+# constants
+DEFAULT_N_POINTS = 256
+# tabulated swap sizes as a ratio of the swap in asset balance of the pool
+MIN_SIZE_RATIO = 1e-7
+DEFAULT_MAX_SIZE_RATIO = 0.5
+
+
+def is_stable_swap(pool):
+    return (pool.pool_type == PoolType.NANOSWAP) or (
+        pool.pool_type == PoolType.NANOSWAP_LENDING_POOL
+    )
+
+
+def get_state_key(pool):
+    """Returns the pool state a depth table is computed from
+
+    :param pool: pool
+    :type pool: :class:`Pool`
+    :return: tuple of the pool balances, swap fee and, for nanoswap pools, amplification factor
+    :rtype: tuple
+    """
+
+    if is_stable_swap(pool):
+        return (
+            pool.asset1_balance,
+            pool.asset2_balance,
+            pool.swap_fee,
+            pool.amplification_factor,
+        )
+    return (pool.asset1_balance, pool.asset2_balance, pool.swap_fee)
+
+
+class DepthTable:
+    def __init__(
+        self,
+        pool,
+        swap_in_asset_id,
+        n_points=DEFAULT_N_POINTS,
+        max_size_ratio=DEFAULT_MAX_SIZE_RATIO,
+    ):
+        """Table of swap exact for sizes against price impact and output for one swap direction of
+        a pool. Sizes are spaced geometrically and quoted exactly in one batch, lookups between them
+        are interpolated linearly in log size. Lookups beyond the table are clamped to its ends.
+
+        :param pool: pool to tabulate
+        :type pool: :class:`Pool`
+        :param swap_in_asset_id: id of incoming asset
+        :type swap_in_asset_id: int
+        :param n_points: number of tabulated swap sizes
+        :type n_points: int, optional
+        :param max_size_ratio: largest tabulated swap size as a ratio of the swap in asset balance, and
+            for nanoswap pools, which trade near par and can be drained, of the swap out asset balance
+        :type max_size_ratio: float, optional
+        """
+
+        self.swap_in_asset_id = swap_in_asset_id
+        self.state_key = get_state_key(pool)
+
+        swap_in_is_asset1 = swap_in_asset_id == pool.asset1.asset_id
+        balance = pool.asset1_balance if swap_in_is_asset1 else pool.asset2_balance
+        if is_stable_swap(pool):
+            balance = min(pool.asset1_balance, pool.asset2_balance)
+        self.swap_in_amounts = np.unique(
+            np.geomspace(
+                max(balance * MIN_SIZE_RATIO, 1),
+                max(balance * max_size_ratio, 2),
+                n_points,
+            ).astype(np.int64)
+        )
+        quotes = pool.get_swap_exact_for_quotes(swap_in_asset_id, self.swap_in_amounts)
+        self.swap_out_amounts = np.asarray(
+            quotes.asset2_delta if swap_in_is_asset1 else quotes.asset1_delta,
+            dtype=np.float64,
+        )
+        # price impact grows with size, drop rounding noise so it can be inverted
+        self.price_deltas = np.maximum.accumulate(
+            np.asarray(quotes.price_delta, dtype=np.float64)
+        )
+        self.log_swap_in_amounts = np.log(self.swap_in_amounts.astype(np.float64))
+
+    def is_valid(self, pool):
+        """Returns whether the table still matches the state of the pool
+
+        :param pool: pool the table was computed for
+        :type pool: :class:`Pool`
+        :return: True if the pool balances and parameters are unchanged
+        :rtype: bool
+        """
+
+        return self.state_key == get_state_key(pool)
+
+    def get_price_delta(self, swap_in_amount):
+        """Returns the price impact of swapping a given amount
+
+        :param swap_in_amount: amount of incoming asset, or an array of amounts
+        :type swap_in_amount: int or array-like
+        :return: relative change in the pool price
+        :rtype: float or :class:`numpy.ndarray`
+        """
+
+        return np.interp(
+            np.log(np.maximum(swap_in_amount, 1)),
+            self.log_swap_in_amounts,
+            self.price_deltas,
+        )
+
+    def get_swap_out_amount(self, swap_in_amount):
+        """Returns the output of swapping a given amount
+
+        :param swap_in_amount: amount of incoming asset, or an array of amounts
+        :type swap_in_amount: int or array-like
+        :return: amount of outgoing asset
+        :rtype: float or :class:`numpy.ndarray`
+        """
+
+        return np.interp(
+            np.log(np.maximum(swap_in_amount, 1)),
+            self.log_swap_in_amounts,
+            self.swap_out_amounts,
+        )
+
+    def get_swap_in_amount(self, price_delta):
+        """Returns the largest swap size whose price impact is a given value
+
+        :param price_delta: relative change in the pool price (e.g. 0.01 for 1%), or an array of them
+        :type price_delta: float or array-like
+        :return: amount of incoming asset
+        :rtype: int or :class:`numpy.ndarray`
+        """
+
+        swap_in_amount = np.floor(
+            np.exp(np.interp(price_delta, self.price_deltas, self.log_swap_in_amounts))
+        )
+        if np.ndim(swap_in_amount) == 0:
+            return int(swap_in_amount)
+        return swap_in_amount.astype(np.int64)
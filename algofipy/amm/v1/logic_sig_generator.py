@@ -1,12 +1,18 @@
 # IMPORTS
 
 # external
-from functools import reduce
+import hashlib
+from functools import lru_cache
+
+from algosdk import constants, encoding
 
 # local
 
 # INTERFACE
 
+# constants
+DEFAULT_CACHE_SIZE = 65536
+
 # pool factory logic sig template and indexes
 POOL_FACTORY_LOGIC_SIG_TEMPLATE_1 = [5, 32, 3]
 POOL_FACTORY_LOGIC_SIG_TEMPLATE_2 = [
@@ -56,13 +62,39 @@ POOL_FACTORY_LOGIC_SIG_TEMPLATE_3 = [
 POOL_FACTORY_LOGIC_SIG_TEMPLATE_4 = [18, 68, 49, 32, 50, 3, 18, 68, 36, 67]
 
 
+# preassembled template bytes the varints are spliced between
+POOL_FACTORY_LOGIC_SIG_PREFIX = bytes(POOL_FACTORY_LOGIC_SIG_TEMPLATE_1)
+POOL_FACTORY_LOGIC_SIG_INFIXES = (
+    bytes(POOL_FACTORY_LOGIC_SIG_TEMPLATE_2),
+    bytes(POOL_FACTORY_LOGIC_SIG_TEMPLATE_3),
+    bytes(POOL_FACTORY_LOGIC_SIG_TEMPLATE_4),
+)
+# base32 digit pairs of every 10 bit value, addresses are 36 bytes padded to 58 digits
+BASE32_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+BASE32_DIGIT_PAIRS = [
+    BASE32_ALPHABET[i >> 5] + BASE32_ALPHABET[i & 31] for i in range(1024)
+]
+ADDRESS_DIGIT_PAIR_SHIFTS = tuple(range(280, -1, -10))
+
+
+try:
+    hashlib.new("sha512_256")
+
+    def checksum(data):
+        return hashlib.new("sha512_256", data).digest()
+
+except ValueError:
+    # hashlib is built without sha512/256
+    checksum = encoding.checksum
+
+
 def encode_varint(integer):
     """Returns bytecode representation of a TEAL Int from an integer
 
     :param integer: integer to encode
     :type integer: int
-    :return: list of ints representing bytecode representation of TEAL Int
-    :rtype: list
+    :return: bytecode representation of TEAL Int
+    :rtype: bytes
     """
     buf = b""
     while True:
@@ -76,32 +108,126 @@ def encode_varint(integer):
     return buf
 
 
+def get_logic_sig_suffix(manager_app_id, validator_index):
+    """Returns the bytes of a pool logic sig following the asset ids, shared by every pool of a
+    manager and pool type
+
+    :param manager_app_id: application id of manager
+    :type manager_app_id: int
+    :param validator_index: validator index for type of pool
+    :type validator_index: int
+    :return: logic sig bytes following the asset ids
+    :rtype: bytes
+    """
+
+    return b"".join(
+        [
+            POOL_FACTORY_LOGIC_SIG_INFIXES[0],
+            encode_varint(manager_app_id),
+            POOL_FACTORY_LOGIC_SIG_INFIXES[1],
+            encode_varint(validator_index),
+            POOL_FACTORY_LOGIC_SIG_INFIXES[2],
+        ]
+    )
+
+
+@lru_cache(maxsize=DEFAULT_CACHE_SIZE)
 def generate_logic_sig(asset1_id, asset2_id, manager_app_id, validator_index):
-    """Returns a boolean if the user address is opted into an application with id app_id
+    """Returns the bytecode of the logic sig of a constant product pool. Results are cached.
 
     :param asset1_id: asset id of first asset in pool
     :type asset1_id: int
-    :param asset1_id: asset id of second asset in pool
+    :param asset2_id: asset id of second asset in pool
+    :type asset2_id: int
+    :param manager_app_id: application id of manager
+    :type manager_app_id: int
+    :param validator_index: validator index for type of pool
+    :type validator_index: int
+    :return: bytecode of the logic sig
+    :rtype: bytes
+    """
+
+    return b"".join(
+        [
+            POOL_FACTORY_LOGIC_SIG_PREFIX,
+            encode_varint(asset1_id),
+            encode_varint(asset2_id),
+            get_logic_sig_suffix(manager_app_id, validator_index),
+        ]
+    )
+
+
+def encode_checksum_address(address_bytes):
+    """Returns the address string of 32 address bytes, as :func:`algosdk.encoding.encode_address`
+
+    :param address_bytes: address bytes
+    :type address_bytes: bytes
+    :return: address
+    :rtype: str
+    """
+
+    data = int.from_bytes(address_bytes + checksum(address_bytes)[-4:], "big") << 2
+    return "".join(
+        [
+            BASE32_DIGIT_PAIRS[(data >> shift) & 1023]
+            for shift in ADDRESS_DIGIT_PAIR_SHIFTS
+        ]
+    )
+
+
+@lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def get_logic_sig_address(asset1_id, asset2_id, manager_app_id, validator_index):
+    """Returns the address of the logic sig of a constant product pool. Results are cached.
+
+    :param asset1_id: asset id of first asset in pool
     :type asset1_id: int
+    :param asset2_id: asset id of second asset in pool
+    :type asset2_id: int
     :param manager_app_id: application id of manager
     :type manager_app_id: int
     :param validator_index: validator index for type of pool
     :type validator_index: int
-    :return: list of ints representing bytecode representation of logic sig
+    :return: logic sig address
+    :rtype: str
+    """
+
+    return encode_checksum_address(
+        checksum(
+            constants.logic_prefix
+            + generate_logic_sig(asset1_id, asset2_id, manager_app_id, validator_index)
+        )
+    )
+
+
+def get_logic_sig_addresses(asset_pairs, manager_app_id, validator_index):
+    """Returns the logic sig addresses of many constant product pools of one manager and pool
+    type. The template bytes are assembled once and only the asset id varints are encoded per
+    pair. Results are not cached.
+
+    :param asset_pairs: (asset 1 id, asset 2 id) pairs
+    :type asset_pairs: list
+    :param manager_app_id: application id of manager
+    :type manager_app_id: int
+    :param validator_index: validator index for type of pool
+    :type validator_index: int
+    :return: logic sig address of each pair
     :rtype: list
     """
 
-    concat_array = [
-        POOL_FACTORY_LOGIC_SIG_TEMPLATE_1,
-        list(encode_varint(asset1_id)),
-        list(encode_varint(asset2_id)),
-        POOL_FACTORY_LOGIC_SIG_TEMPLATE_2,
-        list(encode_varint(manager_app_id)),
-        POOL_FACTORY_LOGIC_SIG_TEMPLATE_3,
-        list(encode_varint(validator_index)),
-        POOL_FACTORY_LOGIC_SIG_TEMPLATE_4,
-    ]
-    logic_sig_list_of_ints = list(reduce(lambda x, y: x + y, concat_array))
-    logic_sig_bytes = bytes(logic_sig_list_of_ints)
+    prefix = constants.logic_prefix + POOL_FACTORY_LOGIC_SIG_PREFIX
+    suffix = get_logic_sig_suffix(manager_app_id, validator_index)
+    varints = {}
 
-    return logic_sig_bytes
+    def get_varint(asset_id):
+        varint = varints.get(asset_id, None)
+        if varint is None:
+            varint = encode_varint(asset_id)
+            varints[asset_id] = varint
+        return varint
+
+    return [
+        encode_checksum_address(
+            checksum(prefix + get_varint(asset1_id) + get_varint(asset2_id) + suffix)
+        )
+        for (asset1_id, asset2_id) in asset_pairs
+    ]
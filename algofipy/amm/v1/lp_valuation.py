@@ -0,0 +1,161 @@
+# IMPORTS
+
+# external
+
+# local
+
+# INTERFACE
+
+
+class LPValuation:
+    def __init__(self, amm_client):
+        """Values pool LP tokens locally from the pool balances, LP circulation and the dollar
+        prices of the pool assets, instead of querying the LP token price endpoint. Asset prices
+        come from the lending market oracles, b asset prices from the market exchange rates, and
+        assets without a market are priced from the deepest pool pairing them with a priced asset.
+
+        :param amm_client: a :class:`AMMClient` object for interacting with the AMM
+        :type amm_client: :class:`AMMClient`
+        """
+
+        self.amm_client = amm_client
+
+    def get_market_prices(self):
+        """Returns the dollar prices per base unit of the underlying and b assets of the loaded
+        lending markets
+
+        :return: dict of asset id -> dollar price per base unit
+        :rtype: dict
+        """
+
+        prices = {}
+        for market in self.amm_client.algofi_client.lending.markets.values():
+            prices[market.underlying_asset_id] = market.underlying_to_usd(1)
+            if market.b_asset_circulation > 0:
+                prices[market.b_asset_id] = market.b_asset_to_usd(1)
+        return prices
+
+    def get_raw_prices(self, pools, prices=None, raw_prices=None):
+        """Returns the dollar prices per base unit of the assets of many pools. Assets without a
+        given or market price are priced from the spot rate of the deepest pool pairing them
+        with a priced asset, one hop at a time.
+
+        :param pools: pools whose assets to price
+        :type pools: list
+        :param prices: dict of asset id -> dollar price, overriding market prices
+        :type prices: dict, optional
+        :param raw_prices: dict of asset id -> dollar price per base unit, defaults to the market
+            prices
+        :type raw_prices: dict, optional
+        :return: dict of asset id -> dollar price per base unit
+        :rtype: dict
+        """
+
+        raw_prices = dict(
+            self.get_market_prices() if raw_prices is None else raw_prices
+        )
+        if prices:
+            for pool in pools:
+                for asset in [pool.asset1, pool.asset2]:
+                    if asset.asset_id in prices:
+                        raw_prices[asset.asset_id] = (
+                            prices[asset.asset_id] / 10**asset.decimals
+                        )
+
+        pools = [pool for pool in pools if pool.lp_circulation > 0]
+        while True:
+            # asset id -> (depth of the priced side, derived price)
+            derived_prices = {}
+            for pool in pools:
+                for asset, other_asset, other_balance in [
+                    (pool.asset1, pool.asset2, pool.asset2_balance),
+                    (pool.asset2, pool.asset1, pool.asset1_balance),
+                ]:
+                    if (asset.asset_id in raw_prices) or (
+                        other_asset.asset_id not in raw_prices
+                    ):
+                        continue
+                    depth = other_balance * raw_prices[other_asset.asset_id]
+                    if depth > derived_prices.get(asset.asset_id, (0, None))[0]:
+                        derived_prices[asset.asset_id] = (
+                            depth,
+                            raw_prices[other_asset.asset_id]
+                            * pool.get_spot_swap_rate(asset.asset_id),
+                        )
+            if not derived_prices:
+                break
+            for asset_id, (_, price) in derived_prices.items():
+                raw_prices[asset_id] = price
+        return raw_prices
+
+    def get_lp_token_value(self, pool, raw_prices):
+        """Returns the dollar price of one LP token of a pool
+
+        :param pool: pool of the LP token
+        :type pool: :class:`Pool`
+        :param raw_prices: dict of asset id -> dollar price per base unit of the pool assets
+        :type raw_prices: dict
+        :return: dollar price of one LP token, None if an asset is unpriced or the pool is empty
+        :rtype: float
+        """
+
+        if (
+            (pool.lp_circulation == 0)
+            or (pool.asset1.asset_id not in raw_prices)
+            or (pool.asset2.asset_id not in raw_prices)
+        ):
+            return None
+        pool_value = (
+            pool.asset1_balance * raw_prices[pool.asset1.asset_id]
+            + pool.asset2_balance * raw_prices[pool.asset2.asset_id]
+        )
+        return pool_value / pool.lp_circulation * 10**pool.lp_asset.decimals
+
+    def get_lp_token_price(self, pool, prices=None):
+        """Returns the dollar price of one LP token of a pool, valued from the loaded pool state.
+        Other registered pools are only used to price assets the pool cannot price itself.
+
+        :param pool: pool of the LP token
+        :type pool: :class:`Pool`
+        :param prices: dict of asset id -> dollar price, overriding market prices
+        :type prices: dict, optional
+        :return: dollar price of one LP token
+        :rtype: float
+        """
+
+        raw_prices = self.get_raw_prices([pool], prices=prices)
+        price = self.get_lp_token_value(pool, raw_prices)
+        if price is None:
+            raw_prices = self.get_raw_prices(
+                list(self.amm_client.pool_registry),
+                prices=prices,
+                raw_prices=raw_prices,
+            )
+            price = self.get_lp_token_value(pool, raw_prices)
+        if price is None:
+            raise Exception("No price available for lp asset " + str(pool.lp_asset_id))
+        return price
+
+    def get_lp_token_prices(self, pools=None, prices=None):
+        """Returns the dollar prices of the LP tokens of many pools, including lending pool LP
+        tokens valued from the b asset exchange rates. Asset prices are resolved once for all
+        pools.
+
+        :param pools: pools to value, defaults to every registered pool
+        :type pools: list, optional
+        :param prices: dict of asset id -> dollar price, overriding market prices
+        :type prices: dict, optional
+        :return: dict of lp asset id -> dollar price of one LP token, for the valued pools
+        :rtype: dict
+        """
+
+        if pools is None:
+            pools = list(self.amm_client.pool_registry)
+        raw_prices = self.get_raw_prices(pools, prices=prices)
+
+        lp_prices = {}
+        for pool in pools:
+            price = self.get_lp_token_value(pool, raw_prices)
+            if price is not None:
+                lp_prices[pool.lp_asset_id] = price
+        return lp_prices
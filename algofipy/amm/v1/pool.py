@@ -3,6 +3,7 @@
 # external
 import time
 import math
+import numpy as np
 from algosdk.logic import get_application_address
 from algosdk.transaction import (
     LogicSigAccount,
@@ -38,19 +39,58 @@ from .amm_config import (
     MAINNET_NANOSWAP_POOLS_ASSET_PAIR_TO_MANAGER_APP_ID,
     AMMEndpoints,
 )
-from .asset import Asset
-from .balance_delta import BalanceDelta
-from .logic_sig_generator import generate_logic_sig
-from .stable_swap_math import get_D, get_y
+from .depth_table import DepthTable
+from .pool_analytics import PoolAnalytics
+from .pool_state import PoolState
+from .swap_bounds import (
+    get_stable_swap_price,
+    get_constant_product_max_swap_in_amount,
+    solve_max_swap_in_amount,
+)
+from .logic_sig_generator import generate_logic_sig, get_logic_sig_address
 from ...transaction_utils import TransactionGroup, get_payment_txn, get_default_params
-from ...state_utils import get_local_state_at_app, get_global_state
+from ...state_utils import (
+    get_local_state_at_app,
+    get_global_state,
+    get_application_info,
+    format_global_state,
+    get_block_timestamp,
+    get_global_state_series,
+    DEFAULT_MAX_WORKERS,
+)
 from ...utils import int_to_bytes
 
 # INTERFACE
 
 
 class Pool:
-    def __init__(self, amm_client, pool_type, asset1, asset2):
+    # column name -> global state key of the columns returned by :meth:`load_series`
+    series_fields = {
+        "asset1_balance": POOL_STRINGS.balance_1,
+        "asset2_balance": POOL_STRINGS.balance_2,
+        "lp_circulation": POOL_STRINGS.lp_circulation,
+        "asset1_reserve": POOL_STRINGS.asset1_reserve,
+        "asset2_reserve": POOL_STRINGS.asset2_reserve,
+        "latest_time": POOL_STRINGS.latest_time,
+        "cumsum_time_weighted_asset1_to_asset2_price": POOL_STRINGS.cumsum_time_weighted_asset1_to_asset2_price,
+        "cumsum_time_weighted_asset2_to_asset1_price": POOL_STRINGS.cumsum_time_weighted_asset2_to_asset1_price,
+        "cumsum_volume_asset1": POOL_STRINGS.cumsum_volume_asset1,
+        "cumsum_volume_asset2": POOL_STRINGS.cumsum_volume_asset2,
+        "cumsum_volume_weighted_asset1_to_asset2_price": POOL_STRINGS.cumsum_volume_weighted_asset1_to_asset2_price,
+        "cumsum_volume_weighted_asset2_to_asset1_price": POOL_STRINGS.cumsum_volume_weighted_asset2_to_asset1_price,
+        "cumsum_fees_asset1": POOL_STRINGS.cumsum_fees_asset1,
+        "cumsum_fees_asset2": POOL_STRINGS.cumsum_fees_asset2,
+    }
+
+    def __init__(
+        self,
+        amm_client,
+        pool_type,
+        asset1,
+        asset2,
+        logic_sig_local_state=None,
+        application_info=None,
+    ):
         """Constructor method for :class:`Pool`
 
         :param amm_client: a :class:`AMMClient` object for interacting with the AMM
@@ -61,6 +101,11 @@ class Pool:
         :type asset1: :class:`Asset`
         :param asset2: a :class:`Asset` representing the second asset of the pool
         :type asset2: :class:`Asset`
+        :param logic_sig_local_state: prefetched manager local state of the pool logic sig
+            (constant product pools only), fetched if not provided
+        :type logic_sig_local_state: dict, optional
+        :param application_info: prefetched indexer application info of the pool, fetched if not provided
+        :type application_info: dict, optional
         """
 
         if asset1.asset_id >= asset2.asset_id:
@@ -74,6 +119,13 @@ class Pool:
         self.indexer = self.amm_client.indexer
         self.historical_indexer = self.amm_client.historical_indexer
         self.network = self.amm_client.network
+        self.stable_swap_engine = self.amm_client.stable_swap_engine
+        # price impact tables by swap in asset id, built on first use
+        self.depth_tables = {}
+        # snapshot quotes are computed from, see :meth:`get_state`
+        self._state = None
+        # windowed averages from the cumulative fields, see :meth:`get_twap`
+        self.analytics = PoolAnalytics(self)
 
         # load generic pool metadata
         self.pool_type = pool_type
@@ -131,14 +183,26 @@ class Pool:
                     self.validator_index,
                 )
             )
-            try:
-                logic_sig_local_state = get_local_state_at_app(
-                    self.indexer, self.logic_sig.address(), self.manager_application_id
-                )
+            # cached, the logic sig program is only hashed once per pool
+            self.logic_sig_address = get_logic_sig_address(
+                asset1.asset_id,
+                asset2.asset_id,
+                self.manager_application_id,
+                self.validator_index,
+            )
+            if logic_sig_local_state is not None:
                 self.pool_status = PoolStatus.ACTIVE
-            except:
-                logic_sig_local_state = None
-                self.pool_status = PoolStatus.UNINITIALIZED
+            else:
+                try:
+                    logic_sig_local_state = get_local_state_at_app(
+                        self.indexer,
+                        self.logic_sig_address,
+                        self.manager_application_id,
+                    )
+                    self.pool_status = PoolStatus.ACTIVE
+                except:
+                    logic_sig_local_state = None
+                    self.pool_status = PoolStatus.UNINITIALIZED
 
             if logic_sig_local_state:
 
@@ -165,43 +229,24 @@ class Pool:
         # if application id has been set, then either nanoswap pool or constant product pool is active
         if self.application_id:
             self.address = get_application_address(self.application_id)
-            self.created_at_round = self.indexer.applications(self.application_id)[
-                "application"
-            ]["created-at-round"]
+            # one application lookup serves the creation round and global state
+            if application_info is None:
+                application_info = get_application_info(
+                    self.indexer, self.application_id
+                )
+            self.created_at_round = application_info["created-at-round"]
             # save down pool metadata
-            pool_state = get_global_state(self.indexer, self.application_id)
+            pool_state = format_global_state(application_info)
             self.lp_asset_id = pool_state[POOL_STRINGS.lp_id]
-            self.lp_asset = Asset(self.amm_client, self.lp_asset_id)
+            self.lp_asset = self.amm_client.get_asset(self.lp_asset_id)
             self.admin = pool_state[POOL_STRINGS.admin]
             self.reserve_factor = pool_state[POOL_STRINGS.reserve_factor]
             self.flash_loan_fee = pool_state[POOL_STRINGS.flash_loan_fee]
             self.max_flash_loan_ratio = pool_state[POOL_STRINGS.max_flash_loan_ratio]
             self.swap_fee = pool_state[POOL_STRINGS.swap_fee_pct_scaled_var] / 1e6
 
-            # additionally save down nanoswap metadata if applicable
-            if (self.pool_type == PoolType.NANOSWAP) or (
-                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-            ):
-                self.initial_amplification_factor = pool_state.get(
-                    POOL_STRINGS.initial_amplification_factor, 0
-                )
-                self.future_amplification_factor = pool_state.get(
-                    POOL_STRINGS.future_amplification_factor, 0
-                )
-                self.initial_amplification_factor_time = pool_state.get(
-                    POOL_STRINGS.initial_amplification_factor_time, 0
-                )
-                self.future_amplification_factor_time = pool_state.get(
-                    POOL_STRINGS.future_amplification_factor_time, 0
-                )
-                status = self.algod.status()
-                last_round = status["last-round"]
-                block = self.algod.block_info(last_round)
-                timestamp = block["block"]["ts"]
-                self.t = timestamp
-
-            # refresh state
-            self.load_state()
+            # refresh state, including the nanoswap amplification factor ramp
+            self.load_state(application_info=application_info)
 
     def refresh_metadata(self):
         """Refresh the metadata of the pool (e.g. if now initialized)."""
@@ -211,7 +256,7 @@ class Pool:
         ):
             try:
                 logic_sig_local_state = get_local_state_at_app(
-                    self.indexer, self.logic_sig.address(), self.manager_application_id
+                    self.indexer, self.logic_sig_address, self.manager_application_id
                 )
                 self.pool_status = PoolStatus.ACTIVE
             except:
@@ -244,7 +289,7 @@ class Pool:
                 # get global state
                 pool_state = get_global_state(self.indexer, self.application_id)
                 self.lp_asset_id = pool_state[POOL_STRINGS.lp_id]
-                self.lp_asset = Asset(self.amm_client, self.lp_asset_id)
+                self.lp_asset = self.amm_client.get_asset(self.lp_asset_id)
                 self.admin = pool_state[POOL_STRINGS.admin]
                 self.reserve_factor = pool_state[POOL_STRINGS.reserve_factor]
                 self.flash_loan_fee = pool_state[POOL_STRINGS.flash_loan_fee]
@@ -253,34 +298,24 @@ class Pool:
                 ]
         else:
             pool_state = get_global_state(self.indexer, self.application_id)
-            self.initial_amplification_factor = pool_state.get(
-                POOL_STRINGS.initial_amplification_factor, 0
-            )
-            self.future_amplification_factor = pool_state.get(
-                POOL_STRINGS.future_amplification_factor, 0
-            )
-            self.initial_amplification_factor_time = pool_state.get(
-                POOL_STRINGS.initial_amplification_factor_time, 0
-            )
-            self.future_amplification_factor_time = pool_state.get(
-                POOL_STRINGS.future_amplification_factor_time, 0
-            )
-            status = self.algod.status()
-            last_round = status["last-round"]
-            block = self.algod.block_info(last_round)
-            timestamp = block["block"]["ts"]
-            self.t = timestamp
+            self.load_amplification_factor(pool_state)
 
-    def load_state(self, block=None):
+    def load_state(self, block=None, application_info=None):
         """Refresh the global state of the pool
 
         :param block: block at which to query historical state
         :type block: int, optional
+        :param application_info: prefetched indexer application info of the pool, fetched if not provided
+        :type application_info: dict, optional
         """
 
         # load pool state
-        indexer_client = self.historical_indexer if block else self.indexer
-        pool_state = get_global_state(indexer_client, self.application_id, block=block)
+        if application_info is None:
+            indexer_client = self.historical_indexer if block else self.indexer
+            application_info = get_application_info(
+                indexer_client, self.application_id, block=block
+            )
+        pool_state = format_global_state(application_info)
         self.asset1_balance = pool_state[POOL_STRINGS.balance_1]
         self.asset2_balance = pool_state[POOL_STRINGS.balance_2]
         self.lp_circulation = pool_state[POOL_STRINGS.lp_circulation]
@@ -304,10 +339,81 @@ class Pool:
         self.cumsum_fees_asset1 = pool_state[POOL_STRINGS.cumsum_fees_asset1]
         self.cumsum_fees_asset2 = pool_state[POOL_STRINGS.cumsum_fees_asset2]
 
+        # the amplification factor ramps with the block timestamp
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            self.load_amplification_factor(pool_state, block=block)
+
+    def load_amplification_factor(self, pool_state, block=None):
+        """Refresh the amplification factor ramp of a nanoswap pool and the block timestamp it is
+        interpolated at
+
+        :param pool_state: formatted global state of the pool
+        :type pool_state: dict
+        :param block: block at which the state was queried, defaults to the latest block
+        :type block: int, optional
+        """
+
+        self.initial_amplification_factor = pool_state.get(
+            POOL_STRINGS.initial_amplification_factor, 0
+        )
+        self.future_amplification_factor = pool_state.get(
+            POOL_STRINGS.future_amplification_factor, 0
+        )
+        self.initial_amplification_factor_time = pool_state.get(
+            POOL_STRINGS.initial_amplification_factor_time, 0
+        )
+        self.future_amplification_factor_time = pool_state.get(
+            POOL_STRINGS.future_amplification_factor_time, 0
+        )
+        self.t = get_block_timestamp(
+            self.algod,
+            block=block,
+            decoder=self.amm_client.algofi_client.transport.decoder,
+        )
+
+    def load_series(self, rounds, max_workers=DEFAULT_MAX_WORKERS):
+        """Returns the balances and cumulative fields of the pool at many rounds as columns. Rounds
+        are fetched concurrently through the historical indexer, which serves and archives them on
+        disk if the client has a historical cache path.
+
+        :param rounds: rounds to query, duplicates are fetched once
+        :type rounds: list
+        :param max_workers: number of rounds fetched in parallel
+        :type max_workers: int, optional
+        :return: dict of column name -> array ordered by round, with the rounds in column "round"
+        :rtype: dict
+        """
+
+        return get_global_state_series(
+            self.historical_indexer,
+            self.application_id,
+            rounds,
+            self.series_fields,
+            max_workers=max_workers,
+        )
+
     def refresh_lp_token_price(self):
-        """Refresh the dollar price of the LP token for this pool"""
+        """Returns the dollar price of the LP token for this pool from the shared price feed
+
+        :return: dollar price of the LP token
+        :rtype: float
+        """
 
-        self.lp_asset.refresh_price()
+        return self.lp_asset.refresh_price()
+
+    def get_lp_token_price(self, prices=None):
+        """Returns the dollar price of one LP token of this pool, valued locally from the pool
+        balances and asset prices, see :meth:`LPValuation.get_lp_token_price`
+
+        :param prices: dict of asset id -> dollar price, overriding market prices
+        :type prices: dict, optional
+        :return: dollar price of one LP token
+        :rtype: float
+        """
+
+        return self.amm_client.lp_valuation.get_lp_token_price(self, prices=prices)
 
     def get_pool_price(self, asset_id):
         """Gets the price of the pool in terms of the asset with given asset_id
@@ -332,6 +438,68 @@ class Pool:
         else:
             raise Exception("Invalid asset id")
 
+    def get_twap(self, asset_id, start_round, end_round=None):
+        """Returns the time weighted average price of an asset between two rounds, see
+        :meth:`PoolAnalytics.get_twap`
+
+        :param asset_id: asset id of the asset to price
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: average price in base units of the other asset per base unit of the asset
+        :rtype: float
+        """
+
+        return self.analytics.get_twap(asset_id, start_round, end_round=end_round)
+
+    def get_vwap(self, asset_id, start_round, end_round=None):
+        """Returns the volume weighted average price of an asset between two rounds, see
+        :meth:`PoolAnalytics.get_vwap`
+
+        :param asset_id: asset id of the asset to price
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: average price in base units of the other asset per base unit of the asset
+        :rtype: float
+        """
+
+        return self.analytics.get_vwap(asset_id, start_round, end_round=end_round)
+
+    def get_volume(self, asset_id, start_round, end_round=None):
+        """Returns the volume of an asset swapped between two rounds
+
+        :param asset_id: asset id of the swapped asset
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: volume in base units
+        :rtype: int
+        """
+
+        return self.analytics.get_volume(asset_id, start_round, end_round=end_round)
+
+    def get_fees(self, asset_id, start_round, end_round=None):
+        """Returns the fees collected in an asset between two rounds
+
+        :param asset_id: asset id of the fee asset
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: fees in base units
+        :rtype: int
+        """
+
+        return self.analytics.get_fees(asset_id, start_round, end_round=end_round)
+
     def sign_txn_with_logic_sig(self, transaction):
         """Returns input transaction signed with logic sig of pool
 
@@ -424,17 +592,17 @@ class Pool:
         # fund logic sig
         if self.network == Network.MAINNET:
             txn1 = get_payment_txn(
-                sender, params, self.logic_sig.address(), amount=450000
+                sender, params, self.logic_sig_address, amount=450000
             )
         else:
             txn1 = get_payment_txn(
-                sender, params, self.logic_sig.address(), amount=835000
+                sender, params, self.logic_sig_address, amount=835000
             )
 
         # opt logic sig into manager
         params.fee = 2000
         txn2 = ApplicationOptInTxn(
-            sender=self.logic_sig.address(),
+            sender=self.logic_sig_address,
             sp=params,
             index=self.manager_application_id,
             app_args=[
@@ -803,6 +971,52 @@ class Pool:
 
         return self.future_amplification_factor
 
+    def get_state(self):
+        """Returns an immutable snapshot of the pool that quotes are computed from. The snapshot is
+        reused until the balances or parameters of the pool change. Uninitialized pools have no
+        balances yet and are snapshotted as empty.
+
+        :return: current state of the pool
+        :rtype: :class:`PoolState`
+        """
+
+        try:
+            asset1_balance = self.asset1_balance
+            asset2_balance = self.asset2_balance
+            lp_circulation = self.lp_circulation
+            swap_fee = self.swap_fee
+        except AttributeError:
+            asset1_balance, asset2_balance, lp_circulation, swap_fee = 0, 0, 0, None
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            amplification_factor = self.amplification_factor
+        else:
+            amplification_factor = None
+
+        state = self._state
+        if (
+            state is None
+            or state.asset1_balance != asset1_balance
+            or state.asset2_balance != asset2_balance
+            or state.lp_circulation != lp_circulation
+            or state.swap_fee != swap_fee
+            or state.amplification_factor != amplification_factor
+        ):
+            state = PoolState(
+                self.pool_type,
+                self.asset1,
+                self.asset2,
+                swap_fee,
+                amplification_factor,
+                self.stable_swap_engine,
+                asset1_balance,
+                asset2_balance,
+                lp_circulation,
+            )
+            self._state = state
+        return state
+
     def get_empty_pool_quote(self, asset1_pooled_amount, asset2_pooled_amount):
         """Get pool quote for an empty pool
 
@@ -814,27 +1028,8 @@ class Pool:
         :rtype: :class:`BalanceDelta`
         """
 
-        if (self.pool_type == PoolType.NANOSWAP) or (
-            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-        ):
-            lps_issued, num_iter = get_D(
-                [asset2_pooled_amount, asset2_pooled_amount], self.amplification_factor
-            )
-        else:
-            num_iter = 0
-            if asset1_pooled_amount * asset2_pooled_amount > 2**64 - 1:
-                lps_issued = int((asset1_pooled_amount) ** (0.5)) * int(
-                    (asset2_pooled_amount) ** (0.5)
-                )
-            else:
-                lps_issued = int((asset1_pooled_amount * asset2_pooled_amount) ** (0.5))
-
-        return BalanceDelta(
-            self,
-            -1 * asset1_pooled_amount,
-            -1 * asset2_pooled_amount,
-            lps_issued,
-            num_iter,
+        return self.get_state().get_empty_pool_quote(
+            asset1_pooled_amount, asset2_pooled_amount
         )
 
     def get_pool_quote(self, asset_id, asset_amount):
@@ -848,48 +1043,7 @@ class Pool:
         :rtype: :class:`BalanceDelta`
         """
 
-        if self.lp_circulation == 0:
-            raise Exception("Error: pool is empty")
-
-        if asset_id == self.asset1.asset_id:
-            asset1_pooled_amount = asset_amount
-            asset2_pooled_amount = int(
-                asset1_pooled_amount * self.asset2_balance // self.asset1_balance
-            )
-        else:
-            asset2_pooled_amount = asset_amount
-            asset1_pooled_amount = int(
-                asset2_pooled_amount * self.asset1_balance // self.asset2_balance
-            )
-
-        if (self.pool_type == PoolType.NANOSWAP) or (
-            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-        ):
-            D0, num_iter_D0 = get_D(
-                [self.asset1_balance, self.asset2_balance], self.amplification_factor
-            )
-            D1, num_iter_D1 = get_D(
-                [
-                    self.asset1_balance + asset1_pooled_amount,
-                    self.asset2_balance + asset2_pooled_amount,
-                ],
-                self.amplification_factor,
-            )
-            lps_issued = int(self.lp_circulation * (D1 - D0) // D0)
-            num_iter = num_iter_D0 + num_iter_D1
-        else:
-            lps_issued = int(
-                asset1_pooled_amount * self.lp_circulation // self.asset1_balance
-            )
-            num_iter = 0
-
-        return BalanceDelta(
-            self,
-            -1 * asset1_pooled_amount,
-            -1 * asset2_pooled_amount,
-            lps_issued,
-            num_iter,
-        )
+        return self.get_state().get_pool_quote(asset_id, asset_amount)
 
     def get_burn_quote(self, lp_amount):
         """Get burn quote for a given amount of lps to burn
@@ -900,16 +1054,7 @@ class Pool:
         :rtype: :class:`BalanceDelta`
         """
 
-        if self.lp_circulation == 0:
-            raise Exception("Error: pool is empty")
-
-        if self.lp_circulation < lp_amount:
-            raise Exception("Error: cannot burn more lp tokens than are in circulation")
-
-        asset1_amount = int(lp_amount * self.asset1_balance // self.lp_circulation)
-        asset2_amount = int(lp_amount * self.asset2_balance // self.lp_circulation)
-
-        return BalanceDelta(self, asset1_amount, asset2_amount, -1 * lp_amount)
+        return self.get_state().get_burn_quote(lp_amount)
 
     def get_swap_exact_for_quote(self, swap_in_asset_id, swap_in_amount):
         """Get swap exact for quote for a given asset id and swap amount
@@ -922,64 +1067,10 @@ class Pool:
         :rtype: :class:`BalanceDelta`
         """
 
-        if self.lp_circulation == 0:
-            raise Exception("Error: pool is empty")
-
-        swap_in_amount_less_fees = swap_in_amount - int(
-            math.ceil(swap_in_amount * self.swap_fee)
+        return self.get_state().get_swap_exact_for_quote(
+            swap_in_asset_id, swap_in_amount
         )
 
-        if swap_in_asset_id == self.asset1.asset_id:
-            if (self.pool_type == PoolType.NANOSWAP) or (
-                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-            ):
-                D, num_iter_D = get_D(
-                    [self.asset1_balance, self.asset2_balance],
-                    self.amplification_factor,
-                )
-                y, num_iter_y = get_y(
-                    0,
-                    1,
-                    self.asset1_balance + swap_in_amount_less_fees,
-                    [self.asset1_balance, self.asset2_balance],
-                    D,
-                    self.amplification_factor,
-                )
-                swap_out_amount = self.asset2_balance - y
-                num_iter = num_iter_D + num_iter_y
-            else:
-                swap_out_amount = int(
-                    (self.asset2_balance * swap_in_amount_less_fees)
-                    // (self.asset1_balance + swap_in_amount_less_fees)
-                )
-                num_iter = 0
-            return BalanceDelta(self, -1 * swap_in_amount, swap_out_amount, 0, num_iter)
-        else:
-            if (self.pool_type == PoolType.NANOSWAP) or (
-                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-            ):
-                D, num_iter_D = get_D(
-                    [self.asset1_balance, self.asset2_balance],
-                    self.amplification_factor,
-                )
-                y, num_iter_y = get_y(
-                    1,
-                    0,
-                    self.asset2_balance + swap_in_amount_less_fees,
-                    [self.asset1_balance, self.asset2_balance],
-                    D,
-                    self.amplification_factor,
-                )
-                swap_out_amount = self.asset1_balance - y
-                num_iter = num_iter_D + num_iter_y
-            else:
-                swap_out_amount = int(
-                    (self.asset1_balance * swap_in_amount_less_fees)
-                    // (self.asset2_balance + swap_in_amount_less_fees)
-                )
-                num_iter = 0
-            return BalanceDelta(self, swap_out_amount, -1 * swap_in_amount, 0, num_iter)
-
     def get_swap_for_exact_quote(self, swap_out_asset_id, swap_out_amount):
         """Get swap for exact quote for a given asset id and swap amount
 
@@ -991,67 +1082,246 @@ class Pool:
         :rtype: :class:`BalanceDelta`
         """
 
+        return self.get_state().get_swap_for_exact_quote(
+            swap_out_asset_id, swap_out_amount
+        )
+
+    def get_depth_table(self, swap_in_asset_id):
+        """Returns the price impact table for swaps of a given asset into the pool. The table is
+        built on first use and rebuilt when the pool balances change.
+
+        :param swap_in_asset_id: id of incoming asset
+        :type swap_in_asset_id: int
+        :return: depth table of swap sizes against price impact and output
+        :rtype: :class:`DepthTable`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        depth_table = self.depth_tables.get(swap_in_asset_id, None)
+        if depth_table is None or not depth_table.is_valid(self):
+            depth_table = DepthTable(self, swap_in_asset_id)
+            self.depth_tables[swap_in_asset_id] = depth_table
+        return depth_table
+
+    def get_spot_swap_rate(self, swap_in_asset_id):
+        """Returns the marginal output per unit of input of a swap of zero size, excluding the swap fee
+
+        :param swap_in_asset_id: id of incoming asset
+        :type swap_in_asset_id: int
+        :return: spot swap rate in base units of the outgoing asset per base unit of the incoming asset
+        :rtype: float
+        """
+
+        if swap_in_asset_id == self.asset1.asset_id:
+            swap_in_balance, swap_out_balance = self.asset1_balance, self.asset2_balance
+        else:
+            swap_in_balance, swap_out_balance = self.asset2_balance, self.asset1_balance
+
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            D, _ = self.stable_swap_engine.get_D(
+                [self.asset1_balance, self.asset2_balance], self.amplification_factor
+            )
+            return get_stable_swap_price(
+                swap_in_balance, swap_out_balance, D, self.amplification_factor
+            )
+        return swap_out_balance / swap_in_balance
+
+    def get_max_swap_in_amount(
+        self, swap_in_asset_id, max_slippage=None, min_output_ratio=None
+    ):
+        """Returns the largest swap exact for input whose output per unit of input is at least
+        min_output_ratio or, given max_slippage, within max_slippage of the spot swap rate. The swap
+        fee counts towards slippage, so slippage bounds below the fee return 0. Constant product
+        bounds start from a closed form, nanoswap bounds are solved over the stableswap invariant.
+        The returned input meets the bound exactly against :meth:`get_swap_exact_for_quote` and the
+        next larger input does not. Quotes round to whole units, so near the bound inputs meeting it
+        and inputs missing it interleave, and the returned input is the largest up to that range,
+        at most a few parts per million of the bound.
+
+        :param swap_in_asset_id: id of incoming asset
+        :type swap_in_asset_id: int
+        :param max_slippage: maximum relative shortfall of the output from the spot swap rate (e.g. 0.01 for 1%)
+        :type max_slippage: float, optional
+        :param min_output_ratio: minimum output per unit of input, in base units
+        :type min_output_ratio: float, optional
+        :return: largest amount of incoming asset meeting the bound
+        :rtype: int
+        """
+
+        max_slippages = None if max_slippage is None else [max_slippage]
+        min_output_ratios = None if min_output_ratio is None else [min_output_ratio]
+        return int(
+            self.get_max_swap_in_amounts(
+                swap_in_asset_id,
+                max_slippages=max_slippages,
+                min_output_ratios=min_output_ratios,
+            )[0]
+        )
+
+    def get_max_swap_in_amounts(
+        self, swap_in_asset_id, max_slippages=None, min_output_ratios=None
+    ):
+        """Returns :meth:`get_max_swap_in_amount` for many bounds at once. Bounds are solved from the
+        strictest to the loosest, each starting from the previous solution, so bounds may land
+        elsewhere within the rounding of the quotes than the scalar solve.
+
+        :param swap_in_asset_id: id of incoming asset
+        :type swap_in_asset_id: int
+        :param max_slippages: maximum relative shortfalls of the output from the spot swap rate
+        :type max_slippages: array-like, optional
+        :param min_output_ratios: minimum outputs per unit of input, in base units
+        :type min_output_ratios: array-like, optional
+        :return: largest amount of incoming asset meeting each bound
+        :rtype: :class:`numpy.ndarray`
+        """
+
         if self.lp_circulation == 0:
             raise Exception("Error: pool is empty")
+        if (max_slippages is None) == (min_output_ratios is None):
+            raise Exception(
+                "Error: exactly one of max slippage or min output ratio must be given"
+            )
+        if min_output_ratios is None:
+            spot_swap_rate = self.get_spot_swap_rate(swap_in_asset_id)
+            min_output_ratios = [
+                spot_swap_rate * (1 - max_slippage) for max_slippage in max_slippages
+            ]
+        min_output_ratios = [float(ratio) for ratio in min_output_ratios]
+        if any(ratio <= 0 for ratio in min_output_ratios):
+            raise Exception("Error: min output ratio must be positive")
+
+        swap_in_is_asset1 = swap_in_asset_id == self.asset1.asset_id
+        if swap_in_is_asset1:
+            swap_in_balance, swap_out_balance = self.asset1_balance, self.asset2_balance
+        else:
+            swap_in_balance, swap_out_balance = self.asset2_balance, self.asset1_balance
+        fee_factor = 1 - self.swap_fee
 
-        if swap_out_asset_id == self.asset1.asset_id:
-            if (self.pool_type == PoolType.NANOSWAP) or (
-                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-            ):
-                D, num_iter_D = get_D(
-                    [self.asset1_balance, self.asset2_balance],
-                    self.amplification_factor,
+        state = self.get_state()
+
+        def get_swap_out_amount(swap_in_amount):
+            if swap_in_amount <= 0:
+                return 0
+            quote = state.get_swap_exact_for_quote(swap_in_asset_id, swap_in_amount)
+            return quote.asset2_delta if swap_in_is_asset1 else quote.asset1_delta
+
+        is_stable_swap = (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        )
+        if is_stable_swap:
+            amplification_factor = self.amplification_factor
+            D, _ = self.stable_swap_engine.get_D(
+                [self.asset1_balance, self.asset2_balance], amplification_factor
+            )
+
+            def get_marginal_output(swap_in_amount):
+                swap_in_amount_less_fees = swap_in_amount - int(
+                    math.ceil(swap_in_amount * self.swap_fee)
                 )
-                y, num_iter_y = get_y(
-                    1,
-                    0,
-                    self.asset1_balance - swap_out_amount,
-                    [self.asset1_balance, self.asset2_balance],
+                return fee_factor * get_stable_swap_price(
+                    swap_in_balance + swap_in_amount_less_fees,
+                    swap_out_balance - get_swap_out_amount(swap_in_amount),
                     D,
-                    self.amplification_factor,
-                )
-                swap_in_amount_less_fees = y - self.asset2_balance
-                num_iter = num_iter_D + num_iter_y
-            else:
-                swap_in_amount_less_fees = (
-                    int(
-                        (self.asset2_balance * swap_out_amount)
-                        // (self.asset1_balance - swap_out_amount)
-                    )
-                    - 1
+                    amplification_factor,
                 )
-                num_iter = 0
+
         else:
-            if (self.pool_type == PoolType.NANOSWAP) or (
-                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
-            ):
-                D, num_iter_D = get_D(
-                    [self.asset1_balance, self.asset2_balance],
-                    self.amplification_factor,
-                )
-                y, num_iter_y = get_y(
-                    0,
-                    1,
-                    self.asset2_balance - swap_out_amount,
-                    [self.asset1_balance, self.asset2_balance],
-                    D,
-                    self.amplification_factor,
+
+            def get_marginal_output(swap_in_amount):
+                return (
+                    swap_out_balance
+                    * swap_in_balance
+                    * fee_factor
+                    / (swap_in_balance + swap_in_amount * fee_factor) ** 2
                 )
-                swap_in_amount_less_fees = y - self.asset1_balance
-                num_iter = num_iter_D + num_iter_y
+
+        max_swap_in_amounts = [0] * len(min_output_ratios)
+        guess = None
+        # stricter ratios have smaller bounds, which seed the looser ones
+        for i in sorted(
+            range(len(min_output_ratios)), key=lambda i: -min_output_ratios[i]
+        ):
+            min_output_ratio = min_output_ratios[i]
+            if is_stable_swap:
+                # the output never exceeds the pool balance
+                upper_bound = int(swap_out_balance / min_output_ratio) + 1
             else:
-                swap_in_amount_less_fees = (
-                    int(
-                        (self.asset1_balance * swap_out_amount)
-                        // (self.asset2_balance - swap_out_amount)
-                    )
-                    - 1
+                # rounding only lowers the output, so the closed form bounds the exact solution
+                closed_form = get_constant_product_max_swap_in_amount(
+                    swap_in_balance, swap_out_balance, self.swap_fee, min_output_ratio
                 )
-                num_iter = 0
+                upper_bound = int(closed_form) + 1
+                guess = int(closed_form)
+            guess = solve_max_swap_in_amount(
+                get_swap_out_amount,
+                min_output_ratio,
+                upper_bound,
+                guess=guess,
+                get_marginal_output=get_marginal_output,
+            )
+            max_swap_in_amounts[i] = guess
+        return np.array(max_swap_in_amounts, dtype=np.int64)
 
-        swap_in_amount = math.ceil(swap_in_amount_less_fees // (1 - self.swap_fee))
+    def get_swap_exact_for_quotes(
+        self,
+        swap_in_asset_id,
+        swap_in_amounts,
+        asset1_balances=None,
+        asset2_balances=None,
+    ):
+        """Get swap exact for quotes for many swap amounts at once. Quotes match
+        :meth:`get_swap_exact_for_quote` exactly. Constant product quotes are vectorized
+        and nanoswap quotes solve D once per pool state.
 
-        if swap_out_asset_id == self.asset1.asset_id:
-            return BalanceDelta(self, swap_out_amount, -1 * swap_in_amount, 0, num_iter)
-        else:
-            return BalanceDelta(self, -1 * swap_in_amount, swap_out_amount, 0, num_iter)
+        :param swap_in_asset_id: id of incoming asset to swap
+        :type swap_in_asset_id: int
+        :param swap_in_amounts: amounts of incoming asset to swap
+        :type swap_in_amounts: array-like
+        :param asset1_balances: asset 1 pool balances to quote against, defaults to the current balance
+        :type asset1_balances: array-like, optional
+        :param asset2_balances: asset 2 pool balances to quote against, defaults to the current balance
+        :type asset2_balances: array-like, optional
+        :return: swap exact for quotes, one entry per amount
+        :rtype: :class:`BatchQuote`
+        """
+
+        return self.get_state().get_swap_exact_for_quotes(
+            swap_in_asset_id,
+            swap_in_amounts,
+            asset1_balances=asset1_balances,
+            asset2_balances=asset2_balances,
+        )
+
+    def get_swap_for_exact_quotes(
+        self,
+        swap_out_asset_id,
+        swap_out_amounts,
+        asset1_balances=None,
+        asset2_balances=None,
+    ):
+        """Get swap for exact quotes for many swap amounts at once. Quotes match
+        :meth:`get_swap_for_exact_quote` exactly. Constant product quotes are vectorized
+        and nanoswap quotes solve D once per pool state.
+
+        :param swap_out_asset_id: id of outgoing asset
+        :type swap_out_asset_id: int
+        :param swap_out_amounts: amounts of outgoing asset
+        :type swap_out_amounts: array-like
+        :param asset1_balances: asset 1 pool balances to quote against, defaults to the current balance
+        :type asset1_balances: array-like, optional
+        :param asset2_balances: asset 2 pool balances to quote against, defaults to the current balance
+        :type asset2_balances: array-like, optional
+        :return: swap for exact quotes, one entry per amount
+        :rtype: :class:`BatchQuote`
+        """
+
+        return self.get_state().get_swap_for_exact_quotes(
+            swap_out_asset_id,
+            swap_out_amounts,
+            asset1_balances=asset1_balances,
+            asset2_balances=asset2_balances,
+        )
@@ -0,0 +1,257 @@
+# IMPORTS
+
+# external
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+from .amm_config import POOL_STRINGS
+from ...state_utils import get_application_info, format_global_state
+
+# INTERFACE
+
+# constants
+DEFAULT_MAX_SAMPLES = 256
+DEFAULT_MAX_WORKERS = 10
+# fixed point scale of the cumulative prices accumulated by the pool contract
+CUMSUM_PRICE_SCALE_FACTOR = 1000000
+
+
+class PoolSample:
+    def __init__(self, round_num, pool_state):
+        """Cumulative fields of a pool at a round
+
+        :param round_num: round of the sample, None for the loaded state of a pool
+        :type round_num: int
+        :param pool_state: formatted global state of the pool, or an object with the pool attributes
+        :type pool_state: dict or :class:`Pool`
+        """
+
+        if not isinstance(pool_state, dict):
+            pool_state = dict(
+                [
+                    (getattr(POOL_STRINGS, name), getattr(pool_state, name))
+                    for name in [
+                        "latest_time",
+                        "cumsum_time_weighted_asset1_to_asset2_price",
+                        "cumsum_time_weighted_asset2_to_asset1_price",
+                        "cumsum_volume_asset1",
+                        "cumsum_volume_asset2",
+                        "cumsum_volume_weighted_asset1_to_asset2_price",
+                        "cumsum_volume_weighted_asset2_to_asset1_price",
+                        "cumsum_fees_asset1",
+                        "cumsum_fees_asset2",
+                    ]
+                ]
+            )
+
+        self.round_num = round_num
+        self.latest_time = pool_state.get(POOL_STRINGS.latest_time, 0)
+        # cumulative fields keyed by whether they refer to asset 1
+        self.cumsum_time_weighted_price = {
+            True: pool_state.get(
+                POOL_STRINGS.cumsum_time_weighted_asset1_to_asset2_price, 0
+            ),
+            False: pool_state.get(
+                POOL_STRINGS.cumsum_time_weighted_asset2_to_asset1_price, 0
+            ),
+        }
+        self.cumsum_volume_weighted_price = {
+            True: pool_state.get(
+                POOL_STRINGS.cumsum_volume_weighted_asset1_to_asset2_price, 0
+            ),
+            False: pool_state.get(
+                POOL_STRINGS.cumsum_volume_weighted_asset2_to_asset1_price, 0
+            ),
+        }
+        self.cumsum_volume = {
+            True: pool_state.get(POOL_STRINGS.cumsum_volume_asset1, 0),
+            False: pool_state.get(POOL_STRINGS.cumsum_volume_asset2, 0),
+        }
+        self.cumsum_fees = {
+            True: pool_state.get(POOL_STRINGS.cumsum_fees_asset1, 0),
+            False: pool_state.get(POOL_STRINGS.cumsum_fees_asset2, 0),
+        }
+
+
+class PoolAnalytics:
+    def __init__(
+        self, pool, max_samples=DEFAULT_MAX_SAMPLES, max_workers=DEFAULT_MAX_WORKERS
+    ):
+        """Windowed averages, volumes and fees of a pool between two rounds, computed from the
+        differences of the cumulative fields of the pool at each round. Historical states are
+        fetched concurrently and kept in a ring buffer of recent samples, so repeat queries over
+        the same rounds do not hit the indexer.
+
+        :param pool: pool to analyze
+        :type pool: :class:`Pool`
+        :param max_samples: number of samples kept, the oldest fetched are evicted first
+        :type max_samples: int, optional
+        :param max_workers: number of historical states fetched in parallel
+        :type max_workers: int, optional
+        """
+
+        self.pool = pool
+        self.max_samples = max_samples
+        self.max_workers = max_workers
+
+        # round -> :class:`PoolSample`, evicted in the order of self.rounds
+        self.samples = {}
+        self.rounds = deque()
+        self._lock = threading.Lock()
+
+    def add_sample(self, sample):
+        """Adds a sample to the ring buffer, evicting the oldest if it is full
+
+        :param sample: sample of the pool at a round
+        :type sample: :class:`PoolSample`
+        """
+
+        with self._lock:
+            if sample.round_num in self.samples:
+                return
+            while len(self.rounds) >= self.max_samples:
+                del self.samples[self.rounds.popleft()]
+            self.samples[sample.round_num] = sample
+            self.rounds.append(sample.round_num)
+
+    def _fetch(self, round_num):
+        application_info = get_application_info(
+            self.pool.historical_indexer, self.pool.application_id, block=round_num
+        )
+        sample = PoolSample(round_num, format_global_state(application_info))
+        self.add_sample(sample)
+        return sample
+
+    def load_samples(self, rounds):
+        """Returns samples of the pool at the given rounds, fetching those not in the ring buffer
+        concurrently. A round of None is the loaded state of the pool.
+
+        :param rounds: rounds to sample
+        :type rounds: list
+        :return: dict of round -> :class:`PoolSample`
+        :rtype: dict
+        """
+
+        samples = {}
+        with self._lock:
+            for round_num in rounds:
+                if round_num is None:
+                    samples[None] = PoolSample(None, self.pool)
+                elif round_num in self.samples:
+                    samples[round_num] = self.samples[round_num]
+        missing_rounds = [
+            round_num for round_num in set(rounds) if round_num not in samples
+        ]
+
+        if len(missing_rounds) == 1:
+            samples[missing_rounds[0]] = self._fetch(missing_rounds[0])
+        elif missing_rounds:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                samples.update(
+                    zip(missing_rounds, executor.map(self._fetch, missing_rounds))
+                )
+        return samples
+
+    def _get_window(self, asset_id, start_round, end_round):
+        if asset_id == self.pool.asset1.asset_id:
+            is_asset1 = True
+        elif asset_id == self.pool.asset2.asset_id:
+            is_asset1 = False
+        else:
+            raise Exception("Error: invalid asset id")
+        if (end_round is not None) and (start_round >= end_round):
+            raise Exception("Error: start round must be before end round")
+
+        samples = self.load_samples([start_round, end_round])
+        return is_asset1, samples[start_round], samples[end_round]
+
+    def get_twap(self, asset_id, start_round, end_round=None):
+        """Returns the time weighted average price of an asset between two rounds. The window runs
+        between the last updates of the pool at or before each round, as the pool only accumulates
+        prices when it is called.
+
+        :param asset_id: asset id of the asset to price
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: average price in base units of the other asset per base unit of the asset, None
+            if the pool was not updated within the window
+        :rtype: float
+        """
+
+        is_asset1, start, end = self._get_window(asset_id, start_round, end_round)
+        elapsed_time = end.latest_time - start.latest_time
+        if elapsed_time <= 0:
+            return None
+        return (
+            (
+                end.cumsum_time_weighted_price[is_asset1]
+                - start.cumsum_time_weighted_price[is_asset1]
+            )
+            / elapsed_time
+            / CUMSUM_PRICE_SCALE_FACTOR
+        )
+
+    def get_vwap(self, asset_id, start_round, end_round=None):
+        """Returns the average price of an asset between two rounds weighted by the volume of the
+        asset swapped
+
+        :param asset_id: asset id of the asset to price
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: average price in base units of the other asset per base unit of the asset, None
+            if the asset was not swapped within the window
+        :rtype: float
+        """
+
+        is_asset1, start, end = self._get_window(asset_id, start_round, end_round)
+        volume = end.cumsum_volume[is_asset1] - start.cumsum_volume[is_asset1]
+        if volume <= 0:
+            return None
+        return (
+            (
+                end.cumsum_volume_weighted_price[is_asset1]
+                - start.cumsum_volume_weighted_price[is_asset1]
+            )
+            / volume
+            / CUMSUM_PRICE_SCALE_FACTOR
+        )
+
+    def get_volume(self, asset_id, start_round, end_round=None):
+        """Returns the volume of an asset swapped between two rounds
+
+        :param asset_id: asset id of the swapped asset
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: volume in base units
+        :rtype: int
+        """
+
+        is_asset1, start, end = self._get_window(asset_id, start_round, end_round)
+        return end.cumsum_volume[is_asset1] - start.cumsum_volume[is_asset1]
+
+    def get_fees(self, asset_id, start_round, end_round=None):
+        """Returns the fees collected in an asset between two rounds
+
+        :param asset_id: asset id of the fee asset
+        :type asset_id: int
+        :param start_round: round at which the window starts
+        :type start_round: int
+        :param end_round: round at which the window ends, defaults to the loaded state of the pool
+        :type end_round: int, optional
+        :return: fees in base units
+        :rtype: int
+        """
+
+        is_asset1, start, end = self._get_window(asset_id, start_round, end_round)
+        return end.cumsum_fees[is_asset1] - start.cumsum_fees[is_asset1]
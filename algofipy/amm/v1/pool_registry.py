@@ -0,0 +1,151 @@
+# IMPORTS
+
+# external
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+from .amm_config import PoolStatus
+from .pool import Pool
+
+# INTERFACE
+
+# constants
+DEFAULT_MAX_WORKERS = 10
+
+
+class PoolRegistry:
+    def __init__(self, amm_client, max_workers=DEFAULT_MAX_WORKERS):
+        """Registry of loaded :class:`Pool` objects indexed by pool type and asset pair,
+        by app id, and by unordered asset pair across pool types. Only active pools are
+        cached so that uninitialized pools are looked up again on the next request.
+
+        :param amm_client: a :class:`AMMClient` object for interacting with the AMM
+        :type amm_client: :class:`AMMClient`
+        :param max_workers: number of pools refreshed in parallel by :meth:`refresh`
+        :type max_workers: int, optional
+        """
+
+        self.amm_client = amm_client
+        self.max_workers = max_workers
+
+        # (pool_type, asset1_id, asset2_id) -> :class:`Pool`
+        self.pools = {}
+        # app id -> :class:`Pool`
+        self.pools_by_app_id = {}
+        # (asset1_id, asset2_id) -> list of :class:`Pool` across pool types
+        self.pools_by_pair = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_pair_key(asset1_id, asset2_id):
+        """Returns the unordered pair key for two assets
+
+        :param asset1_id: asset 1 id
+        :type asset1_id: int
+        :param asset2_id: asset 2 id
+        :type asset2_id: int
+        :return: tuple of the smaller and larger asset id
+        :rtype: tuple
+        """
+
+        return (min(asset1_id, asset2_id), max(asset1_id, asset2_id))
+
+    def __len__(self):
+        return len(self.pools)
+
+    def __iter__(self):
+        return iter(list(self.pools.values()))
+
+    def add(self, pool):
+        """Adds a pool to the registry
+
+        :param pool: pool to add
+        :type pool: :class:`Pool`
+        :return: the registered pool, which is the already registered one if the pool was known
+        :rtype: :class:`Pool`
+        """
+
+        key = (pool.pool_type, pool.asset1.asset_id, pool.asset2.asset_id)
+        with self._lock:
+            if key in self.pools:
+                return self.pools[key]
+            self.pools[key] = pool
+            if pool.application_id:
+                self.pools_by_app_id[pool.application_id] = pool
+            self.pools_by_pair.setdefault(
+                self.get_pair_key(pool.asset1.asset_id, pool.asset2.asset_id), []
+            ).append(pool)
+        return pool
+
+    def get_pool(self, pool_type, asset1_id, asset2_id, refresh=False):
+        """Returns the registered pool for given assets and pool type, loading it if unknown
+
+        :param pool_type: a :class:`PoolType` object for the type of pool (e.g. 30bp, 100bp fee)
+        :type pool_type: :class:`PoolType`
+        :param asset1_id: asset 1 id
+        :type asset1_id: int
+        :param asset2_id: asset 2 id
+        :type asset2_id: int
+        :param refresh: reload the state of an already registered pool
+        :type refresh: bool, optional
+        :return: a :class:`Pool` object for given assets and pool_type
+        :rtype: :class:`Pool`
+        """
+
+        if asset1_id == asset2_id:
+            raise Exception("Invalid assets. must be different")
+
+        asset1_id, asset2_id = self.get_pair_key(asset1_id, asset2_id)
+        pool = self.pools.get((pool_type, asset1_id, asset2_id))
+        if pool is not None:
+            if refresh:
+                pool.load_state()
+            return pool
+
+        pool = Pool(
+            self.amm_client,
+            pool_type,
+            self.amm_client.get_asset(asset1_id),
+            self.amm_client.get_asset(asset2_id),
+        )
+        if pool.pool_status != PoolStatus.ACTIVE:
+            return pool
+        return self.add(pool)
+
+    def get_pool_by_app_id(self, app_id):
+        """Returns the registered pool with a given app id
+
+        :param app_id: pool app id
+        :type app_id: int
+        :return: registered pool, None if unknown
+        :rtype: :class:`Pool`
+        """
+
+        return self.pools_by_app_id.get(app_id, None)
+
+    def get_pools_for_pair(self, asset1_id, asset2_id):
+        """Returns every registered pool trading a pair of assets, across pool types
+
+        :param asset1_id: asset 1 id
+        :type asset1_id: int
+        :param asset2_id: asset 2 id
+        :type asset2_id: int
+        :return: list of :class:`Pool` for the pair
+        :rtype: list
+        """
+
+        return list(self.pools_by_pair.get(self.get_pair_key(asset1_id, asset2_id), []))
+
+    def refresh(self, pools=None, block=None):
+        """Reloads the state of registered pools concurrently
+
+        :param pools: pools to refresh, defaults to every registered pool
+        :type pools: list, optional
+        :param block: block at which to query historical state
+        :type block: int, optional
+        """
+
+        pools = list(self) if pools is None else list(pools)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda pool: pool.load_state(block=block), pools))
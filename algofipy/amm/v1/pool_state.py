@@ -0,0 +1,535 @@
+# IMPORTS
+
+# external
+import math
+
+# local
+from .amm_config import PoolType
+from .balance_delta import BalanceDelta
+from .batch_quote import (
+    get_swap_exact_for_quotes,
+    get_swap_for_exact_quotes,
+    get_stable_swap_quotes,
+    build_swap_batch_quote,
+)
+
+# INTERFACE
+
+
+class PoolState:
+    __slots__ = (
+        "pool_type",
+        "asset1",
+        "asset2",
+        "swap_fee",
+        "amplification_factor",
+        "stable_swap_engine",
+        "asset1_balance",
+        "asset2_balance",
+        "lp_circulation",
+    )
+
+    def __init__(
+        self,
+        pool_type,
+        asset1,
+        asset2,
+        swap_fee,
+        amplification_factor,
+        stable_swap_engine,
+        asset1_balance,
+        asset2_balance,
+        lp_circulation,
+    ):
+        """Immutable snapshot of the balances of a pool and the parameters its quotes depend on.
+        Quotes computed against a state match the quotes of the :class:`Pool` it was taken from.
+        Applying a quote returns a new state, so sequences of operations can be simulated and
+        branched without copying or mutating the pool.
+
+        :param pool_type: a :class:`PoolType` object for the type of pool (e.g. 30bp, 100bp fee)
+        :type pool_type: :class:`PoolType`
+        :param asset1: a :class:`Asset` representing the first asset of the pool
+        :type asset1: :class:`Asset`
+        :param asset2: a :class:`Asset` representing the second asset of the pool
+        :type asset2: :class:`Asset`
+        :param swap_fee: swap fee of the pool (e.g. 0.0025)
+        :type swap_fee: float
+        :param amplification_factor: amplification factor of nanoswap pools, None otherwise
+        :type amplification_factor: int
+        :param stable_swap_engine: engine solving the stableswap invariant
+        :type stable_swap_engine: :class:`StableSwapEngine`
+        :param asset1_balance: asset 1 balance of the pool
+        :type asset1_balance: int
+        :param asset2_balance: asset 2 balance of the pool
+        :type asset2_balance: int
+        :param lp_circulation: lp tokens in circulation
+        :type lp_circulation: int
+        """
+
+        set_slot = object.__setattr__
+        set_slot(self, "pool_type", pool_type)
+        set_slot(self, "asset1", asset1)
+        set_slot(self, "asset2", asset2)
+        set_slot(self, "swap_fee", swap_fee)
+        set_slot(self, "amplification_factor", amplification_factor)
+        set_slot(self, "stable_swap_engine", stable_swap_engine)
+        set_slot(self, "asset1_balance", asset1_balance)
+        set_slot(self, "asset2_balance", asset2_balance)
+        set_slot(self, "lp_circulation", lp_circulation)
+
+    def __setattr__(self, name, value):
+        raise Exception(
+            "Error: pool state is immutable, use apply to derive a new state"
+        )
+
+    def __reduce__(self):
+        return (
+            PoolState,
+            (
+                self.pool_type,
+                self.asset1,
+                self.asset2,
+                self.swap_fee,
+                self.amplification_factor,
+                self.stable_swap_engine,
+                self.asset1_balance,
+                self.asset2_balance,
+                self.lp_circulation,
+            ),
+        )
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # immutable, and shares the stableswap engine with its pool
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, PoolState):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    @property
+    def key(self):
+        """Returns the values that determine the quotes of the state
+
+        :return: tuple of the pool type, asset ids, swap fee, amplification factor, balances and lp circulation
+        :rtype: tuple
+        """
+
+        return (
+            self.pool_type,
+            self.asset1.asset_id,
+            self.asset2.asset_id,
+            self.swap_fee,
+            self.amplification_factor,
+            self.asset1_balance,
+            self.asset2_balance,
+            self.lp_circulation,
+        )
+
+    def apply(self, balance_delta):
+        """Returns the state after the operation of a quote. Quote deltas are changes to the
+        balances of the user, so the pool balances move the opposite way and lp circulation moves
+        with the lp delta. The reserve share of swap fees is not separated from the balances.
+
+        :param balance_delta: quote of a pool, burn or swap against this state
+        :type balance_delta: :class:`BalanceDelta`
+        :return: new state
+        :rtype: :class:`PoolState`
+        """
+
+        asset1_balance = self.asset1_balance - balance_delta.asset1_delta
+        asset2_balance = self.asset2_balance - balance_delta.asset2_delta
+        lp_circulation = self.lp_circulation + balance_delta.lp_delta
+        if asset1_balance < 0 or asset2_balance < 0 or lp_circulation < 0:
+            raise Exception("Error: balance delta exceeds the pool balances")
+
+        return PoolState(
+            self.pool_type,
+            self.asset1,
+            self.asset2,
+            self.swap_fee,
+            self.amplification_factor,
+            self.stable_swap_engine,
+            asset1_balance,
+            asset2_balance,
+            lp_circulation,
+        )
+
+    def get_empty_pool_quote(self, asset1_pooled_amount, asset2_pooled_amount):
+        """Get pool quote for an empty pool
+
+        :param asset1_pooled_amount: asset 1 pooled amount
+        :type asset1_pooled_amount: int
+        :param asset2_pooled_amount: asset 2 pooled amount
+        :type asset2_pooled_amount: int
+        :return: pool quote for an empty pool
+        :rtype: :class:`BalanceDelta`
+        """
+
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            lps_issued, num_iter = self.stable_swap_engine.get_D(
+                [asset2_pooled_amount, asset2_pooled_amount], self.amplification_factor
+            )
+        else:
+            num_iter = 0
+            if asset1_pooled_amount * asset2_pooled_amount > 2**64 - 1:
+                lps_issued = int((asset1_pooled_amount) ** (0.5)) * int(
+                    (asset2_pooled_amount) ** (0.5)
+                )
+            else:
+                lps_issued = int((asset1_pooled_amount * asset2_pooled_amount) ** (0.5))
+
+        return BalanceDelta(
+            self,
+            -1 * asset1_pooled_amount,
+            -1 * asset2_pooled_amount,
+            lps_issued,
+            num_iter,
+        )
+
+    def get_pool_quote(self, asset_id, asset_amount):
+        """Get full pool quote for a given asset id and amount
+
+        :param asset_id: asset id of the asset to pool
+        :type asset_id: int
+        :param asset_amount: asset amount of the asset to pool
+        :type asset_amount: int
+        :return: pool quote for a non-empty pool
+        :rtype: :class:`BalanceDelta`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        if asset_id == self.asset1.asset_id:
+            asset1_pooled_amount = asset_amount
+            asset2_pooled_amount = int(
+                asset1_pooled_amount * self.asset2_balance // self.asset1_balance
+            )
+        else:
+            asset2_pooled_amount = asset_amount
+            asset1_pooled_amount = int(
+                asset2_pooled_amount * self.asset1_balance // self.asset2_balance
+            )
+
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            D0, num_iter_D0 = self.stable_swap_engine.get_D(
+                [self.asset1_balance, self.asset2_balance], self.amplification_factor
+            )
+            D1, num_iter_D1 = self.stable_swap_engine.get_D(
+                [
+                    self.asset1_balance + asset1_pooled_amount,
+                    self.asset2_balance + asset2_pooled_amount,
+                ],
+                self.amplification_factor,
+            )
+            lps_issued = int(self.lp_circulation * (D1 - D0) // D0)
+            num_iter = num_iter_D0 + num_iter_D1
+        else:
+            lps_issued = int(
+                asset1_pooled_amount * self.lp_circulation // self.asset1_balance
+            )
+            num_iter = 0
+
+        return BalanceDelta(
+            self,
+            -1 * asset1_pooled_amount,
+            -1 * asset2_pooled_amount,
+            lps_issued,
+            num_iter,
+        )
+
+    def get_burn_quote(self, lp_amount):
+        """Get burn quote for a given amount of lps to burn
+
+        :param lp_amount: lp amount to burn
+        :type lp_amount: int
+        :return: burn quote for a given amount of lps to burn
+        :rtype: :class:`BalanceDelta`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        if self.lp_circulation < lp_amount:
+            raise Exception("Error: cannot burn more lp tokens than are in circulation")
+
+        asset1_amount = int(lp_amount * self.asset1_balance // self.lp_circulation)
+        asset2_amount = int(lp_amount * self.asset2_balance // self.lp_circulation)
+
+        return BalanceDelta(self, asset1_amount, asset2_amount, -1 * lp_amount)
+
+    def get_swap_exact_for_quote(self, swap_in_asset_id, swap_in_amount):
+        """Get swap exact for quote for a given asset id and swap amount
+
+        :param swap_in_asset_id: id of incoming asset to swap
+        :type swap_in_asset_id: int
+        :param swap_in_amount: amount of incoming asset to swap
+        :type swap_in_amount: int
+        :return: swap exact for quote for a given asset id and swap amount
+        :rtype: :class:`BalanceDelta`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        swap_in_amount_less_fees = swap_in_amount - int(
+            math.ceil(swap_in_amount * self.swap_fee)
+        )
+
+        if swap_in_asset_id == self.asset1.asset_id:
+            if (self.pool_type == PoolType.NANOSWAP) or (
+                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+            ):
+                D, num_iter_D = self.stable_swap_engine.get_D(
+                    [self.asset1_balance, self.asset2_balance],
+                    self.amplification_factor,
+                )
+                y, num_iter_y = self.stable_swap_engine.get_y(
+                    0,
+                    1,
+                    self.asset1_balance + swap_in_amount_less_fees,
+                    [self.asset1_balance, self.asset2_balance],
+                    D,
+                    self.amplification_factor,
+                )
+                swap_out_amount = self.asset2_balance - y
+                num_iter = num_iter_D + num_iter_y
+            else:
+                swap_out_amount = int(
+                    (self.asset2_balance * swap_in_amount_less_fees)
+                    // (self.asset1_balance + swap_in_amount_less_fees)
+                )
+                num_iter = 0
+            return BalanceDelta(self, -1 * swap_in_amount, swap_out_amount, 0, num_iter)
+        else:
+            if (self.pool_type == PoolType.NANOSWAP) or (
+                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+            ):
+                D, num_iter_D = self.stable_swap_engine.get_D(
+                    [self.asset1_balance, self.asset2_balance],
+                    self.amplification_factor,
+                )
+                y, num_iter_y = self.stable_swap_engine.get_y(
+                    1,
+                    0,
+                    self.asset2_balance + swap_in_amount_less_fees,
+                    [self.asset1_balance, self.asset2_balance],
+                    D,
+                    self.amplification_factor,
+                )
+                swap_out_amount = self.asset1_balance - y
+                num_iter = num_iter_D + num_iter_y
+            else:
+                swap_out_amount = int(
+                    (self.asset1_balance * swap_in_amount_less_fees)
+                    // (self.asset2_balance + swap_in_amount_less_fees)
+                )
+                num_iter = 0
+            return BalanceDelta(self, swap_out_amount, -1 * swap_in_amount, 0, num_iter)
+
+    def get_swap_for_exact_quote(self, swap_out_asset_id, swap_out_amount):
+        """Get swap for exact quote for a given asset id and swap amount
+
+        :param swap_out_asset_id: id of outgoing asset
+        :type swap_out_asset_id: int
+        :param swap_out_amount: amount of outgoing asset
+        :type swap_out_amount: int
+        :return: swap for exact quote for a given outgoing asset id and amount
+        :rtype: :class:`BalanceDelta`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        if swap_out_asset_id == self.asset1.asset_id:
+            if (self.pool_type == PoolType.NANOSWAP) or (
+                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+            ):
+                D, num_iter_D = self.stable_swap_engine.get_D(
+                    [self.asset1_balance, self.asset2_balance],
+                    self.amplification_factor,
+                )
+                y, num_iter_y = self.stable_swap_engine.get_y(
+                    1,
+                    0,
+                    self.asset1_balance - swap_out_amount,
+                    [self.asset1_balance, self.asset2_balance],
+                    D,
+                    self.amplification_factor,
+                )
+                swap_in_amount_less_fees = y - self.asset2_balance
+                num_iter = num_iter_D + num_iter_y
+            else:
+                swap_in_amount_less_fees = (
+                    int(
+                        (self.asset2_balance * swap_out_amount)
+                        // (self.asset1_balance - swap_out_amount)
+                    )
+                    - 1
+                )
+                num_iter = 0
+        else:
+            if (self.pool_type == PoolType.NANOSWAP) or (
+                self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+            ):
+                D, num_iter_D = self.stable_swap_engine.get_D(
+                    [self.asset1_balance, self.asset2_balance],
+                    self.amplification_factor,
+                )
+                y, num_iter_y = self.stable_swap_engine.get_y(
+                    0,
+                    1,
+                    self.asset2_balance - swap_out_amount,
+                    [self.asset1_balance, self.asset2_balance],
+                    D,
+                    self.amplification_factor,
+                )
+                swap_in_amount_less_fees = y - self.asset1_balance
+                num_iter = num_iter_D + num_iter_y
+            else:
+                swap_in_amount_less_fees = (
+                    int(
+                        (self.asset1_balance * swap_out_amount)
+                        // (self.asset2_balance - swap_out_amount)
+                    )
+                    - 1
+                )
+                num_iter = 0
+
+        swap_in_amount = math.ceil(swap_in_amount_less_fees // (1 - self.swap_fee))
+
+        if swap_out_asset_id == self.asset1.asset_id:
+            return BalanceDelta(self, swap_out_amount, -1 * swap_in_amount, 0, num_iter)
+        else:
+            return BalanceDelta(self, -1 * swap_in_amount, swap_out_amount, 0, num_iter)
+
+    def get_swap_exact_for_quotes(
+        self,
+        swap_in_asset_id,
+        swap_in_amounts,
+        asset1_balances=None,
+        asset2_balances=None,
+    ):
+        """Get swap exact for quotes for many swap amounts at once. Quotes match
+        :meth:`get_swap_exact_for_quote` exactly. Constant product quotes are vectorized
+        and nanoswap quotes solve D once per pool state.
+
+        :param swap_in_asset_id: id of incoming asset to swap
+        :type swap_in_asset_id: int
+        :param swap_in_amounts: amounts of incoming asset to swap
+        :type swap_in_amounts: array-like
+        :param asset1_balances: asset 1 pool balances to quote against, defaults to the current balance
+        :type asset1_balances: array-like, optional
+        :param asset2_balances: asset 2 pool balances to quote against, defaults to the current balance
+        :type asset2_balances: array-like, optional
+        :return: swap exact for quotes, one entry per amount
+        :rtype: :class:`BatchQuote`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        asset1_balances = (
+            self.asset1_balance if asset1_balances is None else asset1_balances
+        )
+        asset2_balances = (
+            self.asset2_balance if asset2_balances is None else asset2_balances
+        )
+
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            return get_stable_swap_quotes(
+                self.stable_swap_engine,
+                self.amplification_factor,
+                self.swap_fee,
+                swap_in_asset_id == self.asset1.asset_id,
+                True,
+                swap_in_amounts,
+                asset1_balances,
+                asset2_balances,
+            )
+
+        swap_in_is_asset1 = swap_in_asset_id == self.asset1.asset_id
+        if swap_in_is_asset1:
+            swap_in_balances, swap_out_balances = asset1_balances, asset2_balances
+        else:
+            swap_in_balances, swap_out_balances = asset2_balances, asset1_balances
+
+        return build_swap_batch_quote(
+            swap_in_is_asset1,
+            *get_swap_exact_for_quotes(
+                self.swap_fee, swap_in_amounts, swap_in_balances, swap_out_balances
+            )
+        )
+
+    def get_swap_for_exact_quotes(
+        self,
+        swap_out_asset_id,
+        swap_out_amounts,
+        asset1_balances=None,
+        asset2_balances=None,
+    ):
+        """Get swap for exact quotes for many swap amounts at once. Quotes match
+        :meth:`get_swap_for_exact_quote` exactly. Constant product quotes are vectorized
+        and nanoswap quotes solve D once per pool state.
+
+        :param swap_out_asset_id: id of outgoing asset
+        :type swap_out_asset_id: int
+        :param swap_out_amounts: amounts of outgoing asset
+        :type swap_out_amounts: array-like
+        :param asset1_balances: asset 1 pool balances to quote against, defaults to the current balance
+        :type asset1_balances: array-like, optional
+        :param asset2_balances: asset 2 pool balances to quote against, defaults to the current balance
+        :type asset2_balances: array-like, optional
+        :return: swap for exact quotes, one entry per amount
+        :rtype: :class:`BatchQuote`
+        """
+
+        if self.lp_circulation == 0:
+            raise Exception("Error: pool is empty")
+
+        asset1_balances = (
+            self.asset1_balance if asset1_balances is None else asset1_balances
+        )
+        asset2_balances = (
+            self.asset2_balance if asset2_balances is None else asset2_balances
+        )
+
+        if (self.pool_type == PoolType.NANOSWAP) or (
+            self.pool_type == PoolType.NANOSWAP_LENDING_POOL
+        ):
+            return get_stable_swap_quotes(
+                self.stable_swap_engine,
+                self.amplification_factor,
+                self.swap_fee,
+                swap_out_asset_id != self.asset1.asset_id,
+                False,
+                swap_out_amounts,
+                asset1_balances,
+                asset2_balances,
+            )
+
+        swap_in_is_asset1 = swap_out_asset_id != self.asset1.asset_id
+        if swap_in_is_asset1:
+            swap_in_balances, swap_out_balances = asset1_balances, asset2_balances
+        else:
+            swap_in_balances, swap_out_balances = asset2_balances, asset1_balances
+
+        return build_swap_batch_quote(
+            swap_in_is_asset1,
+            *get_swap_for_exact_quotes(
+                self.swap_fee, swap_out_amounts, swap_in_balances, swap_out_balances
+            )
+        )
@@ -0,0 +1,290 @@
+# IMPORTS
+
+# external
+from base64 import b64decode
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+from .amm_config import POOL_STRINGS
+from .depth_table import is_stable_swap
+
+# INTERFACE
+
+# constants
+DEFAULT_RECONCILE_INTERVAL = 1000
+DEFAULT_MAX_WORKERS = 10
+SEARCH_PAGE_LIMIT = 1000
+# global state delta actions
+DELTA_SET_UINT = 2
+DELTA_DELETE = 3
+# global state key -> :class:`Pool` attribute updated from state deltas
+TRACKED_FIELDS = {
+    POOL_STRINGS.balance_1: "asset1_balance",
+    POOL_STRINGS.balance_2: "asset2_balance",
+    POOL_STRINGS.lp_circulation: "lp_circulation",
+    POOL_STRINGS.asset1_reserve: "asset1_reserve",
+    POOL_STRINGS.asset2_reserve: "asset2_reserve",
+    POOL_STRINGS.latest_time: "latest_time",
+    POOL_STRINGS.cumsum_time_weighted_asset1_to_asset2_price: "cumsum_time_weighted_asset1_to_asset2_price",
+    POOL_STRINGS.cumsum_time_weighted_asset2_to_asset1_price: "cumsum_time_weighted_asset2_to_asset1_price",
+    POOL_STRINGS.cumsum_volume_asset1: "cumsum_volume_asset1",
+    POOL_STRINGS.cumsum_volume_asset2: "cumsum_volume_asset2",
+    POOL_STRINGS.cumsum_volume_weighted_asset1_to_asset2_price: "cumsum_volume_weighted_asset1_to_asset2_price",
+    POOL_STRINGS.cumsum_volume_weighted_asset2_to_asset1_price: "cumsum_volume_weighted_asset2_to_asset1_price",
+    POOL_STRINGS.cumsum_fees_asset1: "cumsum_fees_asset1",
+    POOL_STRINGS.cumsum_fees_asset2: "cumsum_fees_asset2",
+    POOL_STRINGS.initial_amplification_factor: "initial_amplification_factor",
+    POOL_STRINGS.future_amplification_factor: "future_amplification_factor",
+    POOL_STRINGS.initial_amplification_factor_time: "initial_amplification_factor_time",
+    POOL_STRINGS.future_amplification_factor_time: "future_amplification_factor_time",
+}
+
+
+class PoolTracker:
+    def __init__(
+        self,
+        amm_client,
+        pools=None,
+        reconcile_interval=DEFAULT_RECONCILE_INTERVAL,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Follows the state of many pools from their confirmed app calls instead of reloading
+        their global state. Swaps, pools, burns and flash loans all write the pool balances, LP
+        circulation and cumulative fields to the global state of the pool, so the global state
+        deltas of the pool app calls, including inner app calls made by other apps, are applied to
+        the tracked pools in place. Full state is reconciled every reconcile_interval rounds.
+
+        :param amm_client: a :class:`AMMClient` object for interacting with the AMM
+        :type amm_client: :class:`AMMClient`
+        :param pools: pools to track, defaults to every registered pool
+        :type pools: list, optional
+        :param reconcile_interval: rounds between full reloads of the tracked pools
+        :type reconcile_interval: int, optional
+        :param max_workers: number of pools whose app calls are searched in parallel
+        :type max_workers: int, optional
+        """
+
+        self.amm_client = amm_client
+        self.indexer = self.amm_client.indexer
+        self.reconcile_interval = reconcile_interval
+        self.max_workers = max_workers
+
+        # app id -> tracked :class:`Pool`
+        self.pools = {}
+        for pool in amm_client.pool_registry if pools is None else pools:
+            self.add_pool(pool)
+        # last round applied to the tracked pools, None until :meth:`reconcile`
+        self.round = None
+        self.reconciled_round = None
+
+    def add_pool(self, pool):
+        """Tracks a pool. Its state is applied from the next polled round, so it should be loaded
+        at or after the last round of the tracker.
+
+        :param pool: pool to track
+        :type pool: :class:`Pool`
+        """
+
+        self.pools[pool.application_id] = pool
+
+    def get_indexer_round(self):
+        """Returns the last round available on the indexer
+
+        :return: round
+        :rtype: int
+        """
+
+        return self.indexer.health()["round"]
+
+    def get_round_time(self, round_num):
+        """Returns the timestamp of a round
+
+        :param round_num: round
+        :type round_num: int
+        :return: unix timestamp of the round
+        :rtype: int
+        """
+
+        return self.indexer.block_info(block=round_num, header_only=True)["timestamp"]
+
+    def reconcile(self):
+        """Reloads the full state of every tracked pool. The indexer round is read before the
+        pools are reloaded, so deltas polled afterwards at most rewrite values the reload already
+        has and the tracked state stays consistent.
+        """
+
+        round_num = self.get_indexer_round()
+        self.amm_client.pool_registry.refresh(pools=list(self.pools.values()))
+        self.round = round_num
+        self.reconciled_round = round_num
+
+    def apply_global_state_delta(self, pool, global_state_delta):
+        """Applies the global state delta of an app call to a pool
+
+        :param pool: pool called
+        :type pool: :class:`Pool`
+        :param global_state_delta: indexer global state delta of the app call
+        :type global_state_delta: list
+        :return: True if any tracked field changed
+        :rtype: bool
+        """
+
+        updated = False
+        for item in global_state_delta:
+            attribute = TRACKED_FIELDS.get(b64decode(item["key"]).decode("utf-8"))
+            if attribute is None:
+                continue
+            value = item["value"]
+            if value["action"] == DELTA_SET_UINT:
+                setattr(pool, attribute, value.get("uint", 0))
+                updated = True
+            elif value["action"] == DELTA_DELETE:
+                setattr(pool, attribute, 0)
+                updated = True
+        return updated
+
+    def apply_transaction(self, transaction, round_time=None):
+        """Applies a confirmed transaction and its inner transactions to the tracked pools
+
+        :param transaction: indexer transaction
+        :type transaction: dict
+        :param round_time: timestamp of the round of the transaction, defaults to its round-time
+        :type round_time: int, optional
+        :return: set of updated pools
+        :rtype: set
+        """
+
+        if round_time is None:
+            round_time = transaction.get("round-time", None)
+
+        updated_pools = set()
+        app_id = transaction.get("application-transaction", {}).get("application-id", 0)
+        pool = self.pools.get(app_id, None)
+        if (pool is not None) and self.apply_global_state_delta(
+            pool, transaction.get("global-state-delta", [])
+        ):
+            # the amplification factor ramps with the block timestamp
+            if (round_time is not None) and is_stable_swap(pool):
+                pool.t = round_time
+            updated_pools.add(pool)
+
+        for inner_transaction in transaction.get("inner-txns", []):
+            updated_pools |= self.apply_transaction(
+                inner_transaction, round_time=round_time
+            )
+        return updated_pools
+
+    def apply_transactions(self, transactions):
+        """Applies confirmed transactions in the order they were confirmed
+
+        :param transactions: indexer transactions
+        :type transactions: list
+        :return: set of updated pools
+        :rtype: set
+        """
+
+        updated_pools = set()
+        for transaction in transactions:
+            updated_pools |= self.apply_transaction(transaction)
+        return updated_pools
+
+    def get_app_transactions(self, app_id, min_round, max_round):
+        """Returns the confirmed transactions calling an app between two rounds. Transactions
+        calling the app from an inner app call are returned whole, with the app call nested.
+
+        :param app_id: app id
+        :type app_id: int
+        :param min_round: first round
+        :type min_round: int
+        :param max_round: last round
+        :type max_round: int
+        :return: indexer transactions
+        :rtype: list
+        """
+
+        transactions = []
+        next_page = None
+        while True:
+            response = self.indexer.search_transactions(
+                application_id=app_id,
+                min_round=min_round,
+                max_round=max_round,
+                limit=SEARCH_PAGE_LIMIT,
+                next_page=next_page,
+            )
+            transactions.extend(response.get("transactions", []))
+            next_page = response.get("next-token", None)
+            if not response.get("transactions", []) or next_page is None:
+                break
+        return transactions
+
+    def get_transactions(self, min_round, max_round):
+        """Returns the confirmed transactions calling any tracked pool between two rounds, inner
+        app calls are nested in the transactions that made them. The app calls of each tracked
+        pool are searched by app id in parallel, and transactions calling several tracked pools
+        are returned once.
+
+        :param min_round: first round
+        :type min_round: int
+        :param max_round: last round
+        :type max_round: int
+        :return: indexer transactions in confirmation order
+        :rtype: list
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            responses = list(
+                executor.map(
+                    lambda app_id: self.get_app_transactions(
+                        app_id, min_round, max_round
+                    ),
+                    list(self.pools),
+                )
+            )
+
+        # (round, offset in round) -> transaction
+        transactions = {}
+        for response in responses:
+            for transaction in response:
+                key = (
+                    transaction["confirmed-round"],
+                    transaction["intra-round-offset"],
+                )
+                transactions[key] = transaction
+        return [transactions[key] for key in sorted(transactions)]
+
+    def poll(self):
+        """Applies the app calls confirmed since the last polled round, reconciling first if the
+        tracker was never reconciled or the reconcile interval has elapsed. Tracked stableswap
+        pools are moved to the timestamp of the last polled round, since their amplification
+        factor ramps with it whether or not they were called.
+
+        :return: set of updated pools, including stableswap pools whose amplification factor
+            moved, every tracked pool after a reconcile
+        :rtype: set
+        """
+
+        max_round = self.get_indexer_round()
+        if (self.round is None) or (
+            max_round - self.reconciled_round >= self.reconcile_interval
+        ):
+            self.reconcile()
+            return set(self.pools.values())
+
+        if max_round <= self.round:
+            return set()
+        updated_pools = self.apply_transactions(
+            self.get_transactions(self.round + 1, max_round)
+        )
+        stable_swap_pools = [
+            pool for pool in self.pools.values() if is_stable_swap(pool)
+        ]
+        if stable_swap_pools:
+            round_time = self.get_round_time(max_round)
+            for pool in stable_swap_pools:
+                amplification_factor = pool.amplification_factor
+                pool.t = round_time
+                if pool.amplification_factor != amplification_factor:
+                    updated_pools.add(pool)
+        self.round = max_round
+        return updated_pools
@@ -0,0 +1,176 @@
+# IMPORTS
+
+# external
+import threading
+import time
+
+# local
+from .amm_config import AMMEndpoints
+
+# INTERFACE
+
+# constants
+DEFAULT_PRICE_TTL = 60
+
+
+class PriceFeed:
+    def __init__(self, amm_client, ttl=DEFAULT_PRICE_TTL):
+        """Shared dollar price cache for assets and AMM LP tokens. Both price endpoints are
+        fetched at most once per ttl and served from memory in between.
+
+        :param amm_client: a :class:`AMMClient` object for interacting with the AMM
+        :type amm_client: :class:`AMMClient`
+        :param ttl: seconds for which fetched prices are considered fresh
+        :type ttl: float, optional
+        """
+
+        self.amm_client = amm_client
+        self.ttl = ttl
+
+        # asset id -> dollar price
+        self.prices = {}
+        self.last_updated = None
+
+        self._lock = threading.Lock()
+        self._stop_event = None
+        self._thread = None
+
+    @property
+    def age(self):
+        """Seconds since the prices were last fetched
+
+        :return: age of the prices in seconds, None if never fetched
+        :rtype: float
+        """
+
+        if self.last_updated is None:
+            return None
+        return time.monotonic() - self.last_updated
+
+    def is_stale(self):
+        """Checks if the prices are older than the ttl
+
+        :return: True if the prices are stale or were never fetched, False otherwise
+        :rtype: bool
+        """
+
+        age = self.age
+        return age is None or age > self.ttl
+
+    def refresh(self):
+        """Fetches the asset and LP token prices"""
+
+        transport = self.amm_client.algofi_client.transport
+        try:
+            prices = dict(
+                [
+                    (x["asset_id"], x["price"])
+                    for x in (
+                        transport.get_json(AMMEndpoints.ASSETS)
+                        + transport.get_json(AMMEndpoints.AMM_LP_TOKENS)
+                    )
+                ]
+            )
+        except:
+            raise Exception(
+                "Failed to query price from endpoints "
+                + AMMEndpoints.ASSETS
+                + " and "
+                + AMMEndpoints.AMM_LP_TOKENS
+            )
+        self.prices = prices
+        self.last_updated = time.monotonic()
+
+    def _refresh_if_stale(self):
+        if self.is_stale():
+            with self._lock:
+                # another thread may have refreshed while waiting on the lock
+                if self.is_stale():
+                    self.refresh()
+
+    def get_price(self, asset_id):
+        """Returns the dollar price of an asset
+
+        :param asset_id: asset id
+        :type asset_id: int
+        :return: dollar price of the asset
+        :rtype: float
+        """
+
+        self._refresh_if_stale()
+        if asset_id not in self.prices:
+            raise Exception("No price available for asset " + str(asset_id))
+        return self.prices[asset_id]
+
+    def get_prices(self, asset_ids):
+        """Returns the dollar prices of many assets
+
+        :param asset_ids: asset ids
+        :type asset_ids: list
+        :return: dict of asset id -> dollar price, for the assets with a price
+        :rtype: dict
+        """
+
+        self._refresh_if_stale()
+        prices = self.prices
+        return dict(
+            [
+                (asset_id, prices[asset_id])
+                for asset_id in asset_ids
+                if asset_id in prices
+            ]
+        )
+
+    def get_usd_values(self, amounts):
+        """Returns the dollar values of many asset amounts
+
+        :param amounts: dict of asset id -> amount in base units
+        :type amounts: dict
+        :return: dict of asset id -> decimal dollar value
+        :rtype: dict
+        """
+
+        usd_values = {}
+        for asset_id, amount in amounts.items():
+            asset = self.amm_client.get_asset(asset_id)
+            usd_values[asset_id] = asset.get_decimal_amount(amount) * self.get_price(
+                asset_id
+            )
+        return usd_values
+
+    def start(self, interval=None):
+        """Starts refreshing the prices on a background thread
+
+        :param interval: seconds between refreshes, defaults to the ttl
+        :type interval: float, optional
+        """
+
+        if self._thread is not None:
+            return
+        interval = interval if interval is not None else self.ttl
+        self._stop_event = threading.Event()
+
+        def run(stop_event):
+            while not stop_event.is_set():
+                try:
+                    with self._lock:
+                        self.refresh()
+                except Exception:
+                    # keep serving the last prices, is_stale reports the failure
+                    pass
+                stop_event.wait(interval)
+
+        self._thread = threading.Thread(
+            target=run, args=(self._stop_event,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background refresh thread"""
+
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
@@ -0,0 +1,190 @@
+# IMPORTS
+
+# external
+import bisect
+import threading
+from collections import OrderedDict
+
+# local
+from .stable_swap_math import get_D, get_y
+
+# INTERFACE
+
+# constants
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_MAX_WARM_START_SOLUTIONS = 64
+
+
+class StableSwapEngine:
+    def __init__(
+        self,
+        cache_size=DEFAULT_CACHE_SIZE,
+        max_warm_start_solutions=DEFAULT_MAX_WARM_START_SOLUTIONS,
+    ):
+        """Memoizing stableswap solver shared by nanoswap pools. D is solved once per
+        (balances, amplification factor) and y once per swap, so repeated quotes against the
+        same pool state skip the Newton iterations. Iteration counts are those of the
+        on-chain solve and can be used for fee estimation.
+
+        :param cache_size: maximum number of memoized D and y solutions each
+        :type cache_size: int, optional
+        :param max_warm_start_solutions: maximum number of warm started solutions kept per pool
+            state as starting points of later warm started solves
+        :type max_warm_start_solutions: int, optional
+        """
+
+        self.cache_size = cache_size
+        self.max_warm_start_solutions = max_warm_start_solutions
+        self._D_cache = OrderedDict()
+        self._y_cache = OrderedDict()
+        # (i, j, token_amounts, D, amplification_factor) -> sorted list of warm started (x, y)
+        self._y_solutions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_cached(self, cache, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _set_cached(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def clear(self):
+        """Drops all memoized solutions"""
+
+        with self._lock:
+            self._D_cache.clear()
+            self._y_cache.clear()
+            self._y_solutions.clear()
+
+    def get_D(self, token_amounts, amplification_factor):
+        """Memoized :func:`stable_swap_math.get_D`
+
+        :param token_amounts: list of token amounts in pool
+        :type token_amounts: list of ints
+        :param amplification_factor: quantity of sensitivity to price change
+        :type amplification_factor: int
+        :return: D quantity and number of iterations
+        :rtype: (int, int)
+        """
+
+        key = (tuple(token_amounts), amplification_factor)
+        value = self._get_cached(self._D_cache, key)
+        if value is None:
+            value = get_D(list(token_amounts), amplification_factor)
+            self._set_cached(self._D_cache, key, value)
+        return value
+
+    def get_y(self, i, j, x, token_amounts, D, amplification_factor, warm_start=False):
+        """Memoized :func:`stable_swap_math.get_y`. With warm_start, unsolved swaps start
+        from the solution of the nearest previously warm started x on the same pool state,
+        which takes fewer iterations but may differ from the on-chain solve by 1. The
+        iteration count is that of the warm started solve, so it differs from the cold solve
+        and from the on-chain count used for fee estimation.
+
+        :param i: index of the token with the new amount
+        :type i: int
+        :param j: index of the token to solve for
+        :type j: int
+        :param x: new amount of token i
+        :type x: int
+        :param token_amounts: list of token amounts in pool
+        :type token_amounts: list of ints
+        :param D: D quantity of the pool
+        :type D: int
+        :param amplification_factor: quantity of sensitivity to price change
+        :type amplification_factor: int
+        :param warm_start: start from the nearest previous solution
+        :type warm_start: bool, optional
+        :return: y quantity and number of iterations
+        :rtype: (int, int)
+        """
+
+        state_key = (i, j, tuple(token_amounts), D, amplification_factor)
+        key = state_key + (x, warm_start)
+        value = self._get_cached(self._y_cache, key)
+        if value is not None:
+            return value
+
+        if not warm_start:
+            value = get_y(i, j, x, list(token_amounts), D, amplification_factor)
+            self._set_cached(self._y_cache, key, value)
+            return value
+
+        y_initial = None
+        solutions = self._get_cached(self._y_solutions, state_key)
+        if solutions:
+            with self._lock:
+                idx = bisect.bisect_left(solutions, (x,))
+                neighbours = solutions[max(idx - 1, 0) : idx + 1]
+            if neighbours:
+                y_initial = min(neighbours, key=lambda s: abs(s[0] - x))[1]
+
+        value = get_y(
+            i,
+            j,
+            x,
+            list(token_amounts),
+            D,
+            amplification_factor,
+            y_initial=y_initial,
+        )
+        self._set_cached(self._y_cache, key, value)
+
+        if solutions is None:
+            solutions = []
+            self._set_cached(self._y_solutions, state_key, solutions)
+        with self._lock:
+            idx = bisect.bisect_left(solutions, (x,))
+            if (idx == len(solutions)) or (solutions[idx][0] != x):
+                solutions.insert(idx, (x, value[0]))
+                # drop a neighbour of the new solution, keeping the spread of starting points
+                if len(solutions) > self.max_warm_start_solutions:
+                    del solutions[idx + 1 if idx + 1 < len(solutions) else idx - 1]
+        return value
+
+    def get_y_batch(
+        self, i, j, xs, token_amounts, amplification_factor, warm_start=False
+    ):
+        """Solves y for many new amounts of token i against one pool state. D is solved
+        once for the whole batch.
+
+        :param i: index of the token with the new amounts
+        :type i: int
+        :param j: index of the token to solve for
+        :type j: int
+        :param xs: new amounts of token i
+        :type xs: list of ints
+        :param token_amounts: list of token amounts in pool
+        :type token_amounts: list of ints
+        :param amplification_factor: quantity of sensitivity to price change
+        :type amplification_factor: int
+        :param warm_start: solve in order of x, starting each from the previous solution
+        :type warm_start: bool, optional
+        :return: D, number of D iterations and a list of (y, number of y iterations) per x
+        :rtype: (int, int, list)
+        """
+
+        D, num_iter_D = self.get_D(token_amounts, amplification_factor)
+        order = (
+            sorted(range(len(xs)), key=lambda k: xs[k])
+            if warm_start
+            else range(len(xs))
+        )
+        results = [None] * len(xs)
+        for k in order:
+            results[k] = self.get_y(
+                i,
+                j,
+                int(xs[k]),
+                token_amounts,
+                D,
+                amplification_factor,
+                warm_start=warm_start,
+            )
+        return D, num_iter_D, results
@@ -1,6 +1,7 @@
 # IMPORTS
 
 # external
+import math
 from typing import List, Tuple
 
 # local
@@ -11,6 +12,22 @@ A_PRECISION = 1000000
 
 def get_D(token_amounts: List[int], amplification_factor: int) -> Tuple[int, int]:
     """Calculate the D quantity in the stableswap invariant given a list of token amounts and an amplication factor.
+    Two asset pools are dispatched to :func:`get_D_2`.
+
+    :param token_amounts: list of token amounts in pool
+    :type token_amounts: list of ints
+    :param amplication_factor: quantity of sensitivity to price change
+    :type amplication_factor: int
+    :return: D quantity
+    :rtype: (int, int)
+    """
+    if len(token_amounts) == 2:
+        return get_D_2(token_amounts[0], token_amounts[1], amplification_factor)
+    return get_D_n(token_amounts, amplification_factor)
+
+
+def get_D_n(token_amounts: List[int], amplification_factor: int) -> Tuple[int, int]:
+    """Calculate the D quantity in the stableswap invariant for any number of assets.
 
     :param token_amounts: list of token amounts in pool
     :type token_amounts: list of ints
@@ -50,9 +67,40 @@ def get_D(token_amounts: List[int], amplification_factor: int) -> Tuple[int, int
 
 
 def get_y(
-    i: int, j: int, x: int, token_amounts: List[int], D: int, amplification_factor: int
+    i: int,
+    j: int,
+    x: int,
+    token_amounts: List[int],
+    D: int,
+    amplification_factor: int,
+    y_initial: int = None,
+) -> Tuple[int, int]:
+    """Calculate the y quantity in the stableswap invariant. Two asset pools are dispatched to :func:`get_y_2`.
+
+    :param y_initial: starting guess for y, defaults to D as on-chain
+    :type y_initial: int, optional
+    """
+    if len(token_amounts) == 2:
+        assert i != j
+        assert 0 <= i < 2 and 0 <= j < 2
+        return get_y_2(x, D, amplification_factor, y_initial=y_initial)
+    return get_y_n(i, j, x, token_amounts, D, amplification_factor, y_initial=y_initial)
+
+
+def get_y_n(
+    i: int,
+    j: int,
+    x: int,
+    token_amounts: List[int],
+    D: int,
+    amplification_factor: int,
+    y_initial: int = None,
 ) -> Tuple[int, int]:
-    """Calculate the y quantity in the stableswap invariant."""
+    """Calculate the y quantity in the stableswap invariant for any number of assets.
+
+    :param y_initial: starting guess for y, defaults to D as on-chain
+    :type y_initial: int, optional
+    """
     assert i != j
     assert j >= 0
     N_COINS = len(token_amounts)
@@ -78,7 +126,7 @@ def get_y(
         c = c * D // (_x * N_COINS)
     c = c * D * A_PRECISION // (Ann * N_COINS)
     b = S + D * A_PRECISION // Ann
-    y = D
+    y = D if y_initial is None else y_initial
     for _i in range(255):
         y_prev = y
         y = (y * y + c) // (2 * y + b - D)
@@ -89,3 +137,135 @@ def get_y(
             if y_prev - y <= 1:
                 return int(y), _i
     raise
+
+
+def get_D_2(
+    x0: int, x1: int, amplification_factor: int, D_initial: int = None
+) -> Tuple[int, int]:
+    """Calculate the D quantity in the stableswap invariant of a two asset pool. Performs the same integer
+    operations as :func:`get_D`, so the result and iteration count are identical when starting from the
+    on-chain guess.
+
+    :param x0: amount of first token in pool
+    :type x0: int
+    :param x1: amount of second token in pool
+    :type x1: int
+    :param amplication_factor: quantity of sensitivity to price change
+    :type amplication_factor: int
+    :param D_initial: starting guess for D, defaults to the sum of the token amounts as on-chain
+    :type D_initial: int, optional
+    :return: D quantity
+    :rtype: (int, int)
+    """
+    S = x0 + x1
+    if S == 0:
+        return 0
+
+    Ann = amplification_factor * 4
+    Ann_S = Ann * S // A_PRECISION
+    Ann_less_one = Ann - A_PRECISION
+    x0_times_n = x0 * 2
+    x1_times_n = x1 * 2
+
+    D = S if D_initial is None else D_initial
+    for _i in range(255):
+        D_P = D * D // x0_times_n * D // x1_times_n
+        Dprev = D
+        D = (Ann_S + D_P * 2) * D // (Ann_less_one * D // A_PRECISION + 3 * D_P)
+        if D > Dprev:
+            if D - Dprev <= 1:
+                return D, _i
+        else:
+            if Dprev - D <= 1:
+                return D, _i
+    raise
+
+
+def get_y_2(
+    x: int, D: int, amplification_factor: int, y_initial: int = None
+) -> Tuple[int, int]:
+    """Calculate the y quantity in the stableswap invariant of a two asset pool given the new amount of
+    the other asset. Performs the same integer operations as :func:`get_y`, so the result and iteration
+    count are identical when starting from the on-chain guess.
+
+    :param x: new amount of the other token in pool
+    :type x: int
+    :param D: D quantity of the pool
+    :type D: int
+    :param amplication_factor: quantity of sensitivity to price change
+    :type amplication_factor: int
+    :param y_initial: starting guess for y, defaults to D as on-chain
+    :type y_initial: int, optional
+    :return: y quantity
+    :rtype: (int, int)
+    """
+    Ann = amplification_factor * 4
+    c = D * D // (x * 2)
+    c = c * D * A_PRECISION // (Ann * 2)
+    b_less_D = x + D * A_PRECISION // Ann - D
+
+    y = D if y_initial is None else y_initial
+    for _i in range(255):
+        y_prev = y
+        y = (y * y + c) // (2 * y + b_less_D)
+        if y > y_prev:
+            if y - y_prev <= 1:
+                return y, _i
+        else:
+            if y_prev - y <= 1:
+                return y, _i
+    raise
+
+
+def get_D_initial_2(x0: int, x1: int, amplification_factor: int) -> int:
+    """Estimate D of a two asset pool by solving the invariant, a cubic in D, in floating point.
+    Starting :func:`get_D_2` from this estimate usually converges in one or two iterations instead of
+    several, but the iteration count then no longer matches the on-chain computation.
+
+    :param x0: amount of first token in pool
+    :type x0: int
+    :param x1: amount of second token in pool
+    :type x1: int
+    :param amplication_factor: quantity of sensitivity to price change
+    :type amplication_factor: int
+    :return: estimate of D
+    :rtype: int
+    """
+    S = x0 + x1
+    A = amplification_factor / A_PRECISION
+    # D^3 + p * D + q = 0, which has a single real root when p > 0
+    P = 4.0 * x0 * x1
+    p = P * (4 * A - 1)
+    q = -P * 4 * A * S
+    if p <= 0 or S == 0:
+        return S
+    D = (
+        2
+        * math.sqrt(p / 3)
+        * math.sinh(math.asinh(-q / 2 * math.sqrt(27 / p**3)) / 3)
+    )
+    if not math.isfinite(D) or D <= 0:
+        return S
+    return int(D)
+
+
+def get_y_initial_2(x: int, D: int, amplification_factor: int) -> int:
+    """Solve for y in a two asset pool directly. With two assets the invariant is a quadratic in y, so its
+    integer root is found with :func:`math.isqrt` and :func:`get_y_2` started from it converges immediately,
+    but the iteration count then no longer matches the on-chain computation.
+
+    :param x: new amount of the other token in pool
+    :type x: int
+    :param D: D quantity of the pool
+    :type D: int
+    :param amplication_factor: quantity of sensitivity to price change
+    :type amplication_factor: int
+    :return: estimate of y
+    :rtype: int
+    """
+    Ann = amplification_factor * 4
+    c = D * D // (x * 2)
+    c = c * D * A_PRECISION // (Ann * 2)
+    b_less_D = x + D * A_PRECISION // Ann - D
+    # positive root of y^2 + b_less_D * y - c = 0
+    return max((math.isqrt(b_less_D * b_less_D + 4 * c) - b_less_D) // 2, 1)
@@ -0,0 +1,129 @@
+# IMPORTS
+
+# external
+import math
+
+# local
+from .stable_swap_math import A_PRECISION
+
+# INTERFACE
+
+# constants
+MAX_BRACKET_DOUBLINGS = 64
+
+
+def get_stable_swap_price(swap_in_balance, swap_out_balance, D, amplification_factor):
+    """Marginal output per unit of input of a two asset stableswap pool, excluding fees. Derived by
+    implicit differentiation of the invariant Ann * (x + y) + D = Ann * D + D^3 / (4 * x * y).
+
+    :param swap_in_balance: pool balance of the incoming asset
+    :type swap_in_balance: int
+    :param swap_out_balance: pool balance of the outgoing asset
+    :type swap_out_balance: int
+    :param D: D quantity of the pool
+    :type D: int
+    :param amplification_factor: quantity of sensitivity to price change
+    :type amplification_factor: int
+    :return: marginal swap rate
+    :rtype: float
+    """
+
+    Ann = amplification_factor * 4 / A_PRECISION
+    D_cubed_over_4 = float(D) ** 3 / 4
+    x = float(swap_in_balance)
+    y = float(swap_out_balance)
+    return (Ann + D_cubed_over_4 / (x * x * y)) / (Ann + D_cubed_over_4 / (x * y * y))
+
+
+def get_constant_product_max_swap_in_amount(
+    swap_in_balance, swap_out_balance, swap_fee, min_output_ratio
+):
+    """Largest input of a constant product swap whose output per unit of input is at least
+    min_output_ratio, ignoring integer rounding. Solves
+    swap_out_balance * (1 - fee) / (swap_in_balance + x * (1 - fee)) = min_output_ratio for x.
+    Rounding only lowers the output, so the exact bound is at most this value.
+
+    :param swap_in_balance: pool balance of the incoming asset
+    :type swap_in_balance: int
+    :param swap_out_balance: pool balance of the outgoing asset
+    :type swap_out_balance: int
+    :param swap_fee: swap fee of the pool (e.g. 0.0025)
+    :type swap_fee: float
+    :param min_output_ratio: minimum output per unit of input
+    :type min_output_ratio: float
+    :return: bound on the swap in amount, 0 if no swap reaches the ratio
+    :rtype: float
+    """
+
+    fee_factor = 1 - swap_fee
+    return max(
+        (swap_out_balance * fee_factor / min_output_ratio - swap_in_balance)
+        / fee_factor,
+        0,
+    )
+
+
+def solve_max_swap_in_amount(
+    get_swap_out_amount,
+    min_output_ratio,
+    upper_bound,
+    guess=None,
+    get_marginal_output=None,
+):
+    """Finds the largest integer input x with get_swap_out_amount(x) >= min_output_ratio * x. Swap
+    output is concave in the input, so the inputs meeting the ratio form an interval starting at 0
+    that is bracketed and narrowed with Newton steps, falling back to bisection. Once Newton steps
+    stall at the integer resolution of the quotes, the bound is found by galloping inwards from the
+    bracket. The returned input meets the ratio and the next one does not; if rounding of the
+    quotes makes the edge of the interval ragged, it is the largest input up to that rounding.
+
+    :param get_swap_out_amount: exact swap output for an input amount
+    :type get_swap_out_amount: function
+    :param min_output_ratio: minimum output per unit of input
+    :type min_output_ratio: float
+    :param upper_bound: input amount at which to start bracketing, doubled while it meets the ratio
+    :type upper_bound: int
+    :param guess: estimate of the bound
+    :type guess: int, optional
+    :param get_marginal_output: derivative of the swap output at an input amount, enables Newton steps
+    :type get_marginal_output: function, optional
+    :return: largest input meeting the ratio
+    :rtype: int
+    """
+
+    def get_excess(swap_in_amount):
+        return get_swap_out_amount(swap_in_amount) - min_output_ratio * swap_in_amount
+
+    lo = 0
+    hi = max(int(upper_bound), 1)
+    for _ in range(MAX_BRACKET_DOUBLINGS):
+        if get_excess(hi) < 0:
+            break
+        lo, hi = hi, hi * 2
+    else:
+        raise Exception("Error: swap size is unbounded for the given ratio")
+
+    x = None if guess is None else int(guess)
+    step = 1
+    while hi - lo > 1:
+        if x is None or not (lo < x < hi):
+            x = (lo + hi) // 2
+        excess = get_excess(x)
+        if excess >= 0:
+            lo = x
+        else:
+            hi = x
+
+        x_next = None
+        if get_marginal_output is not None:
+            slope = get_marginal_output(x) - min_output_ratio
+            if slope < 0:
+                x_next = int(math.floor(x - excess / slope))
+        if x_next is not None and abs(x_next - x) > step:
+            x = x_next
+            step = 1
+        else:
+            # probe just inside the bracket on the side of the last quote, widening each time
+            x = hi - step if excess < 0 else lo + step
+            step *= 2
+    return lo
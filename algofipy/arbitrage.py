@@ -0,0 +1,406 @@
+# IMPORTS
+
+# external
+import copy
+import math
+from algosdk.constants import tx_group_limit
+
+# local
+from .amm.v1.amm_config import PARAMETER_SCALE_FACTOR
+from .amm.v1.depth_table import get_state_key
+from .transaction_utils import get_default_params
+
+# INTERFACE
+
+# constants
+DEFAULT_MAX_CYCLE_HOPS = 3
+# flash loan and repayment transactions wrapping a cycle
+FLASH_LOAN_TXN_COUNT = 2
+
+
+def get_venue_state_key(venue):
+    """Returns the state a pool or lending pool interface is quoted from
+
+    :param venue: pool or lending pool interface
+    :type venue: :class:`Pool` or :class:`LendingPoolInterface`
+    :return: tuple of the pool state and, for lending pool interfaces, the market exchange rates
+    :rtype: tuple
+    """
+
+    if hasattr(venue, "market1"):
+        return get_state_key(venue.pool) + (
+            venue.market1.b_asset_circulation,
+            venue.market1.get_underlying_supplied(),
+            venue.market2.b_asset_circulation,
+            venue.market2.get_underlying_supplied(),
+        )
+    return get_state_key(venue)
+
+
+class ArbitrageOpportunity:
+    def __init__(self, route, flash_loan_pool, flash_loan_fee):
+        """A sized cycle of swaps funded by a flash loan of its first asset
+
+        :param route: quoted route from the borrowed asset back to itself
+        :type route: :class:`Route`
+        :param flash_loan_pool: pool lending the borrowed asset
+        :type flash_loan_pool: :class:`Pool`
+        :param flash_loan_fee: fee paid on top of the repaid loan
+        :type flash_loan_fee: int
+        """
+
+        self.route = route
+        self.flash_loan_pool = flash_loan_pool
+        self.flash_loan_fee = flash_loan_fee
+        self.asset_id = route.asset_in_id
+        self.amount = route.amount_in
+        self.profit = route.amount_out - route.amount_in - flash_loan_fee
+
+    @property
+    def return_rate(self):
+        """Returns the profit per unit borrowed
+
+        :return: profit as a ratio of the flash loan amount
+        :rtype: float
+        """
+
+        return self.profit / self.amount
+
+
+class ArbitrageScanner:
+    def __init__(self, algofi_client, max_hops=DEFAULT_MAX_CYCLE_HOPS):
+        """Finds profitable cycles of swaps over the asset graph of the :class:`Router`. Each hop is
+        weighted by the negative log of its spot swap rate net of the swap fee, so a cycle is
+        profitable at small sizes exactly when its weight is negative. Cycles are found by a
+        Bellman-Ford search bounded to max_hops from every asset, keeping the lightest walk of each
+        length back to the asset. When pool states change only the assets within reach of a
+        changed pool are searched again, so the result always equals a search from scratch.
+
+        :param algofi_client: a :class:`AlgofiClient` object for interacting with the protocols
+        :type algofi_client: :class:`AlgofiClient`
+        :param max_hops: maximum number of swaps of a cycle
+        :type max_hops: int, optional
+        """
+
+        self.algofi_client = algofi_client
+        self.max_hops = max_hops
+
+        # graph of the router the weights were computed on
+        self._graph = None
+        # asset id -> list of :class:`RouteHop` entering the asset
+        self._reverse_graph = {}
+        # venue -> list of :class:`RouteHop` through the venue
+        self._venue_hops = {}
+        # venue -> state the weights of its hops were computed from
+        self.state_keys = {}
+        # :class:`RouteHop` -> weight
+        self.weights = {}
+        # asset id -> list of cycles starting and ending at the asset, each a tuple of hops
+        self.cycles = {}
+        # cycle -> :class:`ArbitrageOpportunity`, None if the cycle loses after rounding and fees
+        self._opportunities = {}
+
+    def get_hop_weight(self, hop):
+        """Returns the weight of a hop, the negative log of its spot swap rate net of the swap fee
+
+        :param hop: hop to weigh
+        :type hop: :class:`RouteHop`
+        :return: weight, infinite if the venue cannot be quoted
+        :rtype: float
+        """
+
+        pool = hop.venue.pool if hop.is_interface else hop.venue
+        try:
+            rate = hop.venue.get_spot_swap_rate(hop.asset_in_id) * (1 - pool.swap_fee)
+        except Exception:
+            # empty pools
+            return math.inf
+        if rate <= 0:
+            return math.inf
+        return -math.log(rate)
+
+    def _search(self, asset_id):
+        # lightest walk of each length from the asset back to it, as in Bellman-Ford
+        graph, weights = self._graph, self.weights
+        cycles = []
+        layers = [{asset_id: (0.0, None)}]
+        for _ in range(self.max_hops):
+            layer = {}
+            for asset_in_id, (weight, _) in layers[-1].items():
+                for hop in graph.get(asset_in_id, []):
+                    hop_weight = weight + weights[hop]
+                    if hop.asset_out_id == asset_id:
+                        if hop_weight < 0:
+                            cycle = self._get_walk(layers, hop)
+                            if cycle is not None:
+                                cycles.append(cycle)
+                    elif hop_weight < layer.get(hop.asset_out_id, (math.inf,))[0]:
+                        layer[hop.asset_out_id] = (hop_weight, hop)
+            if not layer:
+                break
+            layers.append(layer)
+        return cycles
+
+    def _get_walk(self, layers, last_hop):
+        hops = [last_hop]
+        asset_id = last_hop.asset_in_id
+        for layer in reversed(layers[1:]):
+            hop = layer[asset_id][1]
+            hops.insert(0, hop)
+            asset_id = hop.asset_in_id
+        # longer walks may revisit an asset, which is not a single cycle
+        asset_ids = [hop.asset_in_id for hop in hops]
+        if len(set(asset_ids)) < len(asset_ids):
+            return None
+        if FLASH_LOAN_TXN_COUNT + sum(hop.txn_count for hop in hops) > tx_group_limit:
+            return None
+        return tuple(hops)
+
+    def _reset(self, graph):
+        self._graph = graph
+        self._reverse_graph = {}
+        self._venue_hops = {}
+        for hops in graph.values():
+            for hop in hops:
+                self._reverse_graph.setdefault(hop.asset_out_id, []).append(hop)
+                self._venue_hops.setdefault(hop.venue, []).append(hop)
+        self.state_keys = {}
+        self.weights = {}
+        self.cycles = {}
+        self._opportunities = {}
+
+    def _get_distances(self, asset_id, reverse):
+        # hop counts from (or, reversed, to) an asset, up to a cycle length less one hop
+        graph = self._reverse_graph if reverse else self._graph
+        distances = {asset_id: 0}
+        frontier = [asset_id]
+        for distance in range(1, self.max_hops):
+            next_frontier = []
+            for frontier_asset_id in frontier:
+                for hop in graph.get(frontier_asset_id, []):
+                    next_asset_id = hop.asset_in_id if reverse else hop.asset_out_id
+                    if next_asset_id not in distances:
+                        distances[next_asset_id] = distance
+                        next_frontier.append(next_asset_id)
+            frontier = next_frontier
+        return distances
+
+    def _get_affected_asset_ids(self, hops):
+        # a hop changes the search of an asset only if it lies on a short enough walk back to it
+        affected_asset_ids = set()
+        for hop in hops:
+            to_hop = self._get_distances(hop.asset_in_id, True)
+            from_hop = self._get_distances(hop.asset_out_id, False)
+            for asset_id, distance in to_hop.items():
+                if (
+                    distance + 1 + from_hop.get(asset_id, self.max_hops)
+                    <= self.max_hops
+                ):
+                    affected_asset_ids.add(asset_id)
+        return affected_asset_ids
+
+    def update(self):
+        """Reweighs the hops of venues whose state changed since the last update and searches
+        again from the assets with a walk of at most max_hops back to themselves through a
+        reweighed hop, the only searches a reweighed hop can change. The router graph is rebuilt
+        first if pools were added to the registry, in which case every asset is searched.
+
+        :return: asset ids that were searched
+        :rtype: set
+        """
+
+        router = self.algofi_client.router
+        router._refresh_graph_if_stale()
+        if router.graph is not self._graph:
+            self._reset(router.graph)
+
+        changed_hops = []
+        for venue, hops in self._venue_hops.items():
+            state_key = get_venue_state_key(venue)
+            if self.state_keys.get(venue) == state_key:
+                continue
+            self.state_keys[venue] = state_key
+            for hop in hops:
+                self.weights[hop] = self.get_hop_weight(hop)
+            changed_hops.extend(hops)
+
+        if len(changed_hops) == len(self.weights):
+            searched_asset_ids = set(self._graph)
+        else:
+            searched_asset_ids = self._get_affected_asset_ids(changed_hops)
+        for asset_id in searched_asset_ids:
+            for cycle in self.cycles.get(asset_id, []):
+                self._opportunities.pop(cycle, None)
+            self.cycles[asset_id] = self._search(asset_id)
+        return searched_asset_ids
+
+    def get_cycles(self):
+        """Returns the cycles whose weight is negative, updating them first
+
+        :return: list of cycles, each a tuple of :class:`RouteHop` starting and ending at the same asset
+        :rtype: list
+        """
+
+        self.update()
+        return [cycle for cycles in self.cycles.values() for cycle in cycles]
+
+    def get_cycle_weight(self, cycle):
+        """Returns the weight of a cycle
+
+        :param cycle: hops of the cycle
+        :type cycle: tuple
+        :return: sum of the hop weights, negative if the cycle is profitable at small sizes
+        :rtype: float
+        """
+
+        return sum([self.weights[hop] for hop in cycle])
+
+    def get_max_flash_loan_amount(self, pool, asset_id):
+        """Returns the largest amount of an asset a pool lends in one flash loan, its balance of
+        the asset scaled by its max flash loan ratio
+
+        :param pool: pool to borrow from
+        :type pool: :class:`Pool`
+        :param asset_id: asset id of the borrowed asset
+        :type asset_id: int
+        :return: max flash loan amount in base units
+        :rtype: int
+        """
+
+        balance = (
+            pool.asset1_balance
+            if pool.asset1.asset_id == asset_id
+            else pool.asset2_balance
+        )
+        return balance * pool.max_flash_loan_ratio // PARAMETER_SCALE_FACTOR
+
+    def get_flash_loan_pool(self, cycle):
+        """Returns the pool lending the largest amount of the first asset of a cycle that is not
+        swapped through by the cycle
+
+        :param cycle: hops of the cycle
+        :type cycle: tuple
+        :return: pool to borrow from, None if no pool can lend the asset
+        :rtype: :class:`Pool`
+        """
+
+        asset_id = cycle[0].asset_in_id
+        cycle_pools = set(
+            [hop.venue.pool if hop.is_interface else hop.venue for hop in cycle]
+        )
+        best_pool, best_amount = None, 0
+        for pool in self.algofi_client.amm.pool_registry:
+            if pool in cycle_pools:
+                continue
+            if asset_id not in [pool.asset1.asset_id, pool.asset2.asset_id]:
+                continue
+            max_amount = self.get_max_flash_loan_amount(pool, asset_id)
+            if max_amount > best_amount:
+                best_pool, best_amount = pool, max_amount
+        return best_pool
+
+    def size_cycle(self, cycle):
+        """Finds the flash loan amount maximizing the profit of a cycle, up to the max flash loan
+        amount of the lending pool. Profit is concave in the amount, so it is maximized by a
+        ternary search over exact quotes of the cycle.
+
+        :param cycle: hops of the cycle
+        :type cycle: tuple
+        :return: sized opportunity, None if no amount is profitable
+        :rtype: :class:`ArbitrageOpportunity`
+        """
+
+        router = self.algofi_client.router
+        flash_loan_pool = self.get_flash_loan_pool(cycle)
+        if flash_loan_pool is None:
+            return None
+        max_amount = self.get_max_flash_loan_amount(
+            flash_loan_pool, cycle[0].asset_in_id
+        )
+
+        def get_flash_loan_fee(amount):
+            return (
+                amount * flash_loan_pool.flash_loan_fee
+            ) // PARAMETER_SCALE_FACTOR + 1
+
+        def get_profit(amount):
+            route = router.quote_path(cycle, amount)
+            if route is None:
+                return -math.inf
+            return route.amount_out - amount - get_flash_loan_fee(amount)
+
+        lo, hi = 1, max_amount
+        while hi - lo > 2:
+            third = (hi - lo) // 3
+            if get_profit(lo + third) < get_profit(hi - third):
+                lo = lo + third + 1
+            else:
+                hi = hi - third
+        amount = max(range(lo, hi + 1), key=get_profit)
+        if get_profit(amount) <= 0:
+            return None
+        return ArbitrageOpportunity(
+            router.quote_path(cycle, amount),
+            flash_loan_pool,
+            get_flash_loan_fee(amount),
+        )
+
+    def get_opportunities(self, min_profit=1):
+        """Returns the profitable cycles sized for a flash loan, best return first. Rotations of
+        the same cycle borrow different assets, only the one with the best return is kept. Sizes
+        of cycles untouched by an update are reused.
+
+        :param min_profit: minimum profit in base units of the borrowed asset
+        :type min_profit: int, optional
+        :return: list of :class:`ArbitrageOpportunity`
+        :rtype: list
+        """
+
+        best = {}
+        for cycle in self.get_cycles():
+            if cycle not in self._opportunities:
+                self._opportunities[cycle] = self.size_cycle(cycle)
+            opportunity = self._opportunities[cycle]
+            if opportunity is None or opportunity.profit < min_profit:
+                continue
+            key = frozenset(cycle)
+            if key not in best or opportunity.return_rate > best[key].return_rate:
+                best[key] = opportunity
+        return sorted(best.values(), key=lambda opportunity: -opportunity.return_rate)
+
+    def get_opportunity_txns(self, user, opportunity, max_slippage, params=None):
+        """Get the group transaction borrowing the first asset of a cycle, swapping it around the
+        cycle as in :meth:`Router.get_route_txns` and repaying the loan with its fee. The group
+        fails unless the cycle returns at least the repayment.
+
+        :param user: user executing the cycle
+        :type user: :class:`AlgofiUser`
+        :param opportunity: opportunity to execute
+        :type opportunity: :class:`ArbitrageOpportunity`
+        :param max_slippage: maximum slippage of each hop output, e.g. 0.01 for 1%
+        :type max_slippage: float
+        :param params: transaction params object
+        :type params: :class:`SuggestedParams`, optional
+        :return: group transaction for the flash loan wrapping the cycle
+        :rtype: :class:`TransactionGroup`
+        """
+
+        if params is None:
+            params = get_default_params(self.algofi_client.algod)
+
+        route_group = self.algofi_client.router.get_route_txns(
+            user, opportunity.route, max_slippage, params=params
+        )
+        flash_loan_pool = opportunity.flash_loan_pool
+        flash_loan_asset = (
+            flash_loan_pool.asset1
+            if flash_loan_pool.asset1.asset_id == opportunity.asset_id
+            else flash_loan_pool.asset2
+        )
+        return flash_loan_pool.get_flash_loan_txns(
+            user.address,
+            flash_loan_asset,
+            opportunity.amount,
+            route_group,
+            params=copy.copy(params),
+        )
@@ -0,0 +1,182 @@
+# IMPORTS
+
+# external
+import bisect
+import json
+import os
+import threading
+
+# INTERFACE
+
+# account info fields that can be dropped with the indexer "exclude" parameter
+ACCOUNT_EXCLUDE_FIELDS = [
+    "assets",
+    "apps-local-state",
+    "created-apps",
+    "created-assets",
+]
+
+
+class ArchiveIndexer:
+    def __init__(self, path, fallback=None, nearest_earlier=False):
+        """Historical state store serving indexer application and account lookups by
+        (id, round) from disk. Lookups missing from disk are fetched from the fallback
+        indexer, if any, and written through so later lookups are served locally.
+        Without a fallback, a lookup of a round that is not archived raises, unless
+        nearest_earlier is set.
+
+        :param path: directory of the archive
+        :type path: str
+        :param fallback: indexer used for lookups not present in the archive
+        :type fallback: :class:`IndexerClient`, optional
+        :param nearest_earlier: without a fallback, serve a round that is not archived from
+            the latest snapshot before it. The snapshot is only the state at that round if
+            nothing changed in between.
+        :type nearest_earlier: bool, optional
+        """
+
+        self.path = path
+        self.fallback = fallback
+        self.nearest_earlier = nearest_earlier
+        # (kind, key) -> sorted list of archived rounds
+        self._rounds = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # any other indexer call is served by the fallback
+        fallback = self.__dict__.get("fallback")
+        if fallback is None:
+            raise AttributeError(
+                "%s is not served by an archive without a fallback indexer" % name
+            )
+        return getattr(fallback, name)
+
+    def applications(self, application_id, round_num=None, **kwargs):
+        """Return application info at a given round
+
+        :param application_id: app id
+        :type application_id: int
+        :param round_num: round at which to query the application
+        :type round_num: int, optional
+        :return: indexer application response
+        :rtype: dict
+        """
+
+        return self._lookup(
+            "applications",
+            str(application_id),
+            round_num,
+            lambda: self.fallback.applications(
+                application_id, round_num=round_num, **kwargs
+            ),
+        )
+
+    def account_info(self, address, round_num=None, exclude=None, **kwargs):
+        """Return account info at a given round. Full accounts are archived and the
+        fields in exclude are dropped on the way out.
+
+        :param address: account address
+        :type address: str
+        :param round_num: round at which to query the account
+        :type round_num: int, optional
+        :param exclude: comma-delimited list of information to exclude
+        :type exclude: str, optional
+        :return: indexer account response
+        :rtype: dict
+        """
+
+        response = self._lookup(
+            "accounts",
+            address,
+            round_num,
+            lambda: self.fallback.account_info(address, round_num=round_num, **kwargs),
+        )
+        if exclude:
+            account = dict(response.get("account", {}))
+            for field in exclude.split(","):
+                if field in ACCOUNT_EXCLUDE_FIELDS:
+                    account.pop(field, None)
+            response = dict(response, account=account)
+        return response
+
+    def put(self, kind, key, round_num, response):
+        """Write an indexer response into the archive
+
+        :param kind: "applications" or "accounts"
+        :type kind: str
+        :param key: app id or account address
+        :type key: str
+        :param round_num: round of the response
+        :type round_num: int
+        :param response: indexer response
+        :type response: dict
+        """
+
+        directory = os.path.join(self.path, kind, str(key))
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, "%i.json" % round_num)
+        temp_path = "%s.%i.tmp" % (file_path, threading.get_ident())
+        with open(temp_path, "w") as f:
+            json.dump(response, f)
+        os.replace(temp_path, file_path)
+
+        with self._lock:
+            rounds = self._rounds.get((kind, str(key)))
+            if rounds is not None and round_num not in rounds:
+                bisect.insort(rounds, round_num)
+
+    def get_rounds(self, kind, key):
+        """Returns the archived rounds for an application or account
+
+        :param kind: "applications" or "accounts"
+        :type kind: str
+        :param key: app id or account address
+        :type key: str
+        :return: sorted list of archived rounds
+        :rtype: list
+        """
+
+        key = str(key)
+        with self._lock:
+            if (kind, key) not in self._rounds:
+                directory = os.path.join(self.path, kind, key)
+                rounds = []
+                if os.path.isdir(directory):
+                    for file_name in os.listdir(directory):
+                        if file_name.endswith(".json"):
+                            rounds.append(int(file_name[: -len(".json")]))
+                self._rounds[(kind, key)] = sorted(rounds)
+            return list(self._rounds[(kind, key)])
+
+    def _read(self, kind, key, round_num):
+        with open(os.path.join(self.path, kind, key, "%i.json" % round_num)) as f:
+            return json.load(f)
+
+    def _lookup(self, kind, key, round_num, fetch):
+        rounds = self.get_rounds(kind, key)
+
+        # current state is never archived
+        if round_num is None:
+            if self.fallback is not None:
+                return fetch()
+            if not rounds:
+                raise Exception("%s %s is not archived" % (kind, key))
+            return self._read(kind, key, rounds[-1])
+
+        if round_num in rounds:
+            return self._read(kind, key, round_num)
+        if self.fallback is not None:
+            response = fetch()
+            self.put(kind, key, round_num, response)
+            return response
+        if not self.nearest_earlier:
+            raise Exception(
+                "%s %s is not archived at round %i" % (kind, key, round_num)
+            )
+
+        idx = bisect.bisect_right(rounds, round_num)
+        if idx == 0:
+            raise Exception(
+                "%s %s is not archived at or before round %i" % (kind, key, round_num)
+            )
+        return self._read(kind, key, rounds[idx - 1])
@@ -0,0 +1,87 @@
+# IMPORTS
+
+# external
+import json
+import msgpack
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# INTERFACE
+
+
+class DecodeBackend:
+    """Decode backend enum"""
+
+    JSON = "json"
+    FAST = "fast"
+
+
+class Decoder:
+    """Standard library response decoder"""
+
+    name = DecodeBackend.JSON
+    # algod block responses are requested as msgpack when set
+    prefer_msgpack = False
+
+    def loads(self, data):
+        """Decode a json response body
+
+        :param data: raw response body
+        :type data: bytes
+        :return: decoded response
+        :rtype: dict or list
+        """
+
+        return json.loads(data)
+
+    def loads_msgpack(self, data):
+        """Decode a msgpack response body
+
+        :param data: raw response body
+        :type data: bytes
+        :return: decoded response, with byte string values left as bytes
+        :rtype: dict
+        """
+
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class FastDecoder(Decoder):
+    """Decoder using orjson (when installed) for json and msgpack for algod blocks"""
+
+    name = DecodeBackend.FAST
+    prefer_msgpack = True
+
+    def loads(self, data):
+        """Decode a json response body, using orjson when it is installed
+
+        :param data: raw response body
+        :type data: bytes
+        :return: decoded response
+        :rtype: dict or list
+        """
+
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+def get_decoder(backend):
+    """Get a decoder for a given decode backend
+
+    :param backend: decode backend key or decoder instance
+    :type backend: :class:`DecodeBackend` or :class:`Decoder`
+    :return: decoder for the given backend
+    :rtype: :class:`Decoder`
+    """
+
+    if isinstance(backend, Decoder):
+        return backend
+    if backend == DecodeBackend.JSON:
+        return Decoder()
+    elif backend == DecodeBackend.FAST:
+        return FastDecoder()
+    raise Exception("Unsupported decode backend %s" % backend)
@@ -61,6 +61,9 @@ PERMISSIONLESS_SENDER_LOGIC_SIG = LogicSigAccount(
     ]
 )
 
+# HISTORICAL INDEXER
+DEFAULT_HISTORICAL_INDEXER_ADDRESS = "https://indexer.algoexplorerapi.io/"
+
 # ANALYTICS ENDPOINT
 MAINNET_ANALYTICS_ENDPOINT = "https://api.algofi.org"
 TESTNET_ANALYTICS_ENDPOINT = "https://api-dev.algofi.org"
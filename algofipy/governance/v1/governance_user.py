@@ -3,7 +3,7 @@ from base64 import b64decode
 from algosdk.encoding import encode_address
 
 # INTERFACE
-from algofipy.state_utils import get_local_states
+from algofipy.state_utils import get_local_states, format_local_states
 from algofipy.governance.v1.governance_config import ADMIN_STRINGS
 from algofipy.governance.v1.user_admin_state import UserAdminState
 from algofipy.governance.v1.user_voting_escrow_state import UserVotingEscrowState
@@ -11,13 +11,15 @@ from algofipy.governance.v1.user_rewards_manager_state import UserRewardsManager
 
 
 class GovernanceUser:
-    def __init__(self, governance_client, address):
+    def __init__(self, governance_client, address, account_info=None):
         """Constructor for the governance user class.
 
         :param governance_client: a governance client
         :type governance_client: :class:`GovernanceClient`
         :param address: address of the user
         :type address: str
+        :param account_info: prefetched account info of the user
+        :type account_info: dict, optional
         """
 
         self.governance_client = governance_client
@@ -25,20 +27,25 @@ class GovernanceUser:
         self.indexer = self.governance_client.indexer
         self.historical_indexer = self.governance_client.historical_indexer
         self.address = address
-        self.load_state()
+        self.load_state(account_info=account_info)
 
-    def load_state(self, block=None):
+    def load_state(self, block=None, account_info=None):
         """A function which will load in all of the state for a governance user
         including their admin state, voting escrow state, and rewards manager
         state into the governance user object.
 
         :param block: block at which to load user governance state
         :type block: int, optional
+        :param account_info: prefetched account info of the user, fetched if not provided
+        :type account_info: dict, optional
         """
 
         # get user local states
         indexer = self.historical_indexer if block else self.indexer
-        user_local_states = get_local_states(indexer, self.address, block=block)
+        if account_info is None:
+            user_local_states = get_local_states(indexer, self.address, block=block)
+        else:
+            user_local_states = format_local_states(account_info)
         self.opted_into_governance = False
 
         for app_id in user_local_states:
@@ -49,7 +56,7 @@ class GovernanceUser:
                     b64decode(user_local_state.get(ADMIN_STRINGS.storage_account, ""))
                 )
                 user_storage_local_states = get_local_states(
-                    self.indexer, storage_address
+                    indexer, storage_address, block=block
                 )
                 self.user_admin_state = UserAdminState(
                     storage_address, user_storage_local_states, self.governance_client
@@ -1,7 +1,6 @@
 # IMPORTS
 import base64
 from algosdk import logic
-from requests import get
 
 # INTERFACE
 from algofipy.state_utils import get_local_states, get_global_state
@@ -61,7 +60,7 @@ class Proposal:
         self.title = proposal_global_state[PROPOSAL_STRINGS.title]
         self.link = proposal_global_state[PROPOSAL_STRINGS.link]
 
-    def get_proposal_data(topic_id):
+    def get_proposal_data(self, topic_id):
         """Get proposal data from Algofi governance portal
 
         :param topic_id: topic id for proposal posted on Algofi governance portal.
@@ -69,11 +68,11 @@ class Proposal:
         """
 
         try:
-            data = get(
+            data = self.governance_client.algofi_client.transport.get_json(
                 get_analytics_endpoint(self.governance_client.network)
-                + "/getDiscourseTopic?topic_id="
-                + topic_id
-            ).json()
+                + "/getDiscourseTopic",
+                params={"topic_id": topic_id},
+            )
         except:
             raise Exception("Unable to find proposal with topic_id %i)" % (topic_id))
         self.data = data
@@ -4,13 +4,23 @@ from algosdk import logic
 import time
 
 # INTERFACE
-from algofipy.state_utils import get_global_state
+from algofipy.state_utils import (
+    get_global_state,
+    get_global_state_series,
+    DEFAULT_MAX_WORKERS,
+)
 from algofipy.utils import int_to_bytes
 from algofipy.governance.v1.governance_config import VOTING_ESCROW_STRINGS
 from algofipy.transaction_utils import TransactionGroup, get_default_params
 
 
 class VotingEscrow:
+    # column name -> global state key of the columns returned by :meth:`load_series`
+    series_fields = {
+        "total_locked": VOTING_ESCROW_STRINGS.total_locked,
+        "total_vebank": VOTING_ESCROW_STRINGS.total_vebank,
+    }
+
     def __init__(self, governance_client):
         """The constructor for the voting escrow object."""
 
@@ -44,6 +54,28 @@ class VotingEscrow:
         self.total_vebank = global_state.get(VOTING_ESCROW_STRINGS.total_vebank, 0)
         self.asset_id = global_state.get(VOTING_ESCROW_STRINGS.asset_id, 0)
 
+    def load_series(self, rounds, max_workers=DEFAULT_MAX_WORKERS):
+        """Returns the locked and vebank totals of the voting escrow contract at many rounds as
+        columns. Rounds are fetched concurrently through the historical indexer, which serves and
+        archives them on disk if the client has a historical cache path.
+
+        :param rounds: rounds to query, duplicates are fetched once
+        :type rounds: list
+        :param max_workers: number of rounds fetched in parallel
+        :type max_workers: int, optional
+        :return: dict of column name -> array ordered by round, with the rounds in column "round"
+        :rtype: dict
+        """
+
+        return get_global_state_series(
+            self.historical_indexer,
+            self.app_id,
+            rounds,
+            self.series_fields,
+            decode_byte_values=False,
+            max_workers=max_workers,
+        )
+
     def get_update_vebank_data_txns(self, user_calling, user_updating):
         """Constructs a series of transactions to update a target user's vebank.
 
@@ -2,6 +2,7 @@
 
 # external
 from math import floor, ceil
+import numpy as np
 from algosdk import logic
 from algosdk.transaction import ApplicationNoOpTxn, LogicSigAccount
 
@@ -10,10 +11,9 @@ from .lending_pool_interface_config import LENDING_POOL_INTERFACE_STRINGS
 
 # global
 from algofipy.globals import Network
-from algofipy.amm.v1.pool import Pool
 from algofipy.amm.v1.balance_delta import BalanceDelta
-from algofipy.amm.v1.asset import Asset
 from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.swap_bounds import solve_max_swap_in_amount
 from algofipy.transaction_utils import (
     get_payment_txn,
     get_default_params,
@@ -78,11 +78,8 @@ class LendingPoolInterface:
         self.market1 = algofi_client.lending.markets[self.market1_app_id]
         self.market2 = algofi_client.lending.markets[self.market2_app_id]
         self.lp_market = algofi_client.lending.markets[self.lp_market_app_id]
-        self.pool = Pool(
-            algofi_client.amm,
-            config.pool_type,
-            Asset(self.algofi_client.amm, self.market1.b_asset_id),
-            Asset(self.algofi_client.amm, self.market2.b_asset_id),
+        self.pool = algofi_client.amm.get_pool(
+            config.pool_type, self.market1.b_asset_id, self.market2.b_asset_id
         )
 
     def load_state(self, block=None):
@@ -209,6 +206,125 @@ class LendingPoolInterface:
             self.pool, asset1_swap_amount, asset2_swap_amount, 0, num_iter
         )
 
+    def get_spot_swap_rate(self, swap_in_asset_id):
+        """Returns the marginal output per unit of input of a swap of zero size through the b asset
+        pool, excluding the swap fee
+
+        :param swap_in_asset_id: id of incoming underlying asset
+        :type swap_in_asset_id: int
+        :return: spot swap rate in base units of the outgoing underlying asset per base unit of the
+            incoming underlying asset
+        :rtype: float
+        """
+
+        if swap_in_asset_id == self.market1.underlying_asset_id:
+            market_in, market_out = self.market1, self.market2
+        else:
+            market_in, market_out = self.market2, self.market1
+
+        # underlying in -> b asset in -> pool -> b asset out -> underlying out
+        return (
+            market_in.underlying_to_b_asset(1)
+            * self.pool.get_spot_swap_rate(market_in.b_asset_id)
+            * market_out.get_underlying_supplied()
+            / market_out.b_asset_circulation
+        )
+
+    def get_max_swap_in_amount(
+        self, swap_in_asset_id, max_slippage=None, min_output_ratio=None
+    ):
+        """Returns the largest swap exact for input whose output per unit of input is at least
+        min_output_ratio or, given max_slippage, within max_slippage of the spot swap rate, with
+        amounts in underlying assets. The search is seeded by the bound of the b asset pool, see
+        :meth:`Pool.get_max_swap_in_amount`.
+
+        :param swap_in_asset_id: id of incoming underlying asset
+        :type swap_in_asset_id: int
+        :param max_slippage: maximum relative shortfall of the output from the spot swap rate (e.g. 0.01 for 1%)
+        :type max_slippage: float, optional
+        :param min_output_ratio: minimum output per unit of input, in base units
+        :type min_output_ratio: float, optional
+        :return: largest amount of incoming underlying asset meeting the bound
+        :rtype: int
+        """
+
+        if (max_slippage is None) == (min_output_ratio is None):
+            raise Exception(
+                "Error: exactly one of max slippage or min output ratio must be given"
+            )
+        if min_output_ratio is None:
+            min_output_ratio = self.get_spot_swap_rate(swap_in_asset_id) * (
+                1 - max_slippage
+            )
+        if min_output_ratio <= 0:
+            raise Exception("Error: min output ratio must be positive")
+
+        swap_in_is_asset1 = swap_in_asset_id == self.market1.underlying_asset_id
+        if swap_in_is_asset1:
+            market_in, market_out = self.market1, self.market2
+        else:
+            market_in, market_out = self.market2, self.market1
+
+        def get_swap_out_amount(swap_in_amount):
+            if swap_in_amount <= 0:
+                return 0
+            quote = self.get_swap_exact_for_quote(swap_in_asset_id, swap_in_amount)
+            return quote.asset2_delta if swap_in_is_asset1 else quote.asset1_delta
+
+        # the bound of the underlying pool in b assets seeds the search in underlying
+        b_asset_per_underlying_in = market_in.underlying_to_b_asset(1)
+        underlying_per_b_asset_out = (
+            market_out.get_underlying_supplied() / market_out.b_asset_circulation
+        )
+        pool_bound = self.pool.get_max_swap_in_amount(
+            market_in.b_asset_id,
+            min_output_ratio=min_output_ratio
+            / (b_asset_per_underlying_in * underlying_per_b_asset_out),
+        )
+        guess = int(pool_bound / b_asset_per_underlying_in)
+        return solve_max_swap_in_amount(
+            get_swap_out_amount, min_output_ratio, guess + 1, guess=guess
+        )
+
+    def get_max_swap_in_amounts(
+        self, swap_in_asset_id, max_slippages=None, min_output_ratios=None
+    ):
+        """Returns :meth:`get_max_swap_in_amount` for many bounds
+
+        :param swap_in_asset_id: id of incoming underlying asset
+        :type swap_in_asset_id: int
+        :param max_slippages: maximum relative shortfalls of the output from the spot swap rate
+        :type max_slippages: list, optional
+        :param min_output_ratios: minimum outputs per unit of input, in base units
+        :type min_output_ratios: list, optional
+        :return: largest amounts of incoming underlying asset meeting each bound
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if (max_slippages is None) == (min_output_ratios is None):
+            raise Exception(
+                "Error: exactly one of max slippage or min output ratio must be given"
+            )
+        if max_slippages is not None:
+            return np.array(
+                [
+                    self.get_max_swap_in_amount(
+                        swap_in_asset_id, max_slippage=max_slippage
+                    )
+                    for max_slippage in max_slippages
+                ],
+                dtype=np.int64,
+            )
+        return np.array(
+            [
+                self.get_max_swap_in_amount(
+                    swap_in_asset_id, min_output_ratio=min_output_ratio
+                )
+                for min_output_ratio in min_output_ratios
+            ],
+            dtype=np.int64,
+        )
+
     def get_pool_txns(
         self, user, quote, maximum_slippage, add_to_user_collateral=False, params=None
     ):
@@ -6,7 +6,13 @@ from base64 import b64encode, b64decode
 from algosdk.encoding import encode_address
 
 # global
-from ...state_utils import get_local_state_at_app, get_local_states
+from ...state_utils import (
+    get_local_state_at_app,
+    get_local_states,
+    get_global_states,
+    format_series,
+    DEFAULT_MAX_WORKERS,
+)
 
 # local
 from .manager import Manager
@@ -45,6 +51,44 @@ class LendingClient:
         for market_app_id in self.markets:
             self.markets[market_app_id].load_state(block=block)
 
+    def load_series(self, rounds, markets=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Returns the state of many markets at many rounds as columns, see
+        :meth:`Market.load_series`. Every (market, round) pair is fetched concurrently in one batch.
+
+        :param rounds: rounds to query, duplicates are fetched once
+        :type rounds: list
+        :param markets: markets to query, defaults to all markets
+        :type markets: list, optional
+        :param max_workers: number of lookups in parallel
+        :type max_workers: int, optional
+        :return: dict of market app id -> dict of column name -> array ordered by round
+        :rtype: dict
+        """
+
+        if markets is None:
+            markets = list(self.markets.values())
+        global_states = get_global_states(
+            self.historical_indexer,
+            [(market.app_id, round_num) for market in markets for round_num in rounds],
+            decode_byte_values=False,
+            max_workers=max_workers,
+        )
+
+        states_by_app_id = dict([(market.app_id, {}) for market in markets])
+        for (app_id, round_num), global_state in global_states.items():
+            states_by_app_id[app_id][round_num] = global_state
+        return dict(
+            [
+                (
+                    market.app_id,
+                    format_series(
+                        states_by_app_id[market.app_id], market.series_fields
+                    ),
+                )
+                for market in markets
+            ]
+        )
+
     def get_user(self, user_address, storage_address=None):
         """Gets an algofi lending v2 user given an address.
 
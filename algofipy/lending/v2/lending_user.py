@@ -13,13 +13,20 @@ from .user_market_state import UserMarketState
 
 # INTERFACE
 from ...globals import FIXED_3_SCALE_FACTOR  # ,PERMISSIONLESS_SENDER_LOGIC_SIG
-from ...state_utils import get_local_state_at_app, get_local_states
+from ...state_utils import get_account_info, get_local_states, format_local_states
 from ...transaction_utils import TransactionGroup
 from ...utils import int_to_bytes, bytes_to_int
 
 
 class LendingUser:
-    def __init__(self, lending_client, address, storage_address=None):
+    def __init__(
+        self,
+        lending_client,
+        address,
+        storage_address=None,
+        account_info=None,
+        refresh_markets=True,
+    ):
         """An object that encapsulates user state on the lending protocol
         and creates transactions representing user actions
 
@@ -29,6 +36,10 @@ class LendingUser:
         :type address: str
         :param storage_address: a storage address of the user wallet
         :type storage_address: str, optional
+        :param account_info: prefetched account info of the user wallet
+        :type account_info: dict, optional
+        :param refresh_markets: reload the state of the markets the user is opted into
+        :type refresh_markets: bool, optional
         """
 
         self.lending_client = lending_client
@@ -37,18 +48,23 @@ class LendingUser:
         self.historical_indexer = self.lending_client.historical_indexer
         if storage_address:
             self.storage_address = storage_address
-            self.load_storage_state(self.storage_address)
+            self.load_storage_state(
+                self.storage_address, refresh_markets=refresh_markets
+            )
         else:
             self.address = address
-            self.load_state()
+            self.load_state(account_info=account_info, refresh_markets=refresh_markets)
 
-    def load_storage_state(self, storage_address, block=None):
+    def load_storage_state(self, storage_address, block=None, refresh_markets=True):
         """Populates storage state from the blockchain on the object
 
         :param storage_address: storage account to query
         :type storage_address: str
         :param block: block at which to query the user storage state
         :type block: int, optional
+        :param refresh_markets: reload the state of the markets the user is opted into,
+            otherwise the market state already loaded on the lending client is used
+        :type refresh_markets: bool, optional
         """
 
         # reset state
@@ -93,7 +109,8 @@ class LendingUser:
             # cache local state
             if market_app_id in self.lending_client.markets:
                 market = self.lending_client.markets[market_app_id]
-                market.load_state(block=block)
+                if refresh_markets:
+                    market.load_state(block=block)
 
                 self.user_market_states[market_app_id] = UserMarketState(
                     market, storage_states[market_app_id]
@@ -127,17 +144,28 @@ class LendingUser:
         if self.net_borrow > 0:
             self.net_borrow_apr = dollar_totaled_borrow_apr / self.net_borrow
 
-    def load_state(self, block=None):
+    def load_state(self, block=None, account_info=None, refresh_markets=True):
         """Populates user state from the blockchain on the object
 
         :param block: block at which to query the user local state
         :type block: int, optional
+        :param account_info: prefetched account info of the user wallet, fetched if not provided
+        :type account_info: dict, optional
+        :param refresh_markets: reload the state of the markets the user is opted into
+        :type refresh_markets: bool, optional
         """
 
-        indexer = self.historical_indexer if block else self.indexer
+        if account_info is None:
+            indexer = self.historical_indexer if block else self.indexer
+            account_info = get_account_info(
+                indexer,
+                self.address,
+                exclude="assets,created-apps,created-assets",
+                block=block,
+            )
 
-        manager_state = get_local_state_at_app(
-            indexer, self.address, self.lending_client.manager.app_id, block=block
+        manager_state = format_local_states(account_info).get(
+            self.lending_client.manager.app_id
         )
 
         if manager_state:
@@ -145,7 +173,9 @@ class LendingUser:
             self.storage_address = encode_address(
                 b64decode(manager_state[MANAGER_STRINGS.storage_account])
             )
-            self.load_storage_state(self.storage_address)
+            self.load_storage_state(
+                self.storage_address, block=block, refresh_markets=refresh_markets
+            )
         else:
             self.opted_in_to_manager = False
 
@@ -11,7 +11,13 @@ from .oracle import Oracle
 # INTERFACE
 from ...asset_amount import AssetAmount
 from ...globals import FIXED_3_SCALE_FACTOR, FIXED_6_SCALE_FACTOR
-from ...state_utils import get_global_state, get_global_state_field
+from ...state_utils import (
+    get_global_state,
+    get_global_state_field,
+    get_global_states,
+    format_series,
+    DEFAULT_MAX_WORKERS,
+)
 from ...transaction_utils import TransactionGroup, get_default_params, get_payment_txn
 from ...utils import int_to_bytes, bytes_to_int
 
@@ -73,6 +79,20 @@ class RewardsProgramState:
 
 class Market:
     local_min_balance = 471000
+    # column name -> global state key of the columns returned by :meth:`load_series`
+    series_fields = {
+        "underlying_cash": MARKET_STRINGS.underlying_cash,
+        "underlying_borrowed": MARKET_STRINGS.underlying_borrowed,
+        "underlying_reserves": MARKET_STRINGS.underlying_reserves,
+        "underlying_protocol_reserve": MARKET_STRINGS.underlying_protocol_reserve,
+        "borrow_share_circulation": MARKET_STRINGS.borrow_share_circulation,
+        "b_asset_to_underlying_exchange_rate": MARKET_STRINGS.b_asset_to_underlying_exchange_rate,
+        "b_asset_circulation": MARKET_STRINGS.b_asset_circulation,
+        "active_b_asset_collateral": MARKET_STRINGS.active_b_asset_collateral,
+        "latest_time": MARKET_STRINGS.latest_time,
+        "borrow_index": MARKET_STRINGS.borrow_index,
+        "implied_borrow_index": MARKET_STRINGS.implied_borrow_index,
+    }
 
     def __init__(self, lending_client, market_config):
         """The python representation of an algofi lending market smart contract
@@ -211,6 +231,24 @@ class Market:
         for i in range(self.max_rewards_program_index + 1):
             self.rewards_programs.append(RewardsProgramState(state, i))
 
+    def load_series(self, rounds, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Returns the balances, exchange rate and indexes of the market at many rounds as columns.
+        Rounds are fetched concurrently through the historical indexer, which serves and archives
+        them on disk if the client has a historical cache path.
+
+        :param rounds: rounds to query, duplicates are fetched once
+        :type rounds: list
+        :param max_workers: number of rounds fetched in parallel
+        :type max_workers: int, optional
+        :return: dict of column name -> array ordered by round, with the rounds in column "round"
+        :rtype: dict
+        """
+
+        return self.lending_client.load_series(
+            rounds, markets=[self], max_workers=max_workers
+        )[self.app_id]
+
     # GETTERS
 
     def get_underlying_supplied(self):
@@ -295,6 +333,19 @@ class Market:
         usd_amount = self.underlying_to_usd(raw_underlying_amount)
         return AssetAmount(raw_underlying_amount, usd_amount)
 
+    def b_asset_to_usd(self, amount):
+        """Converts b asset to usd at the b asset to underlying exchange rate
+
+        :param amount: b asset amount
+        :type amount: int
+        :return: dollarized amount
+        :rtype: float
+        """
+
+        return self.underlying_to_usd(
+            amount * self.get_underlying_supplied() / self.b_asset_circulation
+        )
+
     def borrow_shares_to_asset_amount(self, amount):
         """Converts borrow shares to underlying borrowed amount.
 
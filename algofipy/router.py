@@ -0,0 +1,514 @@
+# IMPORTS
+
+# external
+import copy
+import heapq
+import math
+import threading
+from algosdk.constants import tx_group_limit
+
+# local
+from .amm.v1.amm_config import PoolType
+from .transaction_utils import get_default_params
+
+# INTERFACE
+
+# constants
+DEFAULT_MAX_HOPS = 3
+DEFAULT_SPLIT_CHUNKS = 100
+# pools trading bank assets are routed through their lending pool interface
+LENDING_POOL_TYPES = [
+    PoolType.NANOSWAP_LENDING_POOL,
+    PoolType.CONSTANT_PRODUCT_25BP_FEE_LENDING_POOL,
+]
+POOL_SWAP_TXN_COUNT = 2
+LENDING_POOL_INTERFACE_SWAP_TXN_COUNT = 6
+POOL_SWAP_BASE_FEE = 2000
+
+
+class RouteHop:
+    def __init__(self, venue, asset_in_id, asset_out_id):
+        """A swap of one asset for another through a single pool or lending pool interface
+
+        :param venue: pool or lending pool interface executing the swap
+        :type venue: :class:`Pool` or :class:`LendingPoolInterface`
+        :param asset_in_id: id of incoming asset
+        :type asset_in_id: int
+        :param asset_out_id: id of outgoing asset
+        :type asset_out_id: int
+        """
+
+        self.venue = venue
+        self.asset_in_id = asset_in_id
+        self.asset_out_id = asset_out_id
+        # lending pool interfaces swap the underlying assets of their markets
+        self.is_interface = hasattr(venue, "market1")
+        asset1_id = (
+            venue.market1.underlying_asset_id
+            if self.is_interface
+            else venue.asset1.asset_id
+        )
+        self.swap_in_is_asset1 = asset_in_id == asset1_id
+        self.txn_count = (
+            LENDING_POOL_INTERFACE_SWAP_TXN_COUNT
+            if self.is_interface
+            else POOL_SWAP_TXN_COUNT
+        )
+
+    def get_quote(self, swap_in_amount):
+        """Quote the swap from the cached state of the venue
+
+        :param swap_in_amount: amount of incoming asset
+        :type swap_in_amount: int
+        :return: amount of outgoing asset and the quote of the venue
+        :rtype: (int, :class:`BalanceDelta`)
+        """
+
+        quote = self.venue.get_swap_exact_for_quote(self.asset_in_id, swap_in_amount)
+        swap_out_amount = (
+            quote.asset2_delta if self.swap_in_is_asset1 else quote.asset1_delta
+        )
+        return swap_out_amount, quote
+
+    def get_txns(self, user, swap_in_amount, quote, max_slippage, params):
+        """Get the group transaction executing this hop
+
+        :param user: user executing the swap
+        :type user: :class:`AlgofiUser`
+        :param swap_in_amount: amount of incoming asset
+        :type swap_in_amount: int
+        :param quote: quote of the venue for swap_in_amount
+        :type quote: :class:`BalanceDelta`
+        :param max_slippage: maximum slippage of the output, e.g. 0.01 for 1%
+        :type max_slippage: float
+        :param params: transaction params object
+        :type params: :class:`SuggestedParams`
+        :return: group transaction for the hop
+        :rtype: :class:`TransactionGroup`
+        """
+
+        if self.is_interface:
+            return self.venue.get_swap_txns(user, quote, max_slippage, params=params)
+
+        swap_in_asset = (
+            self.venue.asset1 if self.swap_in_is_asset1 else self.venue.asset2
+        )
+        swap_out_amount = (
+            quote.asset2_delta if self.swap_in_is_asset1 else quote.asset1_delta
+        )
+        return self.venue.get_swap_exact_for_txns(
+            user.address,
+            swap_in_asset,
+            swap_in_amount,
+            math.floor(swap_out_amount * (1 - max_slippage)),
+            params=params,
+            fee=POOL_SWAP_BASE_FEE + quote.extra_compute_fee,
+        )
+
+
+class Route:
+    def __init__(self, hops, amounts, quotes):
+        """A quoted path of swaps
+
+        :param hops: hops of the path, in execution order
+        :type hops: list
+        :param amounts: amount entering the first hop followed by the output of each hop
+        :type amounts: list
+        :param quotes: quote of each hop
+        :type quotes: list
+        """
+
+        self.hops = hops
+        self.amounts = amounts
+        self.quotes = quotes
+        self.asset_in_id = hops[0].asset_in_id
+        self.asset_out_id = hops[-1].asset_out_id
+        self.amount_in = amounts[0]
+        self.amount_out = amounts[-1]
+        self.extra_compute_fee = sum([quote.extra_compute_fee for quote in quotes])
+
+    @property
+    def asset_ids(self):
+        """Returns the assets visited by the route
+
+        :return: list of asset ids from the input to the output asset
+        :rtype: list
+        """
+
+        return [self.asset_in_id] + [hop.asset_out_id for hop in self.hops]
+
+
+class SplitOrder:
+    def __init__(self, hops, amounts, quotes):
+        """An input amount divided across parallel pools trading the same pair
+
+        :param hops: hop through each pool receiving part of the order
+        :type hops: list
+        :param amounts: amount of incoming asset sent to each pool
+        :type amounts: list
+        :param quotes: quote of each pool for its amount
+        :type quotes: list
+        """
+
+        self.hops = hops
+        self.amounts = amounts
+        self.quotes = quotes
+        self.amounts_out = [
+            quote.asset2_delta if hop.swap_in_is_asset1 else quote.asset1_delta
+            for (hop, quote) in zip(hops, quotes)
+        ]
+        self.amount_in = sum(amounts)
+        self.amount_out = sum(self.amounts_out)
+
+
+class Router:
+    def __init__(self, algofi_client, max_hops=DEFAULT_MAX_HOPS):
+        """Finds the best path between two assets across constant product pools, nanoswap pools
+        and lending pool interfaces. Paths are searched over pools loaded in the amm
+        :class:`PoolRegistry` and quoted from their cached state, so no network requests are made
+        to answer a quote. Refresh the pool state with :meth:`PoolRegistry.refresh`.
+
+        :param algofi_client: a :class:`AlgofiClient` object for interacting with the protocols
+        :type algofi_client: :class:`AlgofiClient`
+        :param max_hops: default maximum number of hops of a path
+        :type max_hops: int, optional
+        """
+
+        self.algofi_client = algofi_client
+        self.max_hops = max_hops
+
+        # asset id -> list of :class:`RouteHop` leaving the asset
+        self.graph = {}
+        # (asset_in_id, asset_out_id, max_hops) -> list of paths
+        self.path_cache = {}
+        self._venue_count = None
+        self._lock = threading.Lock()
+
+    def get_venues(self):
+        """Returns the pools and lending pool interfaces that swaps are routed through
+
+        :return: list of :class:`Pool` and :class:`LendingPoolInterface`
+        :rtype: list
+        """
+
+        venues = [
+            pool
+            for pool in self.algofi_client.amm.pool_registry
+            if pool.pool_type not in LENDING_POOL_TYPES
+        ]
+        venues.extend(self.algofi_client.interfaces.lending_pool_interfaces.values())
+        return venues
+
+    def _get_venue_count(self):
+        return len(self.algofi_client.amm.pool_registry) + len(
+            self.algofi_client.interfaces.lending_pool_interfaces
+        )
+
+    def build_graph(self):
+        """Builds the asset graph from :meth:`get_venues` and clears cached paths. The graph is
+        rebuilt automatically when pools are added to the pool registry.
+        """
+
+        venue_count = self._get_venue_count()
+        venues = self.get_venues()
+        graph = {}
+        for venue in venues:
+            if hasattr(venue, "market1"):
+                asset1_id = venue.market1.underlying_asset_id
+                asset2_id = venue.market2.underlying_asset_id
+            else:
+                asset1_id = venue.asset1.asset_id
+                asset2_id = venue.asset2.asset_id
+            graph.setdefault(asset1_id, []).append(
+                RouteHop(venue, asset1_id, asset2_id)
+            )
+            graph.setdefault(asset2_id, []).append(
+                RouteHop(venue, asset2_id, asset1_id)
+            )
+
+        with self._lock:
+            self.graph = graph
+            self.path_cache = {}
+            self._venue_count = venue_count
+
+    def _refresh_graph_if_stale(self):
+        # pools discovered since the graph was built invalidate it
+        if self._venue_count != self._get_venue_count():
+            self.build_graph()
+
+    def get_paths(self, asset_in_id, asset_out_id, max_hops=None):
+        """Returns the simple paths between two assets that fit in a single transaction group
+
+        :param asset_in_id: id of incoming asset
+        :type asset_in_id: int
+        :param asset_out_id: id of outgoing asset
+        :type asset_out_id: int
+        :param max_hops: maximum number of hops of a path, defaults to the router max_hops
+        :type max_hops: int, optional
+        :return: list of paths, each a tuple of :class:`RouteHop`
+        :rtype: list
+        """
+
+        self._refresh_graph_if_stale()
+        max_hops = self.max_hops if max_hops is None else max_hops
+        key = (asset_in_id, asset_out_id, max_hops)
+        # paths are cached against the graph they were searched on
+        graph, path_cache = self.graph, self.path_cache
+        paths = path_cache.get(key)
+        if paths is not None:
+            return paths
+
+        paths = []
+
+        def search(asset_id, path, visited, txn_count):
+            for hop in graph.get(asset_id, []):
+                if hop.asset_out_id in visited:
+                    continue
+                if txn_count + hop.txn_count > tx_group_limit:
+                    continue
+                if hop.asset_out_id == asset_out_id:
+                    paths.append(tuple(path + [hop]))
+                elif len(path) + 1 < max_hops:
+                    visited.add(hop.asset_out_id)
+                    search(
+                        hop.asset_out_id,
+                        path + [hop],
+                        visited,
+                        txn_count + hop.txn_count,
+                    )
+                    visited.remove(hop.asset_out_id)
+
+        if asset_in_id != asset_out_id:
+            search(asset_in_id, [], set([asset_in_id]), 0)
+
+        with self._lock:
+            path_cache[key] = paths
+        return paths
+
+    def quote_path(self, path, swap_in_amount):
+        """Quotes a path from the cached state of its pools
+
+        :param path: hops of the path
+        :type path: tuple
+        :param swap_in_amount: amount of incoming asset
+        :type swap_in_amount: int
+        :return: quoted route, None if a pool of the path cannot fill the swap
+        :rtype: :class:`Route`
+        """
+
+        amounts = [swap_in_amount]
+        quotes = []
+        for hop in path:
+            try:
+                swap_out_amount, quote = hop.get_quote(amounts[-1])
+            except Exception:
+                # empty pools and swaps exceeding the pool balance
+                return None
+            if swap_out_amount <= 0:
+                return None
+            amounts.append(swap_out_amount)
+            quotes.append(quote)
+        return Route(list(path), amounts, quotes)
+
+    def get_routes(self, asset_in_id, asset_out_id, swap_in_amount, max_hops=None):
+        """Returns every quoted route between two assets, best first
+
+        :param asset_in_id: id of incoming asset
+        :type asset_in_id: int
+        :param asset_out_id: id of outgoing asset
+        :type asset_out_id: int
+        :param swap_in_amount: amount of incoming asset
+        :type swap_in_amount: int
+        :param max_hops: maximum number of hops of a path, defaults to the router max_hops
+        :type max_hops: int, optional
+        :return: list of :class:`Route` sorted by decreasing output
+        :rtype: list
+        """
+
+        routes = []
+        for path in self.get_paths(asset_in_id, asset_out_id, max_hops=max_hops):
+            route = self.quote_path(path, swap_in_amount)
+            if route is not None:
+                routes.append(route)
+        routes.sort(key=lambda route: (-route.amount_out, len(route.hops)))
+        return routes
+
+    def get_best_route(self, asset_in_id, asset_out_id, swap_in_amount, max_hops=None):
+        """Returns the route with the largest output between two assets
+
+        :param asset_in_id: id of incoming asset
+        :type asset_in_id: int
+        :param asset_out_id: id of outgoing asset
+        :type asset_out_id: int
+        :param swap_in_amount: amount of incoming asset
+        :type swap_in_amount: int
+        :param max_hops: maximum number of hops of a path, defaults to the router max_hops
+        :type max_hops: int, optional
+        :return: best route
+        :rtype: :class:`Route`
+        """
+
+        routes = self.get_routes(
+            asset_in_id, asset_out_id, swap_in_amount, max_hops=max_hops
+        )
+        if not routes:
+            raise Exception(
+                "No route from asset %i to asset %i" % (asset_in_id, asset_out_id)
+            )
+        return routes[0]
+
+    def get_route_txns(self, user, route, max_slippage, params=None):
+        """Get the group transaction executing a route. Each hop after the first swaps the
+        minimum output of the previous hop, so the group never spends more than the user
+        receives; any output above the minimum stays with the user. Lending pool interface hops
+        include permissionless logic sig transactions, as in :meth:`LendingPoolInterface.get_swap_txns`.
+
+        :param user: user executing the swap
+        :type user: :class:`AlgofiUser`
+        :param route: route to execute
+        :type route: :class:`Route`
+        :param max_slippage: maximum slippage of each hop output, e.g. 0.01 for 1%
+        :type max_slippage: float
+        :param params: transaction params object
+        :type params: :class:`SuggestedParams`, optional
+        :return: group transaction for the route
+        :rtype: :class:`TransactionGroup`
+        """
+
+        if params is None:
+            params = get_default_params(self.algofi_client.algod)
+
+        group = None
+        swap_in_amount = route.amount_in
+        for i, hop in enumerate(route.hops):
+            if i == 0:
+                quote = route.quotes[0]
+                swap_out_amount = route.amounts[1]
+            else:
+                swap_out_amount, quote = hop.get_quote(swap_in_amount)
+            # venues overwrite the fee of the params they are given
+            hop_params = copy.copy(params)
+            hop_params.fee = 1000
+            hop_group = hop.get_txns(
+                user, swap_in_amount, quote, max_slippage, hop_params
+            )
+            group = hop_group if group is None else group + hop_group
+            swap_in_amount = math.floor(swap_out_amount * (1 - max_slippage))
+        return group
+
+    def _get_chunk_outputs(self, hop, chunk_amounts):
+        # outputs of a hop for each cumulative chunk amount, ending early once the pool cannot fill
+        if not hop.is_interface:
+            try:
+                quotes = hop.venue.get_swap_exact_for_quotes(
+                    hop.asset_in_id, chunk_amounts
+                )
+            except Exception:
+                return []
+            outputs = (
+                quotes.asset2_delta if hop.swap_in_is_asset1 else quotes.asset1_delta
+            )
+            return [int(output) for output in outputs]
+
+        outputs = []
+        for amount in chunk_amounts:
+            try:
+                outputs.append(hop.get_quote(amount)[0])
+            except Exception:
+                break
+        return outputs
+
+    def get_split_order(
+        self, asset_in_id, asset_out_id, swap_in_amount, n_chunks=DEFAULT_SPLIT_CHUNKS
+    ):
+        """Divides an input amount across every pool and lending pool interface trading a pair to
+        maximize the total output. The amount is split into n_chunks equal chunks and each chunk
+        is given to the pool with the largest marginal output for it, which is optimal up to the
+        chunk size since swap output is concave in the input amount. Outputs of every chunk
+        amount are quoted once per pool from cached state.
+
+        :param asset_in_id: id of incoming asset
+        :type asset_in_id: int
+        :param asset_out_id: id of outgoing asset
+        :type asset_out_id: int
+        :param swap_in_amount: amount of incoming asset
+        :type swap_in_amount: int
+        :param n_chunks: number of chunks the amount is divided into
+        :type n_chunks: int, optional
+        :return: split order with the amount and quote of each pool receiving part of the order
+        :rtype: :class:`SplitOrder`
+        """
+
+        self._refresh_graph_if_stale()
+        hops = [
+            hop
+            for hop in self.graph.get(asset_in_id, [])
+            if hop.asset_out_id == asset_out_id
+        ]
+        if not hops:
+            raise Exception(
+                "No pool from asset %i to asset %i" % (asset_in_id, asset_out_id)
+            )
+
+        n_chunks = max(min(n_chunks, swap_in_amount), 1)
+        chunk = swap_in_amount // n_chunks
+        chunk_amounts = [chunk * (i + 1) for i in range(n_chunks)]
+        # outputs[k][n] is the output of hop k for n + 1 chunks
+        outputs = [self._get_chunk_outputs(hop, chunk_amounts) for hop in hops]
+
+        chunk_counts = [0] * len(hops)
+        heap = [
+            (-output[0], k) for (k, output) in enumerate(outputs) if len(output) > 0
+        ]
+        heapq.heapify(heap)
+        for _ in range(n_chunks):
+            if not heap:
+                raise Exception("Pools cannot fill the swap")
+            _, k = heapq.heappop(heap)
+            chunk_counts[k] += 1
+            n = chunk_counts[k]
+            if n < len(outputs[k]):
+                heapq.heappush(heap, (-(outputs[k][n] - outputs[k][n - 1]), k))
+
+        # the remainder of the chunk division goes to the pool with the largest share
+        amounts = [count * chunk for count in chunk_counts]
+        amounts[chunk_counts.index(max(chunk_counts))] += (
+            swap_in_amount - chunk * n_chunks
+        )
+
+        split_hops, split_amounts, split_quotes = [], [], []
+        for hop, amount in zip(hops, amounts):
+            if amount == 0:
+                continue
+            split_hops.append(hop)
+            split_amounts.append(amount)
+            split_quotes.append(hop.get_quote(amount)[1])
+        return SplitOrder(split_hops, split_amounts, split_quotes)
+
+    def get_split_order_txns(self, user, split_order, max_slippage, params=None):
+        """Get a group transaction per pool executing a split order
+
+        :param user: user executing the swap
+        :type user: :class:`AlgofiUser`
+        :param split_order: split order to execute
+        :type split_order: :class:`SplitOrder`
+        :param max_slippage: maximum slippage of each pool output, e.g. 0.01 for 1%
+        :type max_slippage: float
+        :param params: transaction params object
+        :type params: :class:`SuggestedParams`, optional
+        :return: list of group transactions, one per pool of the split order
+        :rtype: list
+        """
+
+        if params is None:
+            params = get_default_params(self.algofi_client.algod)
+
+        groups = []
+        for hop, amount, quote in zip(
+            split_order.hops, split_order.amounts, split_order.quotes
+        ):
+            # venues overwrite the fee of the params they are given
+            hop_params = copy.copy(params)
+            hop_params.fee = 1000
+            groups.append(hop.get_txns(user, amount, quote, max_slippage, hop_params))
+        return groups
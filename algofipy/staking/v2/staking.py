@@ -5,7 +5,12 @@ from algosdk.transaction import (
     ApplicationOptInTxn,
     ApplicationCloseOutTxn,
 )
-from ...state_utils import get_global_state, format_prefix_state
+from ...state_utils import (
+    get_global_state,
+    format_prefix_state,
+    get_global_state_series,
+    DEFAULT_MAX_WORKERS,
+)
 from ...transaction_utils import TransactionGroup, get_default_params, get_payment_txn
 from ...utils import int_to_bytes, bytes_to_int
 from .staking_config import STAKING_STRINGS
@@ -15,6 +20,13 @@ import pprint
 
 
 class Staking:
+    # column name -> global state key of the columns returned by :meth:`load_series`
+    series_fields = {
+        "total_staked": STAKING_STRINGS.total_staked,
+        "scaled_total_staked": STAKING_STRINGS.scaled_total_staked,
+        "latest_time": STAKING_STRINGS.latest_time,
+    }
+
     def __init__(self, staking_client, rewards_manager_app_id, staking_config):
         """The python representation of an algofi staking smart contract
 
@@ -69,6 +81,28 @@ class Staking:
                 self, global_state, formatted_state, i
             )
 
+    def load_series(self, rounds, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Returns the staked totals of the staking contract at many rounds as columns. Rounds are
+        fetched concurrently through the historical indexer, which serves and archives them on
+        disk if the client has a historical cache path.
+
+        :param rounds: rounds to query, duplicates are fetched once
+        :type rounds: list
+        :param max_workers: number of rounds fetched in parallel
+        :type max_workers: int, optional
+        :return: dict of column name -> array ordered by round, with the rounds in column "round"
+        :rtype: dict
+        """
+
+        return get_global_state_series(
+            self.historical_indexer,
+            self.app_id,
+            rounds,
+            self.series_fields,
+            max_workers=max_workers,
+        )
+
     def get_total_staked(self):
         """Returns the total staked amount.
 
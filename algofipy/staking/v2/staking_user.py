@@ -1,5 +1,5 @@
 from .staking_config import STAKING_CONFIGS, rewards_manager_app_id
-from ...state_utils import get_local_states
+from ...state_utils import get_local_states, format_local_states
 from .staking import Staking
 from .user_staking_state import UserStakingState
 import pprint
@@ -13,7 +13,18 @@ class StakingUser:
         self.historical_indexer = self.staking_client.historical_indexer
         self.address = address
 
-    def load_state(self, block=None):
+    def load_state(self, block=None, account_info=None, refresh_staking=True):
+        """Populates user staking state from the blockchain on the object
+
+        :param block: block at which to query the user local state
+        :type block: int, optional
+        :param account_info: prefetched account info of the user, fetched if not provided
+        :type account_info: dict, optional
+        :param refresh_staking: load fresh staking contract state, otherwise the staking
+            contracts already loaded on the staking client are used
+        :type refresh_staking: bool, optional
+        """
+
         # staking configs
         staking_configs = STAKING_CONFIGS[self.staking_client.network]
         # app ids for staking contracts
@@ -24,11 +35,20 @@ class StakingUser:
         self.user_staking_states = {}
 
         # get local states
-        indexer = self.historical_indexer if block else self.indexer
-        local_states = get_local_states(indexer, self.address, block=block)
+        if account_info is None:
+            indexer = self.historical_indexer if block else self.indexer
+            local_states = get_local_states(indexer, self.address, block=block)
+        else:
+            local_states = format_local_states(account_info)
 
         for app_id, local_state in local_states.items():
             if int(app_id) in all_staking_contracts:
+                if not refresh_staking:
+                    self.user_staking_states[app_id] = UserStakingState(
+                        local_state, self.staking_client.staking_contracts[int(app_id)]
+                    )
+                    self.opted_in_staking_contracts.append(app_id)
+                    continue
                 staking_config = list(
                     filter(
                         lambda config: config.app_id == int(app_id),
@@ -2,27 +2,51 @@
 
 # local
 from base64 import b64encode, b64decode
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from .globals import ALGO_ASSET_ID
 
+# constants
+DEFAULT_MAX_WORKERS = 10
+
 # FUNCTIONS
 
 
-def get_balances(indexer, address, block=None):
-    """Get balances for a given user.
+def get_account_info(indexer, address, exclude=None, block=None):
+    """Get account info for a given user.
 
     :param indexer: algorand indexer client
     :type indexer: :class:`IndexerClient`
     :param address: user address
     :type address: str
-    :param block: block at which to query balances
+    :param exclude: comma-delimited list of information to exclude from indexer call
+    :type exclude: str, optional
+    :param block: block at which to query account info
     :type block: int, optional
+    :return: account info dict
+    :rtype: dict
+    """
+
+    try:
+        return indexer.account_info(address, round_num=block, exclude=exclude).get(
+            "account", {}
+        )
+    except:
+        raise Exception("Account does not exist.")
+
+
+def format_balances(account_info):
+    """Format balances from account info.
+
+    :param account_info: account info dict
+    :type account_info: dict
     :return: dict of asset id -> amount
     :rtype: dict
     """
 
     balances = {}
-    account_info = indexer.account_info(address, round_num=block)["account"]
     balances[ALGO_ASSET_ID] = account_info["amount"]
     if "assets" in account_info:
         for asset_info in account_info["assets"]:
@@ -30,6 +54,22 @@ def get_balances(indexer, address, block=None):
     return balances
 
 
+def get_balances(indexer, address, block=None):
+    """Get balances for a given user.
+
+    :param indexer: algorand indexer client
+    :type indexer: :class:`IndexerClient`
+    :param address: user address
+    :type address: str
+    :param block: block at which to query balances
+    :type block: int, optional
+    :return: dict of asset id -> amount
+    :rtype: dict
+    """
+
+    return format_balances(get_account_info(indexer, address, block=block))
+
+
 def get_state_int(state, key):
     """Get int value from state dict for given key.
 
@@ -124,6 +164,26 @@ def format_prefix_state(state):
     return formatted_state
 
 
+def format_local_states(account_info, decode_byte_values=True):
+    """Format local state of user for all opted in apps from account info.
+
+    :param account_info: account info dict
+    :type account_info: dict
+    :param decode_byte_values: whether to base64 decode bytes values
+    :type decode_byte_values: bool
+    :return: formatted local state dict
+    :rtype: dict
+    """
+
+    result = {}
+    if "apps-local-state" in account_info:
+        for local_state in account_info["apps-local-state"]:
+            result[local_state["id"]] = format_state(
+                local_state.get("key-value", []), decode_byte_values=decode_byte_values
+            )
+    return result
+
+
 def get_local_states(indexer, address, decode_byte_values=True, block=None):
     """Get local state of user for all opted in apps.
 
@@ -139,20 +199,10 @@ def get_local_states(indexer, address, decode_byte_values=True, block=None):
     :rtype: dict
     """
 
-    try:
-        results = indexer.account_info(
-            address, round_num=block, exclude="assets,created-apps,created-assets"
-        ).get("account", {})
-    except:
-        raise Exception("Account does not exist.")
-
-    result = {}
-    if "apps-local-state" in results:
-        for local_state in results["apps-local-state"]:
-            result[local_state["id"]] = format_state(
-                local_state.get("key-value", []), decode_byte_values=decode_byte_values
-            )
-    return result
+    account_info = get_account_info(
+        indexer, address, exclude="assets,created-apps,created-assets", block=block
+    )
+    return format_local_states(account_info, decode_byte_values=decode_byte_values)
 
 
 def get_local_state_at_app(
@@ -183,6 +233,42 @@ def get_local_state_at_app(
         return None
 
 
+def get_application_info(indexer, app_id, block=None):
+    """Get application info (creation round, params and global state) of a given application.
+
+    :param indexer: algorand indexer
+    :type indexer: :class:`IndexerClient`
+    :param app_id: app id
+    :type app_id: int
+    :param block: block at which to query application info
+    :type block: int, optional
+    :return: application info dict
+    :rtype: dict
+    """
+
+    try:
+        return indexer.applications(app_id, round_num=block).get("application", {})
+    except:
+        raise Exception("Application does not exist.")
+
+
+def format_global_state(application_info, decode_byte_values=True):
+    """Format global state from application info.
+
+    :param application_info: application info dict
+    :type application_info: dict
+    :param decode_byte_values: whether to base64 decode bytes values
+    :type decode_byte_values: bool
+    :return: formatted global state dict
+    :rtype: dict
+    """
+
+    return format_state(
+        application_info["params"]["global-state"],
+        decode_byte_values=decode_byte_values,
+    )
+
+
 def get_global_state(indexer, app_id, decode_byte_values=True, block=None):
     """Get global state of a given application.
 
@@ -198,14 +284,8 @@ def get_global_state(indexer, app_id, decode_byte_values=True, block=None):
     :rtype: dict
     """
 
-    try:
-        application_info = indexer.applications(app_id, round_num=block).get(
-            "application", {}
-        )
-    except:
-        raise Exception("Application does not exist.")
-    return format_state(
-        application_info["params"]["global-state"],
+    return format_global_state(
+        get_application_info(indexer, app_id, block=block),
         decode_byte_values=decode_byte_values,
     )
 
@@ -238,6 +318,127 @@ def get_global_state_field(
         raise Exception("Field not found")
 
 
+def get_global_states(
+    indexer, app_rounds, decode_byte_values=True, max_workers=DEFAULT_MAX_WORKERS
+):
+    """Get global states of applications at many rounds concurrently. Duplicate lookups are
+    fetched once, and lookups through an :class:`ArchiveIndexer` are served from and written to disk.
+
+    :param indexer: algorand indexer, usually the historical indexer
+    :type indexer: :class:`IndexerClient`
+    :param app_rounds: (app id, round) pairs to query
+    :type app_rounds: list
+    :param decode_byte_values: whether to base64 decode bytes values
+    :type decode_byte_values: bool
+    :param max_workers: number of lookups in parallel
+    :type max_workers: int, optional
+    :return: dict of (app id, round) -> formatted global state dict
+    :rtype: dict
+    """
+
+    app_rounds = list(set(app_rounds))
+
+    def fetch(app_round):
+        app_id, round_num = app_round
+        return get_global_state(
+            indexer, app_id, decode_byte_values=decode_byte_values, block=round_num
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(app_rounds, executor.map(fetch, app_rounds)))
+
+
+def format_series(global_states, fields):
+    """Format global states at many rounds as columns, ordered by round. Missing fields are 0.
+
+    :param global_states: dict of round -> formatted global state dict
+    :type global_states: dict
+    :param fields: dict of column name -> global state key
+    :type fields: dict
+    :return: dict of column name -> array, with the rounds in column "round"
+    :rtype: dict
+    """
+
+    rounds = sorted(global_states)
+    series = {"round": np.array(rounds, dtype=np.int64)}
+    for name, key in fields.items():
+        values = [global_states[round_num].get(key, 0) for round_num in rounds]
+        # global state ints are uint64, keep exact python ints past the int64 range
+        if values and max(values) >= 2**63:
+            series[name] = np.array(values, dtype=object)
+        else:
+            series[name] = np.array(values, dtype=np.int64)
+    return series
+
+
+def get_global_state_series(
+    indexer,
+    app_id,
+    rounds,
+    fields,
+    decode_byte_values=True,
+    max_workers=DEFAULT_MAX_WORKERS,
+):
+    """Get global state fields of an application at many rounds as columns, see
+    :func:`get_global_states` and :func:`format_series`.
+
+    :param indexer: algorand indexer, usually the historical indexer
+    :type indexer: :class:`IndexerClient`
+    :param app_id: app id
+    :type app_id: int
+    :param rounds: rounds to query
+    :type rounds: list
+    :param fields: dict of column name -> global state key
+    :type fields: dict
+    :param decode_byte_values: whether to base64 decode bytes values
+    :type decode_byte_values: bool
+    :param max_workers: number of lookups in parallel
+    :type max_workers: int, optional
+    :return: dict of column name -> array, with the rounds in column "round"
+    :rtype: dict
+    """
+
+    global_states = get_global_states(
+        indexer,
+        [(app_id, round_num) for round_num in rounds],
+        decode_byte_values=decode_byte_values,
+        max_workers=max_workers,
+    )
+    return format_series(
+        dict(
+            [
+                (round_num, global_state)
+                for (_, round_num), global_state in global_states.items()
+            ]
+        ),
+        fields,
+    )
+
+
+def get_block_timestamp(algod, block=None, decoder=None):
+    """Get the timestamp of a given block.
+
+    :param algod: algorand algod client
+    :type algod: :class:`AlgodClient`
+    :param block: block at which to query the timestamp, defaults to the latest block
+    :type block: int, optional
+    :param decoder: response decoder, blocks are fetched as msgpack if it prefers to
+    :type decoder: :class:`Decoder`, optional
+    :return: unix timestamp of the block
+    :rtype: int
+    """
+
+    if block is None:
+        block = algod.status()["last-round"]
+    if decoder is not None and decoder.prefer_msgpack:
+        block_info = decoder.loads_msgpack(
+            algod.block_info(block, response_format="msgpack")
+        )
+    else:
+        block_info = algod.block_info(block)
+    return block_info["block"]["ts"]
+
+
 def get_accounts_opted_into_app(indexer, app_id, exclude=None):
     """Get list of accounts opted into a given app
 
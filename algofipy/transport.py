@@ -0,0 +1,302 @@
+# IMPORTS
+
+# external
+import json
+import threading
+from functools import partial
+from urllib import parse
+
+import requests
+from requests.adapters import HTTPAdapter
+from algosdk import constants, error
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
+
+# local
+from .decoding import Decoder
+
+# INTERFACE
+
+# constants
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+API_VERSION_PATH_PREFIX = "/v2"
+
+
+class HostMetrics:
+    def __init__(self, host):
+        """Connection reuse counters for a single host
+
+        :param host: host name (including port, if any)
+        :type host: str
+        """
+
+        self.host = host
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+
+    @property
+    def reused_connections(self):
+        """Number of requests that were served over an already open connection
+
+        :return: number of requests that did not open a new connection
+        :rtype: int
+        """
+
+        return max(self.requests - self.connections, 0)
+
+    @property
+    def reuse_ratio(self):
+        """Share of requests that were served over an already open connection
+
+        :return: ratio of reused connections to requests
+        :rtype: float
+        """
+
+        if self.requests == 0:
+            return 0
+        return self.reused_connections / self.requests
+
+
+class Transport:
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        max_retries=0,
+        decoder=None,
+    ):
+        """Pooled keep-alive HTTP transport shared by the algod, indexer and analytics clients
+
+        :param pool_size: maximum number of open connections kept alive per host
+        :type pool_size: int
+        :param connect_timeout: seconds to wait for a connection to be established
+        :type connect_timeout: float
+        :param read_timeout: seconds to wait for a response once connected
+        :type read_timeout: float
+        :param max_retries: number of retries on connection errors
+        :type max_retries: int
+        :param decoder: response decoder
+        :type decoder: :class:`Decoder`, optional
+        """
+
+        self.pool_size = pool_size
+        self.decoder = decoder if decoder is not None else Decoder()
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self.metrics = {}
+        self._connection_counts = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, data=None, headers=None):
+        """Execute a request over the pooled session and record host metrics
+
+        :param method: request method
+        :type method: str
+        :param url: full url of the request
+        :type url: str
+        :param params: query parameters
+        :type params: dict, optional
+        :param data: request body
+        :type data: bytes, optional
+        :param headers: request headers
+        :type headers: dict, optional
+        :return: http response
+        :rtype: :class:`requests.Response`
+        """
+
+        host = parse.urlsplit(url).netloc
+        try:
+            response = self.session.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except requests.RequestException:
+            self._record(host, None, failed=True)
+            raise
+        self._record(
+            host,
+            getattr(response.raw, "_pool", None),
+            failed=response.status_code >= 400,
+        )
+        return response
+
+    def get_json(self, url, params=None):
+        """Get a url and decode the json response
+
+        :param url: full url of the request
+        :type url: str
+        :param params: query parameters
+        :type params: dict, optional
+        :return: decoded json response
+        :rtype: dict or list
+        """
+
+        response = self.request("GET", url, params=params)
+        response.raise_for_status()
+        return self.decoder.loads(response.content)
+
+    def _record(self, host, pool, failed=False):
+        # connection counts live on the urllib3 pool that served the request,
+        # which is recreated if evicted, so count the delta since last seen
+        with self._lock:
+            metrics = self.metrics.setdefault(host, HostMetrics(host))
+            metrics.requests += 1
+            metrics.errors += 1 if failed else 0
+            if pool is None:
+                return
+            last_pool_id, last_count = self._connection_counts.get(host, (None, 0))
+            if last_pool_id != id(pool):
+                last_count = 0
+            metrics.connections += pool.num_connections - last_count
+            self._connection_counts[host] = (id(pool), pool.num_connections)
+
+    def get_metrics(self):
+        """Returns connection reuse metrics per host
+
+        :return: dict of host -> :class:`HostMetrics`
+        :rtype: dict
+        """
+
+        with self._lock:
+            return dict(self.metrics)
+
+    def mount(self, client):
+        """Route the requests of an algod or indexer client through this transport.
+        Clients that are not algosdk algod or indexer clients are left untouched.
+
+        :param client: algod or indexer client
+        :type client: :class:`AlgodClient` or :class:`IndexerClient`
+        :return: the client that was passed in
+        :rtype: :class:`AlgodClient` or :class:`IndexerClient`
+        """
+
+        if isinstance(client, AlgodClient):
+            client.algod_request = partial(self.algod_request, client)
+        elif isinstance(client, IndexerClient):
+            client.indexer_request = partial(self.indexer_request, client)
+        return client
+
+    def _get_url(self, address, requrl, params):
+        if requrl not in constants.unversioned_paths:
+            requrl = API_VERSION_PATH_PREFIX + requrl
+        if params:
+            requrl = requrl + "?" + parse.urlencode(params)
+        return address + requrl
+
+    def algod_request(
+        self,
+        client,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+    ):
+        """Drop-in replacement for :meth:`AlgodClient.algod_request`
+
+        :param client: algod client issuing the request
+        :type client: :class:`AlgodClient`
+        :param method: request method
+        :type method: str
+        :param requrl: url path of the request
+        :type requrl: str
+        :param params: query parameters
+        :type params: dict, optional
+        :param data: request body
+        :type data: bytes, optional
+        :param headers: additional request headers
+        :type headers: dict, optional
+        :param response_format: "json" or "msgpack"
+        :type response_format: str
+        :return: decoded json response or raw response body
+        :rtype: dict or bytes
+        """
+
+        header = {"User-Agent": "py-algorand-sdk"}
+        if client.headers:
+            header.update(client.headers)
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header.update({constants.algod_auth_header: client.algod_token})
+
+        response = self.request(
+            method,
+            self._get_url(client.algod_address, requrl, params),
+            data=data,
+            headers=header,
+        )
+        if response.status_code >= 400:
+            message = response.text
+            try:
+                message = json.loads(message)["message"]
+            except Exception:
+                pass
+            raise error.AlgodHTTPError(message, response.status_code)
+        if response_format == "json":
+            try:
+                return self.decoder.loads(response.content)
+            except Exception as e:
+                raise error.AlgodResponseError(
+                    "Failed to parse JSON response from algod"
+                ) from e
+        return response.content
+
+    def indexer_request(
+        self, client, method, requrl, params=None, data=None, headers=None
+    ):
+        """Drop-in replacement for :meth:`IndexerClient.indexer_request`
+
+        :param client: indexer client issuing the request
+        :type client: :class:`IndexerClient`
+        :param method: request method
+        :type method: str
+        :param requrl: url path of the request
+        :type requrl: str
+        :param params: query parameters
+        :type params: dict, optional
+        :param data: request body
+        :type data: bytes, optional
+        :param headers: additional request headers
+        :type headers: dict, optional
+        :return: decoded json response
+        :rtype: dict
+        """
+
+        header = {"User-Agent": "py-algorand-sdk"}
+        if client.headers:
+            header.update(client.headers)
+        if headers:
+            header.update(headers)
+        if (requrl not in constants.no_auth) and client.indexer_token:
+            header.update({constants.indexer_auth_header: client.indexer_token})
+
+        response = self.request(
+            method,
+            self._get_url(client.indexer_address, requrl, params),
+            data=data,
+            headers=header,
+        )
+        if response.status_code >= 400:
+            message = response.text
+            try:
+                message = json.loads(message)["message"]
+            except Exception:
+                pass
+            raise error.IndexerHTTPError(message)
+        return self.decoder.loads(response.content)
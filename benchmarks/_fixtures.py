@@ -0,0 +1,117 @@
+"""
+Shared fixtures of the benchmarks and tests. Pools are built without the network loading
+constructor, with every field :class:`Pool` sets on construction and in :meth:`Pool.load_state`
+initialized.
+"""
+
+import math
+
+from algofipy.amm.v1.amm_config import Network, PoolStatus, PoolType
+from algofipy.amm.v1.pool import Pool
+from algofipy.amm.v1.pool_analytics import PoolAnalytics
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+
+# default swap fee of each pool type
+SWAP_FEES = {
+    PoolType.CONSTANT_PRODUCT_25BP_FEE: 0.0025,
+    PoolType.CONSTANT_PRODUCT_30BP_FEE: 0.003,
+    PoolType.CONSTANT_PRODUCT_75BP_FEE: 0.0075,
+    PoolType.CONSTANT_PRODUCT_100BP_FEE: 0.01,
+    PoolType.NANOSWAP: 0.0001,
+    PoolType.NANOSWAP_LENDING_POOL: 0.0001,
+    PoolType.CONSTANT_PRODUCT_25BP_FEE_LENDING_POOL: 0.0025,
+}
+
+
+class BenchmarkAsset:
+    def __init__(self, asset_id, decimals=6):
+        self.asset_id = asset_id
+        self.decimals = decimals
+
+
+def make_pool(
+    pool_type=PoolType.CONSTANT_PRODUCT_25BP_FEE,
+    asset1_balance=0,
+    asset2_balance=0,
+    asset1=None,
+    asset2=None,
+    app_id=None,
+    lp_circulation=1,
+    lp_asset_id=None,
+    swap_fee=None,
+    flash_loan_fee=0,
+    max_flash_loan_ratio=0,
+    amplification_factor=10**6,
+    stable_swap_engine=None,
+    indexer=None,
+    amm_client=None,
+):
+    """Returns a pool with given balances and parameters, bypassing the network loading
+    constructor. Assets default to ids 1 and 2, lp_circulation may be "min" or "sqrt" for the
+    smaller balance or the geometric mean of the balances and the swap fee defaults to the fee of
+    the pool type.
+    """
+
+    pool = Pool.__new__(Pool)
+
+    # clients
+    pool.amm_client = amm_client
+    pool.algod = None
+    pool.indexer = indexer
+    pool.historical_indexer = indexer
+    pool.network = Network.MAINNET
+    pool.stable_swap_engine = (
+        stable_swap_engine if stable_swap_engine is not None else StableSwapEngine()
+    )
+    pool.depth_tables = {}
+    pool._state = None
+    pool.analytics = PoolAnalytics(pool)
+
+    # metadata
+    pool.pool_type = pool_type
+    pool.asset1 = asset1 if asset1 is not None else BenchmarkAsset(1)
+    pool.asset2 = asset2 if asset2 is not None else BenchmarkAsset(2)
+    pool.validator_index = None
+    pool.application_id = app_id
+    pool.pool_status = PoolStatus.ACTIVE
+    pool.manager_application_id = None
+    pool.manager_address = None
+    pool.logic_sig = None
+    pool.logic_sig_address = None
+    pool.address = None
+    pool.created_at_round = 0
+    pool.lp_asset_id = lp_asset_id if lp_asset_id is not None else app_id
+    pool.lp_asset = BenchmarkAsset(pool.lp_asset_id)
+    pool.admin = None
+    pool.reserve_factor = 0
+    pool.flash_loan_fee = flash_loan_fee
+    pool.max_flash_loan_ratio = max_flash_loan_ratio
+    pool.swap_fee = swap_fee if swap_fee is not None else SWAP_FEES[pool_type]
+
+    # amplification factor, constant
+    pool.initial_amplification_factor = amplification_factor
+    pool.future_amplification_factor = amplification_factor
+    pool.initial_amplification_factor_time = 0
+    pool.future_amplification_factor_time = 0
+    pool.t = 1
+
+    # state
+    pool.asset1_balance = asset1_balance
+    pool.asset2_balance = asset2_balance
+    if lp_circulation == "min":
+        lp_circulation = min(asset1_balance, asset2_balance)
+    elif lp_circulation == "sqrt":
+        lp_circulation = int(math.sqrt(asset1_balance * asset2_balance))
+    pool.lp_circulation = lp_circulation
+    pool.asset1_reserve = 0
+    pool.asset2_reserve = 0
+    pool.latest_time = 0
+    pool.cumsum_time_weighted_asset1_to_asset2_price = 0
+    pool.cumsum_time_weighted_asset2_to_asset1_price = 0
+    pool.cumsum_volume_asset1 = 0
+    pool.cumsum_volume_asset2 = 0
+    pool.cumsum_volume_weighted_asset1_to_asset2_price = 0
+    pool.cumsum_volume_weighted_asset2_to_asset1_price = 0
+    pool.cumsum_fees_asset1 = 0
+    pool.cumsum_fees_asset2 = 0
+    return pool
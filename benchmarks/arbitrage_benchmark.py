@@ -0,0 +1,135 @@
+"""
+Benchmark of the incremental arbitrage scan against a scan from scratch over random pool graphs.
+Correctness of the scan and of opportunity sizing is covered by tests/test_arbitrage.py.
+
+    python -m benchmarks.arbitrage_benchmark
+"""
+
+import argparse
+import random
+import timeit
+from types import SimpleNamespace
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+from algofipy.arbitrage import ArbitrageScanner
+from algofipy.router import Router
+
+from benchmarks._fixtures import BenchmarkAsset, make_pool
+
+N_STABLE_ASSETS = 3
+
+
+def make_arbitrage_pool(app_id, pool_type, asset1_id, asset2_id, balances, engine):
+    return make_pool(
+        pool_type,
+        balances[0],
+        balances[1],
+        asset1=BenchmarkAsset(asset1_id),
+        asset2=BenchmarkAsset(asset2_id),
+        app_id=app_id,
+        flash_loan_fee=1000,
+        max_flash_loan_ratio=100000,
+        stable_swap_engine=engine,
+    )
+
+
+def get_balances(rng, prices, asset1_id, asset2_id, mispricing):
+    liquidity = rng.randint(10**9, 10**12)
+    return (
+        int(
+            liquidity / prices[asset1_id] * rng.uniform(1 - mispricing, 1 + mispricing)
+        ),
+        int(liquidity / prices[asset2_id]),
+    )
+
+
+def make_client(rng, n_assets, n_pools, mispricing):
+    engine = StableSwapEngine()
+    registry = PoolRegistry(None)
+    # the first assets are stable and also traded in nanoswap pools
+    prices = dict(
+        [
+            (asset_id, 1.0 if asset_id <= N_STABLE_ASSETS else rng.uniform(0.01, 100))
+            for asset_id in range(1, n_assets + 1)
+        ]
+    )
+    pool_types = [
+        PoolType.CONSTANT_PRODUCT_25BP_FEE,
+        PoolType.CONSTANT_PRODUCT_75BP_FEE,
+    ]
+    app_id = 0
+    while len(registry) < n_pools:
+        asset1_id, asset2_id = sorted(rng.sample(range(1, n_assets + 1), 2))
+        types = list(pool_types)
+        if asset2_id <= N_STABLE_ASSETS:
+            types.append(PoolType.NANOSWAP)
+        app_id += 1
+        registry.add(
+            make_arbitrage_pool(
+                app_id,
+                rng.choice(types),
+                asset1_id,
+                asset2_id,
+                get_balances(rng, prices, asset1_id, asset2_id, mispricing),
+                engine,
+            )
+        )
+    algofi_client = SimpleNamespace(
+        amm=SimpleNamespace(pool_registry=registry),
+        interfaces=SimpleNamespace(lending_pool_interfaces={}),
+    )
+    algofi_client.router = Router(algofi_client)
+    return algofi_client, prices
+
+
+def perturb(rng, algofi_client, n_pools):
+    for pool in rng.sample(list(algofi_client.amm.pool_registry), n_pools):
+        pool.asset1_balance = int(pool.asset1_balance * rng.uniform(0.98, 1.02))
+
+
+def benchmark(number):
+    rng = random.Random(1)
+    for n_assets, n_pools in [(20, 60), (50, 200)]:
+        algofi_client, _ = make_client(rng, n_assets, n_pools, 0.01)
+        scanner = ArbitrageScanner(algofi_client)
+        scanner.update()
+        full_time = (
+            timeit.timeit(
+                lambda: ArbitrageScanner(algofi_client).update(), number=number
+            )
+            / number
+        )
+
+        n_searched = 0
+
+        def update():
+            nonlocal n_searched
+            perturb(rng, algofi_client, 1)
+            n_searched += len(scanner.update())
+
+        update_time = timeit.timeit(update, number=number) / number
+        opportunity_time = (
+            timeit.timeit(lambda: scanner.get_opportunities(), number=number) / number
+        )
+        print(
+            "%i assets, %i pools: scan from scratch %.2f ms, update after one pool changes"
+            " %.2f ms (%.1f assets searched), opportunities %.2f ms"
+            % (
+                n_assets,
+                n_pools,
+                1000 * full_time,
+                1000 * update_time,
+                n_searched / number,
+                1000 * opportunity_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    benchmark(args.number)
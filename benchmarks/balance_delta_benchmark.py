@@ -0,0 +1,90 @@
+"""
+Benchmark of memory and construction time of slotted, lazily priced balance deltas against the
+previous eager balance delta. Lazy price deltas matching the eager ones is covered by
+tests/test_balance_delta.py.
+
+    python -m benchmarks.balance_delta_benchmark
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.balance_delta import BalanceDelta
+
+from benchmarks._fixtures import make_pool
+
+
+class EagerBalanceDelta:
+    # the balance delta before slots and lazy price deltas
+    def __init__(self, pool, asset1_delta, asset2_delta, lp_delta, num_iter=0):
+        self.asset1_delta = asset1_delta
+        self.asset2_delta = asset2_delta
+        self.lp_delta = lp_delta
+        self.num_iter = num_iter
+        self.extra_compute_fee = int(num_iter / (700 / 400)) * 1000
+
+        if lp_delta != 0:
+            self.price_delta = 0
+        elif pool.lp_circulation == 0:
+            self.price_delta = 0
+        else:
+            starting_price_ratio = pool.asset1_balance / pool.asset2_balance
+            final_price_ratio = (pool.asset1_balance + asset1_delta) / (
+                pool.asset2_balance + asset2_delta
+            )
+            self.price_delta = abs((starting_price_ratio / final_price_ratio) - 1)
+
+
+def measure(cls, pool, n_quotes):
+    amounts = list(range(1, n_quotes + 1))
+    tracemalloc.start()
+    quotes = [cls(pool, -amount, amount, 0) for amount in amounts]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del quotes
+    construct_time = timeit.timeit(
+        lambda: [cls(pool, -amount, amount, 0) for amount in amounts], number=3
+    )
+    return size / n_quotes, construct_time / 3 / n_quotes
+
+
+def benchmark(n_quotes):
+    pool = make_pool(
+        PoolType.CONSTANT_PRODUCT_25BP_FEE,
+        10**12,
+        11 * 10**11,
+        lp_circulation="min",
+    )
+    eager_size, eager_time = measure(EagerBalanceDelta, pool, n_quotes)
+    lazy_size, lazy_time = measure(BalanceDelta, pool, n_quotes)
+    print(
+        "%i quotes: eager %.0f bytes %.2f us, slotted lazy %.0f bytes %.2f us per quote"
+        % (n_quotes, eager_size, 1e6 * eager_time, lazy_size, 1e6 * lazy_time)
+    )
+
+    amounts = np.linspace(1, 10**11, n_quotes).astype(np.int64)
+    batch_time = (
+        timeit.timeit(lambda: pool.get_swap_exact_for_quotes(1, amounts), number=3) / 3
+    )
+    priced_time = (
+        timeit.timeit(
+            lambda: pool.get_swap_exact_for_quotes(1, amounts).price_delta, number=3
+        )
+        / 3
+    )
+    print(
+        "batch of %i: amounts only %.2f ms, with price deltas %.2f ms"
+        % (n_quotes, 1000 * batch_time, 1000 * priced_time)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quotes", type=int, default=200000)
+    args = parser.parse_args()
+
+    benchmark(args.quotes)
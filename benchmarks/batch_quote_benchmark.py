@@ -0,0 +1,47 @@
+"""
+Benchmark of vectorized constant product batch quotes against the scalar quote path. Batch
+quotes matching the scalar quotes exactly is covered by tests/test_batch_quote.py.
+
+    python -m benchmarks.batch_quote_benchmark
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+
+
+def benchmark(n_amounts, number):
+    pool = make_pool(PoolType.CONSTANT_PRODUCT_25BP_FEE, 10**12, 3 * 10**12)
+    amounts = np.linspace(1, 10**11, n_amounts).astype(np.int64)
+    amounts_list = [int(x) for x in amounts]
+
+    scalar = timeit.timeit(
+        lambda: [pool.get_swap_exact_for_quote(1, amount) for amount in amounts_list],
+        number=number,
+    )
+    batch = timeit.timeit(
+        lambda: pool.get_swap_exact_for_quotes(1, amounts), number=number
+    )
+    print(
+        "%i amounts: scalar %.2f ms, batch %.2f ms (%.0fx)"
+        % (
+            n_amounts,
+            1000 * scalar / number,
+            1000 * batch / number,
+            scalar / batch,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--amounts", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+
+    benchmark(args.amounts, args.number)
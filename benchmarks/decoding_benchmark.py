@@ -0,0 +1,129 @@
+"""
+Benchmark of the response decode backends on recorded indexer payloads. The backends decoding
+identical objects is covered by tests/test_decoding.py.
+
+Record payloads from a live indexer (one file per page of accounts opted into an app):
+
+    python -m benchmarks.decoding_benchmark --record https://mainnet-idx.algonode.cloud 605753404
+
+Run the benchmark on the recorded payloads (falls back to a synthetic page if none are recorded):
+
+    python -m benchmarks.decoding_benchmark
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import timeit
+
+from algofipy.decoding import Decoder, FastDecoder, orjson
+from algofipy.state_utils import format_state
+from algofipy.transport import Transport
+
+my_path = os.path.abspath(os.path.dirname(__file__))
+PAYLOAD_PATH = os.path.join(my_path, "payloads")
+
+
+def record(indexer_address, app_id, max_pages):
+    # store the raw response bodies so every backend decodes identical bytes
+    os.makedirs(PAYLOAD_PATH, exist_ok=True)
+    transport = Transport()
+    params = {"application-id": app_id, "limit": 1000}
+    for i in range(max_pages):
+        page = transport.request(
+            "GET", indexer_address + "/v2/accounts", params=params
+        ).content
+        with open(
+            os.path.join(PAYLOAD_PATH, "accounts_%i_%i.json" % (app_id, i)), "wb"
+        ) as f:
+            f.write(page)
+        next_page = json.loads(page).get("next-token", None)
+        if next_page is None:
+            break
+        params["next"] = next_page
+    print("recorded %i pages to %s" % (i + 1, PAYLOAD_PATH))
+
+
+def synthetic_page(n_accounts=1000, n_keys=16):
+    rng = random.Random(0)
+    accounts = []
+    for _ in range(n_accounts):
+        key_values = []
+        for k in range(n_keys):
+            key = base64.b64encode(("k%i" % k).encode()).decode()
+            if k % 4:
+                value = {"type": 2, "uint": rng.getrandbits(60), "bytes": ""}
+            else:
+                value = {
+                    "type": 1,
+                    "uint": 0,
+                    "bytes": base64.b64encode(rng.randbytes(32)).decode(),
+                }
+            key_values.append({"key": key, "value": value})
+        accounts.append(
+            {
+                "address": base64.b32encode(rng.randbytes(35)).decode()[:58],
+                "amount": rng.getrandbits(40),
+                "apps-local-state": [{"id": 605753404, "key-value": key_values}],
+            }
+        )
+    return json.dumps(
+        {"accounts": accounts, "current-round": 1, "next-token": "x"}
+    ).encode()
+
+
+def load_payloads():
+    if os.path.isdir(PAYLOAD_PATH):
+        names = sorted(os.listdir(PAYLOAD_PATH))
+        if names:
+            payloads = []
+            for name in names:
+                with open(os.path.join(PAYLOAD_PATH, name), "rb") as f:
+                    payloads.append(f.read())
+            return "recorded", payloads
+    return "synthetic", [synthetic_page()]
+
+
+def run(repeat):
+    source, payloads = load_payloads()
+    size = sum(len(p) for p in payloads)
+    print("%s payloads: %i pages, %.1f MB" % (source, len(payloads), size / 1e6))
+    if orjson is None:
+        print("orjson is not installed, the fast backend falls back to json")
+
+    for decoder in [Decoder(), FastDecoder()]:
+        decode = timeit.timeit(
+            lambda: [decoder.loads(p) for p in payloads], number=repeat
+        )
+        scan = timeit.timeit(
+            lambda: [
+                format_state(local_state.get("key-value", []))
+                for p in payloads
+                for account in decoder.loads(p)["accounts"]
+                for local_state in account.get("apps-local-state", [])
+            ],
+            number=repeat,
+        )
+        print(
+            "%-5s decode %8.2f ms/run  %6.1f MB/s  decode + format_state %8.2f ms/run"
+            % (
+                decoder.name,
+                decode / repeat * 1e3,
+                size * repeat / decode / 1e6,
+                scan / repeat * 1e3,
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", nargs=2, metavar=("INDEXER_ADDRESS", "APP_ID"))
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if args.record:
+        record(args.record[0], int(args.record[1]), args.max_pages)
+    else:
+        run(args.repeat)
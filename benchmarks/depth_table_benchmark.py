@@ -0,0 +1,80 @@
+"""
+Benchmark of price impact lookups from a pool depth table against a bisection over scalar quotes.
+The interpolation error of the table against exact quotes is covered by tests/test_depth_table.py.
+
+    python -m benchmarks.depth_table_benchmark
+"""
+
+import argparse
+import timeit
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+
+
+def bisect_swap_in_amount(pool, swap_in_asset_id, price_delta):
+    # the hand-rolled search the depth table replaces
+    low, high = 1, pool.asset1_balance
+    while high - low > 1:
+        mid = (low + high) // 2
+        if (
+            pool.get_swap_exact_for_quote(swap_in_asset_id, mid).price_delta
+            <= price_delta
+        ):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def benchmark(number):
+    for pool_type in [PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP]:
+        pool = make_pool(
+            pool_type, 10**12, 11 * 10**11, amplification_factor=10**7
+        )
+        build_time = (
+            timeit.timeit(
+                lambda: (pool.depth_tables.clear(), pool.get_depth_table(1)),
+                number=number,
+            )
+            / number
+        )
+        lookup_time = (
+            timeit.timeit(
+                lambda: pool.get_depth_table(1).get_swap_in_amount(0.01),
+                number=number * 100,
+            )
+            / number
+            / 100
+        )
+        impact_time = (
+            timeit.timeit(
+                lambda: pool.get_depth_table(1).get_price_delta(10**9),
+                number=number * 100,
+            )
+            / number
+            / 100
+        )
+        bisect_time = (
+            timeit.timeit(lambda: bisect_swap_in_amount(pool, 1, 0.01), number=number)
+            / number
+        )
+        print(
+            "%s: build %.2f ms, size for impact %.1f us, impact for size %.1f us, bisection %.2f ms"
+            % (
+                pool_type.name,
+                1000 * build_time,
+                1e6 * lookup_time,
+                1e6 * impact_time,
+                1000 * bisect_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    benchmark(args.number)
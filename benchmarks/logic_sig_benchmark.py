@@ -0,0 +1,146 @@
+"""
+Benchmark of cached and bulk pool logic sig address derivation against building the program by
+list concatenation and hashing a fresh logic sig per pool. Derived addresses matching the algosdk
+logic sig address and pool existence checks are covered by tests/test_logic_sig.py.
+
+    python -m benchmarks.logic_sig_benchmark
+"""
+
+import argparse
+import random
+import timeit
+from functools import reduce
+
+from algosdk.transaction import LogicSigAccount
+
+from algofipy.amm.v1.amm_client import AMMClient
+from algofipy.amm.v1.amm_config import (
+    MAINNET_CONSTANT_PRODUCT_POOLS_MANAGER_APP_ID,
+    MAINNET_NANOSWAP_POOLS_ASSET_PAIR_TO_APP_ID,
+    Network,
+    PoolType,
+    get_validator_index,
+)
+from algofipy.amm.v1.logic_sig_generator import (
+    POOL_FACTORY_LOGIC_SIG_TEMPLATE_1,
+    POOL_FACTORY_LOGIC_SIG_TEMPLATE_2,
+    POOL_FACTORY_LOGIC_SIG_TEMPLATE_3,
+    POOL_FACTORY_LOGIC_SIG_TEMPLATE_4,
+    encode_varint,
+    get_logic_sig_address,
+    get_logic_sig_addresses,
+)
+
+MANAGER_APP_ID = MAINNET_CONSTANT_PRODUCT_POOLS_MANAGER_APP_ID
+POOL_TYPES = [PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.CONSTANT_PRODUCT_75BP_FEE]
+
+
+def generate_logic_sig_by_concatenation(
+    asset1_id, asset2_id, manager_app_id, validator_index
+):
+    # the logic sig generator before preassembled templates
+    return bytes(
+        reduce(
+            lambda x, y: x + y,
+            [
+                POOL_FACTORY_LOGIC_SIG_TEMPLATE_1,
+                list(encode_varint(asset1_id)),
+                list(encode_varint(asset2_id)),
+                POOL_FACTORY_LOGIC_SIG_TEMPLATE_2,
+                list(encode_varint(manager_app_id)),
+                POOL_FACTORY_LOGIC_SIG_TEMPLATE_3,
+                list(encode_varint(validator_index)),
+                POOL_FACTORY_LOGIC_SIG_TEMPLATE_4,
+            ],
+        )
+    )
+
+
+def get_address_by_concatenation(asset1_id, asset2_id, validator_index):
+    return LogicSigAccount(
+        generate_logic_sig_by_concatenation(
+            asset1_id, asset2_id, MANAGER_APP_ID, validator_index
+        )
+    ).address()
+
+
+def make_pairs(rng, n_pairs):
+    pairs = set()
+    while len(pairs) < n_pairs:
+        asset1_id = rng.choice([0, rng.randint(1, 127), rng.randint(1, 2**40)])
+        asset2_id = rng.randint(asset1_id + 1, 2**40)
+        pairs.add((asset1_id, asset2_id))
+    return list(pairs)
+
+
+def make_amm_client(pool_addresses):
+    # bypass the network loading constructor, existence checks only read the address index
+    amm_client = AMMClient.__new__(AMMClient)
+    amm_client.network = Network.MAINNET
+    amm_client.manager_application_id = MANAGER_APP_ID
+    amm_client.nanoswap_pool_app_ids = MAINNET_NANOSWAP_POOLS_ASSET_PAIR_TO_APP_ID
+    amm_client.pool_addresses = pool_addresses
+    return amm_client
+
+
+def benchmark(n_pairs):
+    rng = random.Random(1)
+    pairs = make_pairs(rng, n_pairs)
+    validator_index = get_validator_index(Network.MAINNET, POOL_TYPES[0])
+
+    concatenation_time = timeit.timeit(
+        lambda: [
+            get_address_by_concatenation(asset1_id, asset2_id, validator_index)
+            for (asset1_id, asset2_id) in pairs
+        ],
+        number=1,
+    )
+    bulk_time = timeit.timeit(
+        lambda: get_logic_sig_addresses(pairs, MANAGER_APP_ID, validator_index),
+        number=1,
+    )
+    get_logic_sig_address.cache_clear()
+    uncached_time = timeit.timeit(
+        lambda: [
+            get_logic_sig_address(asset1_id, asset2_id, MANAGER_APP_ID, validator_index)
+            for (asset1_id, asset2_id) in pairs
+        ],
+        number=1,
+    )
+    cached_time = timeit.timeit(
+        lambda: [
+            get_logic_sig_address(asset1_id, asset2_id, MANAGER_APP_ID, validator_index)
+            for (asset1_id, asset2_id) in pairs
+        ],
+        number=1,
+    )
+    print(
+        "%i pairs: concatenation %.2f us, bulk %.2f us, first lookup %.2f us,"
+        " cached lookup %.2f us per address"
+        % (
+            n_pairs,
+            1e6 * concatenation_time / n_pairs,
+            1e6 * bulk_time / n_pairs,
+            1e6 * uncached_time / n_pairs,
+            1e6 * cached_time / n_pairs,
+        )
+    )
+
+    amm_client = make_amm_client(
+        set(get_logic_sig_addresses(pairs[::10], MANAGER_APP_ID, validator_index))
+    )
+    exists_time = timeit.timeit(
+        lambda: amm_client.get_existing_pairs(POOL_TYPES[0], pairs), number=1
+    )
+    print(
+        "existence check of %i pairs against the address index: %.1f ms"
+        % (n_pairs, 1000 * exists_time)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=20000)
+    args = parser.parse_args()
+
+    benchmark(args.pairs)
@@ -0,0 +1,131 @@
+"""
+Benchmark of valuing the LP tokens of every pool in one batch against valuing each pool on its
+own. Local LP token prices matching the dollar value of the pool per LP token is covered by
+tests/test_lp_valuation.py.
+
+    python -m benchmarks.lp_valuation_benchmark
+"""
+
+import argparse
+import random
+import timeit
+from types import SimpleNamespace
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.lp_valuation import LPValuation
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.lending.v2.lending_config import MarketType
+from algofipy.lending.v2.market import Market
+
+from benchmarks._fixtures import BenchmarkAsset, make_pool
+
+
+def make_market(underlying_asset_id, b_asset_id, raw_price, exchange_rate):
+    # bypass the network loading constructor, conversions only read balances and the oracle
+    market = Market.__new__(Market)
+    market.underlying_asset_id = underlying_asset_id
+    market.b_asset_id = b_asset_id
+    market.market_type = MarketType.STANDARD
+    market.oracle = SimpleNamespace(raw_price=raw_price, scale_factor=10**6)
+    market.b_asset_circulation = 10**15
+    market.underlying_cash = int(exchange_rate * 10**15)
+    market.underlying_borrowed = 0
+    market.underlying_reserves = 0
+    return market
+
+
+def make_amm_client(markets, pools):
+    amm_client = SimpleNamespace(
+        algofi_client=SimpleNamespace(
+            lending=SimpleNamespace(
+                markets=dict([(market.b_asset_id, market) for market in markets])
+            )
+        )
+    )
+    amm_client.pool_registry = PoolRegistry(amm_client)
+    for pool in pools:
+        amm_client.pool_registry.add(pool)
+    amm_client.lp_valuation = LPValuation(amm_client)
+    for pool in pools:
+        pool.amm_client = amm_client
+    return amm_client
+
+
+def make_pools(rng, n_pools):
+    # a lending market, an oracle priced asset and a chain of pool priced assets per cluster
+    markets = []
+    pools = []
+    prices = {}
+    for k in range(n_pools // 4):
+        base_id = 1000 * (k + 1)
+        underlying = BenchmarkAsset(base_id + 1, rng.choice([0, 6, 8]))
+        b_asset = BenchmarkAsset(base_id + 2, underlying.decimals)
+        derived = [
+            BenchmarkAsset(base_id + 3 + i, rng.choice([0, 6])) for i in range(3)
+        ]
+        underlying_price = rng.uniform(0.01, 100)
+        exchange_rate = rng.uniform(1, 1.2)
+        markets.append(
+            make_market(
+                underlying.asset_id,
+                b_asset.asset_id,
+                # oracle price per base unit, scaled by the scale factor and 10**3
+                underlying_price * 10 ** (9 - underlying.decimals),
+                exchange_rate,
+            )
+        )
+        prices[underlying.asset_id] = underlying_price
+        prices[b_asset.asset_id] = underlying_price * exchange_rate
+        chain = [underlying] + derived
+        for i, (asset1, asset2) in enumerate(zip(chain[:-1], chain[1:])):
+            prices[asset2.asset_id] = rng.uniform(0.01, 100)
+            value = rng.uniform(10**4, 10**7)
+            pools.append(
+                make_pool(
+                    PoolType.CONSTANT_PRODUCT_25BP_FEE,
+                    int(value / prices[asset1.asset_id] * 10**asset1.decimals),
+                    int(value / prices[asset2.asset_id] * 10**asset2.decimals),
+                    asset1=asset1,
+                    asset2=asset2,
+                    app_id=base_id + 100 + i,
+                    lp_circulation="sqrt",
+                )
+            )
+        # a lending pool of the b asset against the first derived asset
+        value = rng.uniform(10**4, 10**7)
+        pools.append(
+            make_pool(
+                PoolType.CONSTANT_PRODUCT_25BP_FEE_LENDING_POOL,
+                int(value / prices[b_asset.asset_id] * 10**b_asset.decimals),
+                int(value / prices[derived[0].asset_id] * 10 ** derived[0].decimals),
+                asset1=b_asset,
+                asset2=derived[0],
+                app_id=base_id + 200,
+                lp_circulation="sqrt",
+            )
+        )
+    return markets, pools, prices
+
+
+def benchmark(n_pools):
+    rng = random.Random(1)
+    markets, pools, prices = make_pools(rng, n_pools)
+    amm_client = make_amm_client(markets, pools)
+    lp_valuation = amm_client.lp_valuation
+
+    batch_time = timeit.timeit(lambda: lp_valuation.get_lp_token_prices(), number=3) / 3
+    single_time = timeit.timeit(
+        lambda: [pool.get_lp_token_price() for pool in pools], number=1
+    )
+    print(
+        "%i pools: batch %.2f ms, one pool at a time %.2f ms"
+        % (len(pools), 1000 * batch_time, 1000 * single_time)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pools", type=int, default=400)
+    args = parser.parse_args()
+
+    benchmark(args.pools)
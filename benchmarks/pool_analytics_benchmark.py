@@ -0,0 +1,150 @@
+"""
+Benchmark of pool analytics over a simulated pool history served by an indexer with latency,
+comparing concurrent batch fetches against sequential ones and repeat queries served by the ring
+buffer of samples. Windowed averages, volumes and fees matching the simulated swaps is covered by
+tests/test_pool_analytics.py.
+
+    python -m benchmarks.pool_analytics_benchmark
+"""
+
+import argparse
+import base64
+import random
+import threading
+import time
+import timeit
+
+from algofipy.amm.v1.amm_config import POOL_STRINGS
+from algofipy.amm.v1.pool_analytics import CUMSUM_PRICE_SCALE_FACTOR, PoolAnalytics
+
+from benchmarks._fixtures import make_pool
+
+FIELDS = [
+    "latest_time",
+    "cumsum_time_weighted_asset1_to_asset2_price",
+    "cumsum_time_weighted_asset2_to_asset1_price",
+    "cumsum_volume_asset1",
+    "cumsum_volume_asset2",
+    "cumsum_volume_weighted_asset1_to_asset2_price",
+    "cumsum_volume_weighted_asset2_to_asset1_price",
+    "cumsum_fees_asset1",
+    "cumsum_fees_asset2",
+]
+
+
+class BenchmarkIndexer:
+    def __init__(self, history, latency):
+        self.history = history
+        self.latency = latency
+        self.n_calls = 0
+        self._lock = threading.Lock()
+
+    def applications(self, application_id, round_num=None):
+        with self._lock:
+            self.n_calls += 1
+        time.sleep(self.latency)
+        global_state = [
+            {
+                "key": base64.b64encode(getattr(POOL_STRINGS, name).encode()).decode(),
+                "value": {"type": 2, "uint": value},
+            }
+            for name, value in self.history[round_num].items()
+        ]
+        return {"application": {"params": {"global-state": global_state}}}
+
+
+def simulate_history(rng, n_rounds):
+    # pool state after each round, with the prices of every elapsed second
+    balances = [10**12, 2 * 10**12]
+    state = dict([(name, 0) for name in FIELDS])
+    history = {}
+    swaps = {}
+    prices = []
+    for round_num in range(n_rounds):
+        round_swaps = []
+        if rng.random() < 0.5:
+            swap_in_index = rng.choice([0, 1])
+            amount = rng.randint(10**6, 10**10)
+            now = round_num * 4 + rng.randint(0, 3)
+            price12 = balances[1] * CUMSUM_PRICE_SCALE_FACTOR // balances[0]
+            price21 = balances[0] * CUMSUM_PRICE_SCALE_FACTOR // balances[1]
+            elapsed_time = now - state["latest_time"]
+            prices.extend([(price12, price21)] * elapsed_time)
+            state["cumsum_time_weighted_asset1_to_asset2_price"] += (
+                price12 * elapsed_time
+            )
+            state["cumsum_time_weighted_asset2_to_asset1_price"] += (
+                price21 * elapsed_time
+            )
+            state["latest_time"] = now
+            fee = amount // 400
+            if swap_in_index == 0:
+                state["cumsum_volume_asset1"] += amount
+                state["cumsum_volume_weighted_asset1_to_asset2_price"] += (
+                    price12 * amount
+                )
+                state["cumsum_fees_asset1"] += fee
+            else:
+                state["cumsum_volume_asset2"] += amount
+                state["cumsum_volume_weighted_asset2_to_asset1_price"] += (
+                    price21 * amount
+                )
+                state["cumsum_fees_asset2"] += fee
+            amount_out = (
+                balances[1 - swap_in_index]
+                * (amount - fee)
+                // (balances[swap_in_index] + amount - fee)
+            )
+            balances[swap_in_index] += amount
+            balances[1 - swap_in_index] -= amount_out
+            round_swaps.append((swap_in_index, amount, fee, price12, price21))
+        history[round_num] = dict(state)
+        swaps[round_num] = round_swaps
+    return history, swaps, prices
+
+
+def make_analytics_pool(indexer, max_samples):
+    pool = make_pool(app_id=1, indexer=indexer)
+    pool.analytics = PoolAnalytics(pool, max_samples=max_samples)
+    return pool
+
+
+def benchmark(n_rounds, latency):
+    rng = random.Random(1)
+    history, _, _ = simulate_history(rng, n_rounds)
+    indexer = BenchmarkIndexer(history, latency)
+    rounds = list(range(n_rounds))
+
+    pool = make_analytics_pool(indexer, n_rounds)
+    sequential_time = timeit.timeit(
+        lambda: [pool.analytics.load_samples([round_num]) for round_num in rounds],
+        number=1,
+    )
+    pool = make_analytics_pool(indexer, n_rounds)
+    concurrent_time = timeit.timeit(
+        lambda: pool.analytics.load_samples(rounds), number=1
+    )
+    repeat_time = timeit.timeit(
+        lambda: [pool.get_twap(1, 0, round_num) for round_num in rounds[1:]],
+        number=1,
+    ) / (n_rounds - 1)
+    print(
+        "%i rounds at %.0f ms latency: sequential fetch %.0f ms, concurrent fetch %.0f ms,"
+        " repeat twap query %.1f us"
+        % (
+            n_rounds,
+            1000 * latency,
+            1000 * sequential_time,
+            1000 * concurrent_time,
+            1e6 * repeat_time,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    benchmark(args.rounds, args.latency)
@@ -0,0 +1,58 @@
+"""
+Benchmark of simulating sequences of swaps on immutable pool states against copying and mutating
+a pool. Applied states matching mutated pools is covered by tests/test_pool_state.py.
+
+    python -m benchmarks.pool_state_benchmark
+"""
+
+import argparse
+import copy
+import timeit
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+
+
+def apply_to_pool(pool, quote):
+    pool.asset1_balance -= quote.asset1_delta
+    pool.asset2_balance -= quote.asset2_delta
+    pool.lp_circulation += quote.lp_delta
+
+
+def benchmark(number, n_steps):
+    for pool_type in [PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP]:
+        pool = make_pool(pool_type, 10**12, 11 * 10**11, lp_circulation="min")
+
+        def simulate_states():
+            state = pool.get_state()
+            for i in range(n_steps):
+                state = state.apply(
+                    state.get_swap_exact_for_quote(1 + i % 2, 10**9 + i)
+                )
+            return state
+
+        def simulate_copies():
+            pool_copy = copy.copy(pool)
+            for i in range(n_steps):
+                apply_to_pool(
+                    pool_copy,
+                    pool_copy.get_swap_exact_for_quote(1 + i % 2, 10**9 + i),
+                )
+            return pool_copy
+
+        state_time = timeit.timeit(simulate_states, number=number) / number
+        copy_time = timeit.timeit(simulate_copies, number=number) / number
+        print(
+            "%s: %i swaps on states %.3f ms, on a copied pool %.3f ms"
+            % (pool_type.name, n_steps, 1000 * state_time, 1000 * copy_time)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    benchmark(args.number, args.steps)
@@ -0,0 +1,184 @@
+"""
+Benchmark of following pools from their confirmed app calls against reloading every pool each
+round, over a simulated chain served by an indexer with latency. Tracked state matching the chain
+is covered by tests/test_pool_tracker.py.
+
+    python -m benchmarks.pool_tracker_benchmark
+"""
+
+import argparse
+import base64
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.pool import Pool
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.amm.v1.pool_tracker import PoolTracker
+
+from benchmarks._fixtures import BenchmarkAsset, make_pool
+
+ROUTER_APP_ID = 10**6
+# fields reloaded by Pool.load_state, amplification fields are only tracked for nanoswap pools
+FIELDS = list(Pool.series_fields.values())
+
+
+class BenchmarkChain:
+    def __init__(self, rng, app_ids, latency):
+        self.rng = rng
+        self.latency = latency
+        self.round = 1
+        # app id -> global state of the pool
+        self.states = dict(
+            [
+                (
+                    app_id,
+                    dict([(key, rng.randint(1, 10**12)) for key in FIELDS]),
+                )
+                for app_id in app_ids
+            ]
+        )
+        # (app id, round) -> confirmed transactions calling the app, also from inner app calls
+        self.transactions = {}
+        self.n_calls = 0
+        self._lock = threading.Lock()
+
+    def call(self):
+        with self._lock:
+            self.n_calls += 1
+        time.sleep(self.latency)
+
+    def get_pool_call(self, app_id):
+        # a swap, pool, burn or flash loan writes a subset of the tracked fields
+        delta = []
+        for key in self.rng.sample(FIELDS, self.rng.randint(1, 8)):
+            self.states[app_id][key] = self.rng.randint(1, 10**12)
+            value = {"action": 2, "uint": self.states[app_id][key]}
+            delta.append(
+                {"key": base64.b64encode(key.encode()).decode(), "value": value}
+            )
+        return {
+            "tx-type": "appl",
+            "application-transaction": {"application-id": app_id},
+            "global-state-delta": delta,
+        }
+
+    def advance(self, n_transactions):
+        self.round += 1
+        for offset in range(n_transactions):
+            app_ids = self.rng.sample(list(self.states), self.rng.randint(1, 3))
+            if len(app_ids) == 1:
+                transaction = self.get_pool_call(app_ids[0])
+            else:
+                # a router app calling several pools
+                transaction = {
+                    "tx-type": "appl",
+                    "application-transaction": {"application-id": ROUTER_APP_ID},
+                    "inner-txns": [self.get_pool_call(app_id) for app_id in app_ids],
+                }
+            transaction["confirmed-round"] = self.round
+            transaction["intra-round-offset"] = offset
+            transaction["round-time"] = self.round * 4
+            for app_id in app_ids:
+                self.transactions.setdefault((app_id, self.round), []).append(
+                    transaction
+                )
+
+    # indexer
+    def health(self):
+        self.call()
+        return {"round": self.round}
+
+    def block_info(self, block=None, header_only=None):
+        self.call()
+        return {"round": block, "timestamp": block * 4}
+
+    def applications(self, application_id, round_num=None):
+        self.call()
+        global_state = [
+            {
+                "key": base64.b64encode(key.encode()).decode(),
+                "value": {"type": 2, "uint": value},
+            }
+            for key, value in self.states[application_id].items()
+        ]
+        return {"application": {"params": {"global-state": global_state}}}
+
+    def search_transactions(
+        self, application_id, min_round, max_round, limit, next_page=None
+    ):
+        self.call()
+        transactions = [
+            transaction
+            for round_num in range(min_round, max_round + 1)
+            for transaction in self.transactions.get((application_id, round_num), [])
+        ]
+        offset = int(next_page or 0)
+        response = {"transactions": transactions[offset : offset + limit]}
+        if offset + limit < len(transactions):
+            response["next-token"] = str(offset + limit)
+        return response
+
+
+def make_amm_client(chain, n_pools):
+    registry = PoolRegistry(None)
+    for app_id in range(1, n_pools + 1):
+        pool = make_pool(
+            PoolType.CONSTANT_PRODUCT_25BP_FEE,
+            asset1=BenchmarkAsset(2 * app_id),
+            asset2=BenchmarkAsset(2 * app_id + 1),
+            app_id=app_id,
+            indexer=chain,
+        )
+        registry.add(pool)
+    return SimpleNamespace(indexer=chain, pool_registry=registry)
+
+
+def benchmark(n_pools, n_rounds, n_transactions, latency):
+    rng = random.Random(1)
+    chain = BenchmarkChain(rng, range(1, n_pools + 1), latency)
+    amm_client = make_amm_client(chain, n_pools)
+    tracker = PoolTracker(amm_client, reconcile_interval=n_rounds + 1)
+    tracker.poll()
+
+    n_calls = chain.n_calls
+    start = time.perf_counter()
+    for _ in range(n_rounds):
+        chain.advance(n_transactions)
+        tracker.poll()
+    poll_time = (time.perf_counter() - start) / n_rounds
+    poll_calls = (chain.n_calls - n_calls) / n_rounds
+
+    n_calls = chain.n_calls
+    start = time.perf_counter()
+    for _ in range(n_rounds):
+        chain.advance(n_transactions)
+        amm_client.pool_registry.refresh()
+    refresh_time = (time.perf_counter() - start) / n_rounds
+    refresh_calls = (chain.n_calls - n_calls) / n_rounds
+    print(
+        "%i pools, %i txns per round at %.0f ms latency: tracker %.1f ms (%.0f calls),"
+        " full reload %.1f ms (%.0f calls) per round"
+        % (
+            n_pools,
+            n_transactions,
+            1000 * latency,
+            1000 * poll_time,
+            poll_calls,
+            1000 * refresh_time,
+            refresh_calls,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pools", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--transactions", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    benchmark(args.pools, args.rounds, args.transactions, args.latency)
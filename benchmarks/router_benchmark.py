@@ -0,0 +1,102 @@
+"""
+Benchmark of multi-hop route quotes served from cached pool state. The best route matching an
+exhaustive search over chained scalar pool quotes is covered by tests/test_router.py.
+
+    python -m benchmarks.router_benchmark
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+from algofipy.router import Router
+
+from benchmarks._fixtures import BenchmarkAsset, make_pool
+
+
+def make_random_pool(app_id, pool_type, asset1_id, asset2_id, rng, engine):
+    asset1_balance = rng.randint(10**9, 10**13)
+    return make_pool(
+        pool_type,
+        asset1_balance,
+        int(asset1_balance * rng.uniform(0.5, 2)),
+        asset1=BenchmarkAsset(asset1_id),
+        asset2=BenchmarkAsset(asset2_id),
+        app_id=app_id,
+        amplification_factor=10**7,
+        stable_swap_engine=engine,
+    )
+
+
+def make_router(n_assets, n_pools, seed=0):
+    rng = random.Random(seed)
+    engine = StableSwapEngine()
+    registry = PoolRegistry(None)
+    app_id = 1
+    pairs = set()
+    # every asset trades against the first asset, plus random pairs
+    for asset_id in range(2, n_assets + 1):
+        pairs.add((1, asset_id))
+    while len(pairs) < n_pools:
+        asset1_id, asset2_id = sorted(rng.sample(range(1, n_assets + 1), 2))
+        pairs.add((asset1_id, asset2_id))
+    for asset1_id, asset2_id in sorted(pairs):
+        for pool_type in [PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP]:
+            if pool_type == PoolType.NANOSWAP and rng.random() > 0.2:
+                continue
+            registry.add(
+                make_random_pool(app_id, pool_type, asset1_id, asset2_id, rng, engine)
+            )
+            app_id += 1
+    algofi_client = SimpleNamespace(
+        amm=SimpleNamespace(pool_registry=registry),
+        interfaces=SimpleNamespace(lending_pool_interfaces={}),
+    )
+    return Router(algofi_client), registry
+
+
+def benchmark(router, n_assets, n_requests):
+    rng = random.Random(2)
+    requests = [
+        (*rng.sample(range(1, n_assets + 1), 2), rng.randint(10**3, 10**10))
+        for _ in range(n_requests)
+    ]
+    pairs = set(
+        (asset_in_id, asset_out_id) for asset_in_id, asset_out_id, _ in requests
+    )
+    start = time.perf_counter()
+    for asset_in_id, asset_out_id in pairs:
+        router.get_paths(asset_in_id, asset_out_id)
+    path_time = time.perf_counter() - start
+    mean_paths = sum(
+        len(router.get_paths(asset_in_id, asset_out_id))
+        for asset_in_id, asset_out_id in pairs
+    ) / len(pairs)
+
+    start = time.perf_counter()
+    for asset_in_id, asset_out_id, amount in requests:
+        router.get_best_route(asset_in_id, asset_out_id, amount)
+    elapsed = time.perf_counter() - start
+    print(
+        "%i pairs: path search %.2f ms per pair, %.1f paths per pair"
+        % (len(pairs), 1000 * path_time / len(pairs), mean_paths)
+    )
+    print(
+        "%i quotes from cached paths: %.3f ms per quote, %.0f quotes per second"
+        % (n_requests, 1000 * elapsed / n_requests, n_requests / elapsed)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--assets", type=int, default=30)
+    parser.add_argument("--pools", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    router, _ = make_router(args.assets, args.pools)
+    benchmark(router, args.assets, args.requests)
@@ -0,0 +1,98 @@
+"""
+Benchmark of batched historical series against loading one round at a time through an indexer
+with latency. Columns matching the state at every round is covered by tests/test_series.py.
+
+    python -m benchmarks.series_benchmark
+"""
+
+import argparse
+import base64
+import random
+import threading
+import time
+import timeit
+
+from algofipy.lending.v2.lending_client import LendingClient
+from algofipy.lending.v2.market import Market
+from algofipy.state_utils import get_global_state
+
+
+class BenchmarkIndexer:
+    def __init__(self, states, latency):
+        # (app id, round) -> global state dict
+        self.states = states
+        self.latency = latency
+        self.n_calls = 0
+        self._lock = threading.Lock()
+
+    def applications(self, application_id, round_num=None):
+        with self._lock:
+            self.n_calls += 1
+        time.sleep(self.latency)
+        global_state = [
+            {
+                "key": base64.b64encode(key.encode()).decode(),
+                "value": {"type": 2, "uint": value},
+            }
+            for key, value in self.states[(application_id, round_num)].items()
+        ]
+        return {"application": {"params": {"global-state": global_state}}}
+
+
+def make_states(rng, app_ids, rounds, fields):
+    return dict(
+        [
+            (
+                (app_id, round_num),
+                dict([(key, rng.randint(0, 2**62)) for key in fields.values()]),
+            )
+            for app_id in app_ids
+            for round_num in rounds
+        ]
+    )
+
+
+def make_lending_client(app_ids, indexer):
+    lending_client = LendingClient.__new__(LendingClient)
+    lending_client.historical_indexer = indexer
+    lending_client.markets = {}
+    for app_id in app_ids:
+        market = Market.__new__(Market)
+        market.app_id = app_id
+        market.lending_client = lending_client
+        lending_client.markets[app_id] = market
+    return lending_client
+
+
+def benchmark(n_markets, n_rounds, latency):
+    rng = random.Random(1)
+    app_ids = list(range(1, n_markets + 1))
+    rounds = list(range(10**7, 10**7 + n_rounds * 20000, 20000))
+    states = make_states(rng, app_ids, rounds, Market.series_fields)
+    indexer = BenchmarkIndexer(states, latency)
+
+    def load_serially():
+        # one historical global state lookup per market and round
+        for app_id in app_ids:
+            for round_num in rounds:
+                get_global_state(
+                    indexer, app_id, decode_byte_values=False, block=round_num
+                )
+
+    lending_client = make_lending_client(app_ids, indexer)
+    serial_time = timeit.timeit(load_serially, number=1)
+    batch_time = timeit.timeit(lambda: lending_client.load_series(rounds), number=1)
+    print(
+        "%i markets x %i rounds at %.0f ms latency: serial %.2f s, load_series %.2f s"
+        % (n_markets, n_rounds, 1000 * latency, serial_time, batch_time)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--markets", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    benchmark(args.markets, args.rounds, args.latency)
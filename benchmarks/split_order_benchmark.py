@@ -0,0 +1,107 @@
+"""
+Benchmark of splitting an order across parallel pools trading the same pair. The split output
+beating the best single pool and a grid search over splits is covered by tests/test_split_order.py.
+
+    python -m benchmarks.split_order_benchmark
+"""
+
+import argparse
+import random
+import timeit
+from types import SimpleNamespace
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+from algofipy.router import Router
+
+from benchmarks._fixtures import make_pool
+
+
+def make_router(balances):
+    engine = StableSwapEngine()
+    registry = PoolRegistry(None)
+    pool_types = [
+        (PoolType.CONSTANT_PRODUCT_25BP_FEE, 0.0025),
+        (PoolType.CONSTANT_PRODUCT_75BP_FEE, 0.0075),
+        (PoolType.NANOSWAP, 0.0001),
+    ]
+    for app_id, ((pool_type, swap_fee), (asset1_balance, asset2_balance)) in enumerate(
+        zip(pool_types, balances)
+    ):
+        registry.add(
+            make_pool(
+                pool_type,
+                asset1_balance,
+                asset2_balance,
+                app_id=app_id + 1,
+                swap_fee=swap_fee,
+                stable_swap_engine=engine,
+            )
+        )
+    algofi_client = SimpleNamespace(
+        amm=SimpleNamespace(pool_registry=registry),
+        interfaces=SimpleNamespace(lending_pool_interfaces={}),
+    )
+    return Router(algofi_client), list(registry)
+
+
+def make_random_balances(rng):
+    balance = rng.randint(10**9, 10**12)
+    return [
+        (balance, int(balance * rng.uniform(0.9, 1.1))),
+        (
+            balance * rng.randint(1, 5),
+            int(balance * rng.uniform(0.9, 1.1)) * rng.randint(1, 5),
+        ),
+        (
+            balance // rng.randint(1, 10),
+            int(balance * rng.uniform(0.9, 1.1)) // rng.randint(1, 10),
+        ),
+    ]
+
+
+def get_output(pool, amount):
+    if amount == 0:
+        return 0
+    return pool.get_swap_exact_for_quote(1, amount).asset2_delta
+
+
+def benchmark(number):
+    # comparable depth in every pool, so the order is spread across all of them
+    router, pools = make_router(
+        [
+            (10**11, 10**11),
+            (3 * 10**11, 3 * 10**11),
+            (2 * 10**10, 2 * 10**10),
+        ]
+    )
+    amount = 10**10
+    for n_chunks in [20, 100, 500]:
+        elapsed = (
+            timeit.timeit(
+                lambda: router.get_split_order(1, 2, amount, n_chunks=n_chunks),
+                number=number,
+            )
+            / number
+        )
+        split_order = router.get_split_order(1, 2, amount, n_chunks=n_chunks)
+        best_single = max(get_output(pool, amount) for pool in pools)
+        print(
+            "%i chunks: %.2f ms, output %i vs best single pool %i (+%.2f%%)"
+            % (
+                n_chunks,
+                1000 * elapsed,
+                split_order.amount_out,
+                best_single,
+                100 * (split_order.amount_out / best_single - 1),
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    benchmark(args.number)
@@ -0,0 +1,98 @@
+"""
+Benchmark of nanoswap quotes with the memoizing :class:`StableSwapEngine` against the
+unmemoized scalar quote path. Batch quotes matching the scalar quotes is covered by
+tests/test_stable_swap_engine.py.
+
+    python -m benchmarks.stable_swap_benchmark
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+
+from benchmarks._fixtures import make_pool
+
+
+def make_nanoswap_pool(
+    asset1_balance,
+    asset2_balance,
+    amplification_factor,
+    swap_fee=0.0001,
+    stable_swap_engine=None,
+):
+    return make_pool(
+        PoolType.NANOSWAP,
+        asset1_balance,
+        asset2_balance,
+        swap_fee=swap_fee,
+        amplification_factor=amplification_factor,
+        stable_swap_engine=stable_swap_engine,
+    )
+
+
+def warm_start_stats(n_amounts):
+    engine = StableSwapEngine()
+    balances = [10**12, 11 * 10**11]
+    amplification_factor = 10**7
+    xs = [
+        balances[0] + x for x in np.linspace(10**6, 10**11, n_amounts).astype(int)
+    ]
+    _, _, cold = engine.get_y_batch(0, 1, xs, balances, amplification_factor)
+    engine.clear()
+    _, _, warm = engine.get_y_batch(
+        0, 1, xs, balances, amplification_factor, warm_start=True
+    )
+    max_y_diff = max(abs(c[0] - w[0]) for (c, w) in zip(cold, warm))
+    print(
+        "warm start: mean y iterations %.2f -> %.2f, max y difference %i"
+        % (
+            sum(c[1] for c in cold) / n_amounts,
+            sum(w[1] for w in warm) / n_amounts,
+            max_y_diff,
+        )
+    )
+
+
+def benchmark(n_amounts, number):
+    amounts = [int(x) for x in np.linspace(10**6, 10**11, n_amounts)]
+
+    def scalar():
+        pool = make_nanoswap_pool(
+            10**12,
+            11 * 10**11,
+            10**7,
+            stable_swap_engine=StableSwapEngine(cache_size=0),
+        )
+        [pool.get_swap_exact_for_quote(1, amount) for amount in amounts]
+
+    def batch():
+        pool = make_nanoswap_pool(10**12, 11 * 10**11, 10**7)
+        pool.get_swap_exact_for_quotes(1, amounts)
+
+    def repeat():
+        # quotes repeated against an unchanged pool state are served from memory
+        pool = make_nanoswap_pool(10**12, 11 * 10**11, 10**7)
+        for _ in range(2):
+            [pool.get_swap_exact_for_quote(1, amount) for amount in amounts]
+
+    scalar_time = timeit.timeit(scalar, number=number) / number
+    batch_time = timeit.timeit(batch, number=number) / number
+    repeat_time = timeit.timeit(repeat, number=number) / number
+    print(
+        "%i amounts: scalar %.2f ms, batch %.2f ms, scalar x2 memoized %.2f ms"
+        % (n_amounts, 1000 * scalar_time, 1000 * batch_time, 1000 * repeat_time)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--amounts", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    warm_start_stats(args.amounts)
+    benchmark(args.amounts, args.number)
@@ -0,0 +1,101 @@
+"""
+Benchmark of the two asset stableswap solvers against the generic N asset solvers, and of the
+iterations saved by starting from the closed form guesses. Equality with the generic solvers is
+tested in tests/test_stable_swap_math.py.
+
+    python -m benchmarks.stable_swap_math_benchmark
+"""
+
+import argparse
+import random
+import timeit
+
+from algofipy.amm.v1.stable_swap_math import (
+    get_D_2,
+    get_D_initial_2,
+    get_D_n,
+    get_y_2,
+    get_y_initial_2,
+    get_y_n,
+)
+
+
+def make_cases(n_cases, seed=0):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n_cases):
+        x0 = rng.randint(10**3, 10**15)
+        ratio = rng.choice([rng.uniform(0.9, 1.1), rng.uniform(0.01, 100)])
+        x1 = max(int(x0 * ratio), 1)
+        amp = rng.choice([10**5, 10**6, 10**7, 10**8, 10**9])
+        x = rng.randint(1, x0 * 2)
+        cases.append((x0, x1, amp, x))
+    return cases
+
+
+def mean_iterations(cases):
+    D_iter, D_guessed_iter, y_iter, y_guessed_iter = 0, 0, 0, 0
+    for x0, x1, amp, x in cases:
+        D, n = get_D_2(x0, x1, amp)
+        D_iter += n
+        D_guessed_iter += get_D_2(x0, x1, amp, D_initial=get_D_initial_2(x0, x1, amp))[
+            1
+        ]
+        y_iter += get_y_2(x, D, amp)[1]
+        y_guessed_iter += get_y_2(x, D, amp, y_initial=get_y_initial_2(x, D, amp))[1]
+    n_cases = len(cases)
+    return (
+        D_iter / n_cases,
+        D_guessed_iter / n_cases,
+        y_iter / n_cases,
+        y_guessed_iter / n_cases,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = make_cases(args.cases)
+
+    D_iter, D_guessed_iter, y_iter, y_guessed_iter = mean_iterations(cases)
+    print(
+        "mean D iterations: on-chain guess %.2f, cubic guess %.2f"
+        % (D_iter, D_guessed_iter)
+    )
+    print(
+        "mean y iterations: on-chain guess %.2f, quadratic guess %.2f"
+        % (y_iter, y_guessed_iter)
+    )
+
+    Ds = [get_D_2(x0, x1, amp)[0] for x0, x1, amp, _ in cases]
+
+    def run(get_D, get_y):
+        for (x0, x1, amp, x), D in zip(cases, Ds):
+            get_D(x0, x1, amp)
+            get_y(x, D, amp)
+
+    solvers = {
+        "generic": (
+            lambda x0, x1, amp: get_D_n([x0, x1], amp),
+            lambda x, D, amp: get_y_n(0, 1, x, [0, 0], D, amp),
+        ),
+        "two asset": (get_D_2, get_y_2),
+        "two asset, guessed": (
+            lambda x0, x1, amp: get_D_2(
+                x0, x1, amp, D_initial=get_D_initial_2(x0, x1, amp)
+            ),
+            lambda x, D, amp: get_y_2(x, D, amp, y_initial=get_y_initial_2(x, D, amp)),
+        ),
+    }
+    for name, (get_D, get_y) in solvers.items():
+        elapsed = min(
+            timeit.repeat(lambda: run(get_D, get_y), number=1, repeat=args.repeat)
+        )
+        print("%-20s %8.2f ms" % (name, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark of the max swap size solver against a bisection over scalar quotes. Solved bounds
+meeting their ratio exactly is covered by tests/test_swap_bounds.py.
+
+    python -m benchmarks.swap_bounds_benchmark
+"""
+
+import argparse
+import timeit
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+
+
+def get_swap_out_amount(pool, swap_in_asset_id, swap_in_amount):
+    if swap_in_amount == 0:
+        return 0
+    quote = pool.get_swap_exact_for_quote(swap_in_asset_id, swap_in_amount)
+    return quote.asset2_delta if swap_in_asset_id == 1 else quote.asset1_delta
+
+
+def meets(pool, swap_in_asset_id, swap_in_amount, min_output_ratio):
+    return (
+        get_swap_out_amount(pool, swap_in_asset_id, swap_in_amount)
+        >= min_output_ratio * swap_in_amount
+    )
+
+
+def bisect_max_swap_in_amount(pool, swap_in_asset_id, min_output_ratio):
+    # the hand-rolled search the solver replaces
+    low, high = 0, 10 * max(pool.asset1_balance, pool.asset2_balance)
+    while high - low > 1:
+        mid = (low + high) // 2
+        if meets(pool, swap_in_asset_id, mid, min_output_ratio):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def benchmark(number):
+    max_slippages = [0.001 * (i + 1) for i in range(20)]
+    for pool_type in [PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP]:
+        pool = make_pool(
+            pool_type, 10**12, 11 * 10**11, amplification_factor=10**7
+        )
+        spot_swap_rate = pool.get_spot_swap_rate(1)
+        min_output_ratio = spot_swap_rate * (1 - 0.01)
+
+        def solve():
+            pool.stable_swap_engine.clear()
+            pool.get_max_swap_in_amount(1, max_slippage=0.01)
+
+        def bisect():
+            pool.stable_swap_engine.clear()
+            bisect_max_swap_in_amount(pool, 1, min_output_ratio)
+
+        def solve_batch():
+            pool.stable_swap_engine.clear()
+            pool.get_max_swap_in_amounts(1, max_slippages=max_slippages)
+
+        solve_time = timeit.timeit(solve, number=number) / number
+        bisect_time = timeit.timeit(bisect, number=number) / number
+        batch_time = timeit.timeit(solve_batch, number=number) / number
+        print(
+            "%s: solver %.3f ms, bisection %.3f ms, batch of %i bounds %.3f ms"
+            % (
+                pool_type.name,
+                1000 * solve_time,
+                1000 * bisect_time,
+                len(max_slippages),
+                1000 * batch_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    benchmark(args.number)
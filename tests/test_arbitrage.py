@@ -0,0 +1,224 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PARAMETER_SCALE_FACTOR, PoolType
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+from algofipy.arbitrage import ArbitrageScanner
+from algofipy.router import Router
+
+from benchmarks._fixtures import BenchmarkAsset, make_pool
+
+N_STABLE_ASSETS = 3
+# pools lend up to a tenth of their balance
+MAX_FLASH_LOAN_RATIO = 100000
+
+
+def make_client(rng, n_assets, n_pools, mispricing):
+    engine = StableSwapEngine()
+    registry = PoolRegistry(None)
+    # the first assets are stable and also traded in nanoswap pools
+    prices = dict(
+        [
+            (asset_id, 1.0 if asset_id <= N_STABLE_ASSETS else rng.uniform(0.01, 100))
+            for asset_id in range(1, n_assets + 1)
+        ]
+    )
+    app_id = 0
+    while len(registry) < n_pools:
+        asset1_id, asset2_id = sorted(rng.sample(range(1, n_assets + 1), 2))
+        pool_types = [
+            PoolType.CONSTANT_PRODUCT_25BP_FEE,
+            PoolType.CONSTANT_PRODUCT_75BP_FEE,
+        ]
+        if asset2_id <= N_STABLE_ASSETS:
+            pool_types.append(PoolType.NANOSWAP)
+        liquidity = rng.randint(10**9, 10**12)
+        app_id += 1
+        registry.add(
+            make_pool(
+                rng.choice(pool_types),
+                int(
+                    liquidity
+                    / prices[asset1_id]
+                    * rng.uniform(1 - mispricing, 1 + mispricing)
+                ),
+                int(liquidity / prices[asset2_id]),
+                asset1=BenchmarkAsset(asset1_id),
+                asset2=BenchmarkAsset(asset2_id),
+                app_id=app_id,
+                flash_loan_fee=1000,
+                max_flash_loan_ratio=MAX_FLASH_LOAN_RATIO,
+                stable_swap_engine=engine,
+            )
+        )
+    algofi_client = SimpleNamespace(
+        amm=SimpleNamespace(pool_registry=registry),
+        interfaces=SimpleNamespace(lending_pool_interfaces={}),
+    )
+    algofi_client.router = Router(algofi_client)
+    return algofi_client
+
+
+def get_lightest_cycles(scanner):
+    # exhaustive search over simple cycles, lightest negative cycle starting at each asset
+    lightest = {}
+    graph = scanner.algofi_client.router.graph
+
+    def search(asset_id, source_id, visited, weight, n_hops):
+        for hop in graph.get(asset_id, []):
+            hop_weight = weight + scanner.weights[hop]
+            if hop.asset_out_id == source_id:
+                if hop_weight < lightest.get(source_id, 0):
+                    lightest[source_id] = hop_weight
+            elif hop.asset_out_id not in visited and n_hops + 1 < scanner.max_hops:
+                visited.add(hop.asset_out_id)
+                search(hop.asset_out_id, source_id, visited, hop_weight, n_hops + 1)
+                visited.remove(hop.asset_out_id)
+
+    for asset_id in graph:
+        search(asset_id, asset_id, set([asset_id]), 0.0, 0)
+    return lightest
+
+
+def get_cycle_set(scanner):
+    return set(
+        [
+            tuple((hop.venue.application_id, hop.asset_in_id) for hop in cycle)
+            for cycle in scanner.get_cycles()
+        ]
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_cycles_match_exhaustive_search(seed):
+    algofi_client = make_client(random.Random(seed), 10, 30, 0.02)
+    scanner = ArbitrageScanner(algofi_client)
+    cycles = scanner.get_cycles()
+    for cycle in cycles:
+        assert cycle[0].asset_in_id == cycle[-1].asset_out_id
+        assert scanner.get_cycle_weight(cycle) < 0
+
+    lightest = get_lightest_cycles(scanner)
+    assert set(lightest) == set([cycle[0].asset_in_id for cycle in cycles])
+    for asset_id, weight in lightest.items():
+        found = min(
+            [scanner.get_cycle_weight(cycle) for cycle in scanner.cycles[asset_id]]
+        )
+        assert found == pytest.approx(weight, abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_update_matches_scan_from_scratch(seed):
+    rng = random.Random(seed)
+    algofi_client = make_client(rng, 10, 30, 0.02)
+    scanner = ArbitrageScanner(algofi_client)
+    scanner.update()
+    for _ in range(3):
+        for pool in rng.sample(list(algofi_client.amm.pool_registry), 2):
+            pool.asset1_balance = int(pool.asset1_balance * rng.uniform(0.98, 1.02))
+        scanner.update()
+        assert get_cycle_set(scanner) == get_cycle_set(ArbitrageScanner(algofi_client))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_opportunities_are_optimal_within_flash_loan_limit(seed):
+    algofi_client = make_client(random.Random(seed), 10, 30, 0.02)
+    scanner = ArbitrageScanner(algofi_client)
+    router = algofi_client.router
+    for opportunity in scanner.get_opportunities():
+        flash_loan_pool = opportunity.flash_loan_pool
+        max_amount = scanner.get_max_flash_loan_amount(
+            flash_loan_pool, opportunity.asset_id
+        )
+        assert opportunity.profit > 0
+        assert 0 < opportunity.amount <= max_amount
+        assert flash_loan_pool not in [hop.venue for hop in opportunity.route.hops]
+        for scale in [0.9, 1.1]:
+            amount = min(int(opportunity.amount * scale), max_amount)
+            route = router.quote_path(opportunity.route.hops, amount)
+            if route is None:
+                continue
+            flash_loan_fee = (
+                amount * flash_loan_pool.flash_loan_fee
+            ) // PARAMETER_SCALE_FACTOR + 1
+            # rounding leaves the profit flat and noisy near the optimum
+            assert (
+                route.amount_out - amount - flash_loan_fee
+                <= opportunity.profit * 1.001 + 2
+            )
+
+
+def make_triangle_client(lenders):
+    # asset 3 is cheap in the pool against asset 1, borrowing asset 1 is profitable
+    registry = PoolRegistry(None)
+    for app_id, (asset1_id, asset2_id, balance1, balance2) in enumerate(
+        [
+            (1, 2, 10**12, 10**12),
+            (2, 3, 10**12, 10**12),
+            (1, 3, 10**12, 11 * 10**11),
+        ]
+    ):
+        registry.add(
+            make_pool(
+                PoolType.CONSTANT_PRODUCT_25BP_FEE,
+                balance1,
+                balance2,
+                asset1=BenchmarkAsset(asset1_id),
+                asset2=BenchmarkAsset(asset2_id),
+                app_id=app_id + 1,
+            )
+        )
+    # pools lending asset 1 outside the cycle, by balance and max flash loan ratio
+    for app_id, (balance, max_flash_loan_ratio) in enumerate(lenders):
+        registry.add(
+            make_pool(
+                PoolType.CONSTANT_PRODUCT_25BP_FEE,
+                balance,
+                balance,
+                asset1=BenchmarkAsset(1),
+                asset2=BenchmarkAsset(10 + app_id),
+                app_id=10 + app_id,
+                flash_loan_fee=1000,
+                max_flash_loan_ratio=max_flash_loan_ratio,
+            )
+        )
+    algofi_client = SimpleNamespace(
+        amm=SimpleNamespace(pool_registry=registry),
+        interfaces=SimpleNamespace(lending_pool_interfaces={}),
+    )
+    algofi_client.router = Router(algofi_client)
+    return algofi_client
+
+
+def test_flash_loan_pool_chosen_by_max_flash_loan_amount():
+    # the deepest pool lends less than a shallower pool with a higher ratio
+    algofi_client = make_triangle_client([(10**14, 1000), (10**13, 100000)])
+    scanner = ArbitrageScanner(algofi_client)
+    [opportunity] = scanner.get_opportunities()
+    assert opportunity.asset_id == 1
+    assert opportunity.flash_loan_pool.application_id == 11
+
+    # pools lending nothing are never borrowed from
+    algofi_client = make_triangle_client([(10**14, 0)])
+    assert ArbitrageScanner(algofi_client).get_opportunities() == []
+
+
+def test_flash_loan_capped_at_max_flash_loan_amount():
+    algofi_client = make_triangle_client([(10**13, 100000)])
+    uncapped = ArbitrageScanner(algofi_client).get_opportunities()[0]
+
+    # a cap below the most profitable amount binds
+    max_amount = uncapped.amount // 4
+    algofi_client = make_triangle_client(
+        [(10**13, max_amount * PARAMETER_SCALE_FACTOR // 10**13)]
+    )
+    scanner = ArbitrageScanner(algofi_client)
+    [opportunity] = scanner.get_opportunities()
+    cap = scanner.get_max_flash_loan_amount(opportunity.flash_loan_pool, 1)
+    assert cap <= max_amount
+    # profit still rises at the cap, rounding leaves it flat over a few base units
+    assert cap * 0.999 < opportunity.amount <= cap
+    assert 0 < opportunity.profit < uncapped.profit
@@ -0,0 +1,87 @@
+import pytest
+
+from algofipy.archive import ArchiveIndexer
+
+
+class Indexer:
+    def __init__(self):
+        self.n_calls = 0
+
+    def applications(self, application_id, round_num=None):
+        self.n_calls += 1
+        return {"application": {"id": application_id, "round": round_num}}
+
+    def account_info(self, address, round_num=None):
+        self.n_calls += 1
+        return {
+            "account": {
+                "address": address,
+                "round": round_num,
+                "assets": [],
+                "apps-local-state": [],
+            }
+        }
+
+    def health(self):
+        return {"round": 100}
+
+
+def test_lookups_are_written_through(tmp_path):
+    indexer = Indexer()
+    archive = ArchiveIndexer(str(tmp_path), fallback=indexer)
+    response = archive.applications(1, round_num=10)
+    assert response == indexer.applications(1, round_num=10)
+    assert archive.applications(1, round_num=10) == response
+    assert indexer.n_calls == 2
+    assert archive.get_rounds("applications", 1) == [10]
+
+    # a new archive over the same directory serves the round from disk
+    archive = ArchiveIndexer(str(tmp_path))
+    assert archive.applications(1, round_num=10) == response
+
+
+def test_current_state_is_fetched(tmp_path):
+    indexer = Indexer()
+    archive = ArchiveIndexer(str(tmp_path), fallback=indexer)
+    archive.applications(1)
+    archive.applications(1)
+    assert indexer.n_calls == 2
+    assert archive.get_rounds("applications", 1) == []
+    # other calls are served by the fallback
+    assert archive.health() == {"round": 100}
+    with pytest.raises(AttributeError):
+        ArchiveIndexer(str(tmp_path)).health()
+
+
+def test_missing_round_raises(tmp_path):
+    ArchiveIndexer(str(tmp_path), fallback=Indexer()).applications(1, round_num=10)
+    archive = ArchiveIndexer(str(tmp_path))
+    assert archive.applications(1, round_num=10)["application"]["round"] == 10
+    for round_num in [5, 11]:
+        with pytest.raises(Exception, match="not archived at round"):
+            archive.applications(1, round_num=round_num)
+    with pytest.raises(Exception, match="not archived at round"):
+        archive.applications(2, round_num=10)
+
+
+def test_nearest_earlier_round(tmp_path):
+    writer = ArchiveIndexer(str(tmp_path), fallback=Indexer())
+    for round_num in [10, 20]:
+        writer.applications(1, round_num=round_num)
+    archive = ArchiveIndexer(str(tmp_path), nearest_earlier=True)
+    assert archive.applications(1, round_num=10)["application"]["round"] == 10
+    assert archive.applications(1, round_num=15)["application"]["round"] == 10
+    assert archive.applications(1, round_num=25)["application"]["round"] == 20
+    with pytest.raises(Exception, match="not archived at or before round"):
+        archive.applications(1, round_num=5)
+
+
+def test_account_exclude(tmp_path):
+    archive = ArchiveIndexer(str(tmp_path), fallback=Indexer())
+    archive.account_info("A", round_num=10)
+    archive = ArchiveIndexer(str(tmp_path))
+    account = archive.account_info("A", round_num=10, exclude="assets")["account"]
+    assert "assets" not in account
+    assert "apps-local-state" in account
+    # the full account stays archived
+    assert "assets" in archive.account_info("A", round_num=10)["account"]
@@ -0,0 +1,64 @@
+import copy
+import pickle
+import random
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+from benchmarks.balance_delta_benchmark import EagerBalanceDelta
+
+
+def get_fields(quote):
+    return (
+        quote.asset1_delta,
+        quote.asset2_delta,
+        quote.lp_delta,
+        quote.num_iter,
+        quote.extra_compute_fee,
+        quote.price_delta,
+    )
+
+
+def make_random_pool(rng):
+    pool_type = rng.choice([PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP])
+    balance = rng.randint(10**6, 10**13)
+    return make_pool(
+        pool_type, balance, int(balance * rng.uniform(0.5, 2)), lp_circulation="min"
+    )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_lazy_balance_deltas_match_eager(seed):
+    rng = random.Random(seed)
+    pool = make_random_pool(rng)
+    amounts = [rng.randint(1, pool.asset1_balance // 10) for _ in range(20)]
+    for swap_in_asset_id in [1, 2]:
+        batch = pool.get_swap_exact_for_quotes(swap_in_asset_id, amounts)
+        for k, amount in enumerate(amounts):
+            quote = pool.get_swap_exact_for_quote(swap_in_asset_id, amount)
+            eager = EagerBalanceDelta(
+                pool,
+                quote.asset1_delta,
+                quote.asset2_delta,
+                quote.lp_delta,
+                quote.num_iter,
+            )
+            assert get_fields(quote) == get_fields(eager)
+            assert batch.price_delta[k] == quote.price_delta
+            assert batch.extra_compute_fee[k] == quote.extra_compute_fee
+
+
+def test_balance_delta_is_read_only_and_copyable():
+    pool = make_random_pool(random.Random(0))
+    quote = pool.get_pool_quote(1, 10**5)
+    assert quote.price_delta == 0
+    for copied in [
+        copy.copy(quote),
+        copy.deepcopy(quote),
+        pickle.loads(pickle.dumps(quote)),
+    ]:
+        assert get_fields(copied) == get_fields(quote)
+    with pytest.raises(AttributeError):
+        quote.asset1_delta = 0
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+
+
+def assert_quotes_match(batch, i, quote):
+    assert quote.asset1_delta == batch.asset1_delta[i]
+    assert quote.asset2_delta == batch.asset2_delta[i]
+    assert quote.price_delta == batch.price_delta[i]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_batch_quotes_match_scalar_quotes(seed):
+    rng = random.Random(seed)
+    # mix of int64-safe and big int pools
+    bits = rng.choice([20, 40, 52, 62, 80])
+    pool = make_pool(
+        PoolType.CONSTANT_PRODUCT_25BP_FEE,
+        rng.randint(1, 2**bits),
+        rng.randint(1, 2**bits),
+        swap_fee=rng.randint(0, 10000) / 1e6,
+    )
+    amounts = [rng.randint(0, 2 ** rng.randint(1, bits)) for _ in range(50)]
+    for swap_in_asset_id in [1, 2]:
+        batch = pool.get_swap_exact_for_quotes(swap_in_asset_id, amounts)
+        for i, amount in enumerate(amounts):
+            quote = pool.get_swap_exact_for_quote(swap_in_asset_id, amount)
+            assert_quotes_match(batch, i, quote)
+
+        out_balance = (
+            pool.asset2_balance if swap_in_asset_id == 1 else pool.asset1_balance
+        )
+        out_amounts = [amount % out_balance for amount in amounts]
+        swap_out_asset_id = 3 - swap_in_asset_id
+        batch = pool.get_swap_for_exact_quotes(swap_out_asset_id, out_amounts)
+        for i, amount in enumerate(out_amounts):
+            quote = pool.get_swap_for_exact_quote(swap_out_asset_id, amount)
+            assert_quotes_match(batch, i, quote)
@@ -0,0 +1,25 @@
+import json
+
+import msgpack
+import pytest
+
+from algofipy.decoding import DecodeBackend, Decoder, FastDecoder, get_decoder
+
+from benchmarks.decoding_benchmark import synthetic_page
+
+
+@pytest.mark.parametrize("decoder", [Decoder(), FastDecoder()])
+def test_backends_decode_identical_objects(decoder):
+    page = synthetic_page(n_accounts=100)
+    assert decoder.loads(page) == json.loads(page)
+    block = {"block": {"ts": 1, "txns": [{"txn": {"note": b"\x00\xff"}}]}}
+    assert decoder.loads_msgpack(msgpack.packb(block)) == block
+
+
+def test_get_decoder():
+    assert get_decoder(DecodeBackend.JSON).name == DecodeBackend.JSON
+    assert get_decoder(DecodeBackend.FAST).name == DecodeBackend.FAST
+    decoder = FastDecoder()
+    assert get_decoder(decoder) is decoder
+    with pytest.raises(Exception, match="Unsupported decode backend"):
+        get_decoder("xml")
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+
+
+def make_random_pool(rng):
+    pool_type = rng.choice([PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP])
+    balance = rng.randint(10**8, 10**13)
+    return make_pool(
+        pool_type,
+        balance,
+        int(balance * rng.uniform(0.5, 2)),
+        amplification_factor=10**7,
+    )
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_depth_table_matches_exact_quotes(seed):
+    rng = random.Random(seed)
+    pool = make_random_pool(rng)
+    for swap_in_asset_id in [1, 2]:
+        depth_table = pool.get_depth_table(swap_in_asset_id)
+        assert pool.get_depth_table(swap_in_asset_id) is depth_table
+        # lookups beyond the largest tabulated size are clamped
+        max_amount = int(depth_table.swap_in_amounts[-1])
+        for ratio in [1e-4, 1e-3, 1e-2, 1e-1, 0.9]:
+            amount = int(max_amount * ratio * rng.uniform(0.5, 1.1))
+            quote = pool.get_swap_exact_for_quote(swap_in_asset_id, amount)
+            impact = depth_table.get_price_delta(amount)
+            assert abs(impact - quote.price_delta) / quote.price_delta < 0.01
+        for price_delta in [0.001, 0.01, 0.05]:
+            if price_delta > depth_table.price_deltas[-1]:
+                continue
+            amount = depth_table.get_swap_in_amount(price_delta)
+            quote = pool.get_swap_exact_for_quote(swap_in_asset_id, amount)
+            assert abs(quote.price_delta - price_delta) / price_delta < 0.01
+
+
+def test_balance_changes_invalidate_depth_tables():
+    pool = make_random_pool(random.Random(0))
+    depth_table = pool.get_depth_table(1)
+    assert depth_table.is_valid(pool)
+    pool.asset1_balance += 1
+    assert not depth_table.is_valid(pool)
+    assert pool.get_depth_table(1) is not depth_table
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+from algosdk import logic
+
+from algofipy.amm.v1.amm_config import (
+    MAINNET_NANOSWAP_POOLS_ASSET_PAIR_TO_APP_ID,
+    Network,
+    PoolType,
+    get_validator_index,
+)
+from algofipy.amm.v1.logic_sig_generator import (
+    generate_logic_sig,
+    get_logic_sig_address,
+    get_logic_sig_addresses,
+)
+
+from benchmarks.logic_sig_benchmark import (
+    MANAGER_APP_ID,
+    POOL_TYPES,
+    generate_logic_sig_by_concatenation,
+    make_amm_client,
+    make_pairs,
+)
+
+
+@pytest.mark.parametrize("pool_type", POOL_TYPES)
+def test_addresses_match_algosdk(pool_type):
+    pairs = make_pairs(random.Random(0), 500)
+    validator_index = get_validator_index(Network.MAINNET, pool_type)
+    addresses = get_logic_sig_addresses(pairs, MANAGER_APP_ID, validator_index)
+    for (asset1_id, asset2_id), address in zip(pairs, addresses):
+        program = generate_logic_sig_by_concatenation(
+            asset1_id, asset2_id, MANAGER_APP_ID, validator_index
+        )
+        assert (
+            generate_logic_sig(asset1_id, asset2_id, MANAGER_APP_ID, validator_index)
+            == program
+        )
+        assert address == logic.address(program)
+        assert address == get_logic_sig_address(
+            asset1_id, asset2_id, MANAGER_APP_ID, validator_index
+        )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pool_existence_matches_address_index(seed):
+    rng = random.Random(seed)
+    pairs = make_pairs(rng, 200)
+    # pools exist for a random subset of pairs and pool types
+    on_chain = set(
+        [
+            (pool_type, pair)
+            for pair in pairs
+            for pool_type in POOL_TYPES
+            if rng.random() < 0.3
+        ]
+    )
+    amm_client = make_amm_client(
+        set(
+            [
+                get_logic_sig_address(
+                    pair[0],
+                    pair[1],
+                    MANAGER_APP_ID,
+                    get_validator_index(Network.MAINNET, pool_type),
+                )
+                for (pool_type, pair) in on_chain
+            ]
+        )
+    )
+    for pool_type in POOL_TYPES:
+        # pairs are checked in either order
+        candidates = [(pair[1], pair[0]) for pair in pairs]
+        existing = amm_client.get_existing_pairs(pool_type, candidates)
+        assert existing == [pair for pair in pairs if (pool_type, pair) in on_chain]
+        for pair in pairs[:50]:
+            assert amm_client.pool_exists(pool_type, *pair) == (
+                (pool_type, pair) in on_chain
+            )
+    for pair in MAINNET_NANOSWAP_POOLS_ASSET_PAIR_TO_APP_ID:
+        assert amm_client.pool_exists(PoolType.NANOSWAP, pair[1], pair[0])
+    assert not amm_client.pool_exists(PoolType.NANOSWAP, *pairs[0])
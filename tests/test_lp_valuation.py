@@ -0,0 +1,53 @@
+import math
+import random
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+from benchmarks.lp_valuation_benchmark import make_amm_client, make_pools
+
+
+def get_pool_value(pool, prices):
+    # dollar value of one LP token from dollar prices of whole tokens
+    pool_value = (
+        pool.asset1_balance / 10**pool.asset1.decimals * prices[pool.asset1.asset_id]
+        + pool.asset2_balance
+        / 10**pool.asset2.decimals
+        * prices[pool.asset2.asset_id]
+    )
+    return pool_value / (pool.lp_circulation / 10**pool.lp_asset.decimals)
+
+
+def test_lp_token_prices_match_pool_value():
+    markets, pools, prices = make_pools(random.Random(0), 80)
+    amm_client = make_amm_client(markets, pools)
+
+    lp_prices = amm_client.lp_valuation.get_lp_token_prices()
+    assert set(lp_prices) == set([pool.lp_asset_id for pool in pools])
+    for pool in pools:
+        expected = get_pool_value(pool, prices)
+        # balances are rounded to base units, pool derived prices compound the rounding
+        assert math.isclose(lp_prices[pool.lp_asset_id], expected, rel_tol=1e-4)
+        assert math.isclose(pool.get_lp_token_price(), expected, rel_tol=1e-4)
+        # given prices override market and pool derived prices
+        assert math.isclose(
+            pool.get_lp_token_price(prices=prices), expected, rel_tol=1e-9
+        )
+
+
+def test_unpriced_pools_are_left_out():
+    markets, pools, _ = make_pools(random.Random(0), 8)
+    # assets paired with no priced asset
+    unpriced = make_pool(
+        PoolType.CONSTANT_PRODUCT_25BP_FEE,
+        10**9,
+        10**9,
+        app_id=3,
+        lp_circulation="sqrt",
+    )
+    amm_client = make_amm_client(markets, pools + [unpriced])
+    assert unpriced.lp_asset_id not in amm_client.lp_valuation.get_lp_token_prices()
+    with pytest.raises(Exception, match="No price available"):
+        unpriced.get_lp_token_price()
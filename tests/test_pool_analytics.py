@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from algofipy.amm.v1.pool_analytics import CUMSUM_PRICE_SCALE_FACTOR
+
+from benchmarks.pool_analytics_benchmark import (
+    BenchmarkIndexer,
+    make_analytics_pool,
+    simulate_history,
+)
+
+N_ROUNDS = 200
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_windows_match_simulated_swaps(seed):
+    rng = random.Random(seed)
+    history, swaps, prices = simulate_history(rng, N_ROUNDS)
+    indexer = BenchmarkIndexer(history, 0)
+    pool = make_analytics_pool(indexer, N_ROUNDS)
+    queried_rounds = set()
+    for _ in range(40):
+        start_round, end_round = sorted(rng.sample(range(N_ROUNDS), 2))
+        queried_rounds |= set([start_round, end_round])
+        window_swaps = [
+            swap
+            for round_num in range(start_round + 1, end_round + 1)
+            for swap in swaps[round_num]
+        ]
+        start_time = history[start_round]["latest_time"]
+        end_time = history[end_round]["latest_time"]
+        for asset_id in [1, 2]:
+            index = asset_id - 1
+            volume = sum([swap[1] for swap in window_swaps if swap[0] == index])
+            fees = sum([swap[2] for swap in window_swaps if swap[0] == index])
+            assert pool.get_volume(asset_id, start_round, end_round) == volume
+            assert pool.get_fees(asset_id, start_round, end_round) == fees
+
+            vwap = pool.get_vwap(asset_id, start_round, end_round)
+            if volume == 0:
+                assert vwap is None
+            else:
+                expected = sum(
+                    [
+                        swap[1] * swap[3 + index]
+                        for swap in window_swaps
+                        if swap[0] == index
+                    ]
+                ) / (volume * CUMSUM_PRICE_SCALE_FACTOR)
+                assert vwap == pytest.approx(expected, rel=1e-9)
+
+            twap = pool.get_twap(asset_id, start_round, end_round)
+            if end_time == start_time:
+                assert twap is None
+            else:
+                window_prices = [price[index] for price in prices[start_time:end_time]]
+                expected = sum(window_prices) / (
+                    len(window_prices) * CUMSUM_PRICE_SCALE_FACTOR
+                )
+                assert twap == pytest.approx(expected, rel=1e-9)
+
+    # every round was fetched once
+    assert indexer.n_calls == len(queried_rounds)
+
+
+def test_ring_buffer_evicts_oldest_samples():
+    history, _, _ = simulate_history(random.Random(0), 10)
+    pool = make_analytics_pool(BenchmarkIndexer(history, 0), 4)
+    pool.analytics.load_samples(range(6))
+    assert list(pool.analytics.rounds) == list(pool.analytics.samples)
+    assert len(pool.analytics.samples) == 4
+
+
+def test_invalid_asset_id():
+    history, _, _ = simulate_history(random.Random(0), 10)
+    pool = make_analytics_pool(BenchmarkIndexer(history, 0), 10)
+    with pytest.raises(Exception, match="Error: invalid asset id"):
+        pool.get_volume(3, 0, 9)
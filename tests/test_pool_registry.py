@@ -0,0 +1,135 @@
+import base64
+from types import SimpleNamespace
+
+from algofipy.amm.v1.amm_config import POOL_STRINGS, PoolType
+from algofipy.amm.v1.pool_registry import PoolRegistry
+
+from benchmarks._fixtures import make_pool
+
+# the amplification factor ramps from 100 to 200 between timestamps 1000 and 2000
+RAMP = {
+    POOL_STRINGS.initial_amplification_factor: 100,
+    POOL_STRINGS.future_amplification_factor: 200,
+    POOL_STRINGS.initial_amplification_factor_time: 1000,
+    POOL_STRINGS.future_amplification_factor_time: 2000,
+}
+
+
+class Chain:
+    def __init__(self):
+        self.round = 10
+        self.state = dict(
+            [
+                (POOL_STRINGS.balance_1, 10**9),
+                (POOL_STRINGS.balance_2, 10**9),
+                (POOL_STRINGS.lp_circulation, 10**9),
+                (POOL_STRINGS.asset1_reserve, 0),
+                (POOL_STRINGS.asset2_reserve, 0),
+                (POOL_STRINGS.latest_time, 0),
+                (POOL_STRINGS.cumsum_time_weighted_asset1_to_asset2_price, 0),
+                (POOL_STRINGS.cumsum_time_weighted_asset2_to_asset1_price, 0),
+                (POOL_STRINGS.cumsum_volume_asset1, 0),
+                (POOL_STRINGS.cumsum_volume_asset2, 0),
+                (POOL_STRINGS.cumsum_volume_weighted_asset1_to_asset2_price, 0),
+                (POOL_STRINGS.cumsum_volume_weighted_asset2_to_asset1_price, 0),
+                (POOL_STRINGS.cumsum_fees_asset1, 0),
+                (POOL_STRINGS.cumsum_fees_asset2, 0),
+            ]
+            + list(RAMP.items())
+        )
+
+    # blocks are 100 seconds apart, the ramp starts at round 10
+    def get_timestamp(self, round_num):
+        return 100 * round_num
+
+    # algod
+    def status(self):
+        return {"last-round": self.round}
+
+    def block_info(self, block):
+        return {"block": {"ts": self.get_timestamp(block)}}
+
+    # indexer
+    def applications(self, application_id, round_num=None):
+        global_state = [
+            {
+                "key": base64.b64encode(key.encode()).decode(),
+                "value": {"type": 2, "uint": value},
+            }
+            for key, value in self.state.items()
+        ]
+        return {"application": {"params": {"global-state": global_state}}}
+
+
+def make_registry(chain):
+    amm_client = SimpleNamespace(
+        algofi_client=SimpleNamespace(transport=SimpleNamespace(decoder=None))
+    )
+    pool = make_pool(PoolType.NANOSWAP, app_id=5, indexer=chain, amm_client=amm_client)
+    pool.algod = chain
+    pool.load_state()
+    registry = PoolRegistry(amm_client)
+    registry.add(pool)
+    return registry, pool
+
+
+def test_get_pool_refresh_follows_amplification_factor_ramp():
+    chain = Chain()
+    registry, pool = make_registry(chain)
+    assert pool.amplification_factor == 100
+    quote = pool.get_swap_exact_for_quote(1, 10**8)
+
+    chain.round = 15
+    assert registry.get_pool(PoolType.NANOSWAP, 2, 1, refresh=True) is pool
+    assert pool.t == 1500
+    assert pool.amplification_factor == 150
+    assert pool.get_swap_exact_for_quote(1, 10**8) != quote
+
+    # a cached lookup keeps the loaded ramp time
+    chain.round = 30
+    registry.get_pool(PoolType.NANOSWAP, 1, 2)
+    assert pool.amplification_factor == 150
+    registry.get_pool(PoolType.NANOSWAP, 1, 2, refresh=True)
+    assert pool.amplification_factor == 200
+
+
+def test_get_pool_refresh_reloads_ramp():
+    chain = Chain()
+    registry, pool = make_registry(chain)
+
+    # a new ramp towards 300 starting at round 20
+    chain.round = 25
+    chain.state[POOL_STRINGS.initial_amplification_factor] = 200
+    chain.state[POOL_STRINGS.future_amplification_factor] = 300
+    chain.state[POOL_STRINGS.initial_amplification_factor_time] = 2000
+    chain.state[POOL_STRINGS.future_amplification_factor_time] = 3000
+    registry.get_pool(PoolType.NANOSWAP, 1, 2, refresh=True)
+    assert pool.amplification_factor == 250
+
+
+def test_refresh_at_block_uses_block_timestamp():
+    chain = Chain()
+    registry, pool = make_registry(chain)
+
+    chain.round = 30
+    registry.refresh(block=12)
+    assert pool.t == 1200
+    assert pool.amplification_factor == 120
+
+
+def test_registry_indexes():
+    registry = PoolRegistry(None)
+    pool = make_pool(PoolType.CONSTANT_PRODUCT_25BP_FEE, app_id=7)
+    other = make_pool(PoolType.CONSTANT_PRODUCT_75BP_FEE, app_id=8)
+    assert registry.add(pool) is pool
+    assert registry.add(other) is other
+    # a pool of a known type and pair is not replaced
+    duplicate = make_pool(PoolType.CONSTANT_PRODUCT_25BP_FEE, app_id=9)
+    assert registry.add(duplicate) is pool
+
+    assert len(registry) == 2
+    assert registry.get_pool(PoolType.CONSTANT_PRODUCT_25BP_FEE, 2, 1) is pool
+    assert registry.get_pool_by_app_id(8) is other
+    assert registry.get_pool_by_app_id(9) is None
+    assert registry.get_pools_for_pair(2, 1) == [pool, other]
+    assert registry.get_pools_for_pair(1, 3) == []
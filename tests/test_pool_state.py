@@ -0,0 +1,112 @@
+import copy
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+
+from benchmarks._fixtures import make_pool
+
+POOL_TYPES = [PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP]
+
+
+def get_quote(target, rng_state, balance):
+    # the same random operation against a pool or a state
+    rng = random.Random(rng_state)
+    operation = rng.choice(["swap_exact_for", "swap_for_exact", "pool", "burn"])
+    asset_id = rng.choice([1, 2])
+    amount = rng.randint(1, balance // 100)
+    if operation == "swap_exact_for":
+        return target.get_swap_exact_for_quote(asset_id, amount)
+    if operation == "swap_for_exact":
+        return target.get_swap_for_exact_quote(asset_id, amount)
+    if operation == "pool":
+        return target.get_pool_quote(asset_id, amount)
+    return target.get_burn_quote(min(amount, target.lp_circulation // 10))
+
+
+def get_fields(quote):
+    return (
+        quote.asset1_delta,
+        quote.asset2_delta,
+        quote.lp_delta,
+        quote.num_iter,
+        quote.price_delta,
+    )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_applied_states_match_mutated_pool(seed):
+    rng = random.Random(seed)
+    pool_type = POOL_TYPES[seed % 2]
+    balance = rng.randint(10**8, 10**13)
+    pool = make_pool(
+        pool_type, balance, int(balance * rng.uniform(0.5, 2)), lp_circulation="min"
+    )
+    # the reference pool does not memoize stableswap solves
+    reference = make_pool(
+        pool_type,
+        pool.asset1_balance,
+        pool.asset2_balance,
+        lp_circulation="min",
+        stable_swap_engine=StableSwapEngine(cache_size=0),
+    )
+    root = pool.get_state()
+    root_key = root.key
+    state = root
+    for _ in range(20):
+        rng_state = rng.random()
+        quote = get_quote(state, rng_state, balance)
+        assert get_fields(quote) == get_fields(get_quote(reference, rng_state, balance))
+        # a branch from the current state does not change it
+        branch = state.apply(get_quote(state, rng.random(), balance))
+        assert branch is not state
+        state = state.apply(quote)
+        for target in [pool, reference]:
+            target.asset1_balance -= quote.asset1_delta
+            target.asset2_balance -= quote.asset2_delta
+            target.lp_circulation += quote.lp_delta
+        assert state == pool.get_state()
+    assert root.key == root_key
+
+
+def test_state_is_immutable():
+    state = make_pool(
+        PoolType.NANOSWAP, 10**9, 10**9, lp_circulation="min"
+    ).get_state()
+    with pytest.raises(Exception, match="immutable"):
+        state.asset1_balance = 0
+    assert copy.copy(state) is state
+    assert copy.deepcopy(state) is state
+    with pytest.raises(Exception, match="exceeds the pool balances"):
+        state.apply(
+            SimpleNamespace(asset1_delta=10**9 + 1, asset2_delta=0, lp_delta=0)
+        )
+
+
+def test_state_reused_until_pool_changes():
+    pool = make_pool(
+        PoolType.NANOSWAP,
+        10**9,
+        10**9,
+        lp_circulation="min",
+        amplification_factor=10**6,
+    )
+    state = pool.get_state()
+    assert pool.get_state() is state
+
+    pool.asset1_balance += 1
+    assert pool.get_state() is not state
+    state = pool.get_state()
+    pool.swap_fee = 0.0002
+    assert pool.get_state() is not state
+
+    # the amplification factor moves with the pool timestamp during a ramp
+    state = pool.get_state()
+    pool.future_amplification_factor = 2 * 10**6
+    pool.future_amplification_factor_time = 100
+    pool.t = 50
+    assert pool.get_state().amplification_factor == 15 * 10**5
+    assert pool.get_state() != state
@@ -0,0 +1,232 @@
+import base64
+import random
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from algofipy.amm.v1.amm_config import POOL_STRINGS, PoolType
+from algofipy.amm.v1.pool import Pool
+from algofipy.amm.v1.pool_registry import PoolRegistry
+from algofipy.amm.v1.pool_tracker import PoolTracker, TRACKED_FIELDS
+
+from benchmarks._fixtures import BenchmarkAsset, make_pool
+
+ROUTER_APP_ID = 10**6
+# fields written by pool app calls
+FIELDS = list(Pool.series_fields.values())
+RAMP_FIELDS = [
+    POOL_STRINGS.initial_amplification_factor,
+    POOL_STRINGS.future_amplification_factor,
+    POOL_STRINGS.initial_amplification_factor_time,
+    POOL_STRINGS.future_amplification_factor_time,
+]
+# blocks are 4 seconds apart
+ROUND_TIME = 4
+
+
+def encode_key(key):
+    return base64.b64encode(key.encode()).decode()
+
+
+class Chain:
+    def __init__(self, rng, app_ids, stable_swap_app_ids):
+        self.rng = rng
+        self.round = 1
+        # app id -> global state of the pool
+        self.states = {}
+        for app_id in app_ids:
+            self.states[app_id] = dict(
+                [(key, rng.randint(1, 10**12)) for key in FIELDS]
+            )
+            if app_id in stable_swap_app_ids:
+                # the amplification factor ramps from 100 to 200 over rounds 1 to 51
+                self.states[app_id].update(
+                    dict(zip(RAMP_FIELDS, [100, 200, ROUND_TIME, 51 * ROUND_TIME]))
+                )
+        # round -> confirmed transactions
+        self.transactions = {}
+        # arguments of every search
+        self.searches = []
+        self._lock = threading.Lock()
+
+    def get_pool_call(self, app_id):
+        # a swap, pool, burn or flash loan writes a subset of the tracked fields
+        delta = []
+        for key in self.rng.sample(FIELDS, self.rng.randint(1, 8)):
+            self.states[app_id][key] = self.rng.randint(1, 10**12)
+            value = {"action": 2, "uint": self.states[app_id][key]}
+            delta.append({"key": encode_key(key), "value": value})
+        return {
+            "tx-type": "appl",
+            "application-transaction": {"application-id": app_id},
+            "global-state-delta": delta,
+        }
+
+    def get_app_ids(self, transaction):
+        app_ids = set([transaction["application-transaction"]["application-id"]])
+        for inner_transaction in transaction.get("inner-txns", []):
+            app_ids |= self.get_app_ids(inner_transaction)
+        return app_ids
+
+    def advance(self, n_transactions, app_ids=None):
+        self.round += 1
+        app_ids = list(self.states) if app_ids is None else app_ids
+        transactions = []
+        for offset in range(n_transactions):
+            called_app_ids = self.rng.sample(
+                app_ids, min(len(app_ids), self.rng.randint(1, 3))
+            )
+            if len(called_app_ids) == 1:
+                transaction = self.get_pool_call(called_app_ids[0])
+            else:
+                # a router app calling several pools
+                transaction = {
+                    "tx-type": "appl",
+                    "application-transaction": {"application-id": ROUTER_APP_ID},
+                    "inner-txns": [
+                        self.get_pool_call(app_id) for app_id in called_app_ids
+                    ],
+                }
+            transaction["confirmed-round"] = self.round
+            transaction["intra-round-offset"] = offset
+            transaction["round-time"] = self.round * ROUND_TIME
+            transactions.append(transaction)
+        self.transactions[self.round] = transactions
+
+    # indexer
+    def health(self):
+        return {"round": self.round}
+
+    def block_info(self, block=None, header_only=None):
+        return {"round": block, "timestamp": block * ROUND_TIME}
+
+    def applications(self, application_id, round_num=None):
+        global_state = [
+            {"key": encode_key(key), "value": {"type": 2, "uint": value}}
+            for key, value in self.states[application_id].items()
+        ]
+        return {"application": {"params": {"global-state": global_state}}}
+
+    def search_transactions(
+        self, application_id, min_round, max_round, limit, next_page=None
+    ):
+        with self._lock:
+            self.searches.append((application_id, min_round, max_round))
+        # transactions calling the app directly or from an inner app call
+        transactions = [
+            transaction
+            for round_num in range(min_round, max_round + 1)
+            for transaction in self.transactions.get(round_num, [])
+            if application_id in self.get_app_ids(transaction)
+        ]
+        offset = int(next_page or 0)
+        response = {"transactions": transactions[offset : offset + limit]}
+        if offset + limit < len(transactions):
+            response["next-token"] = str(offset + limit)
+        return response
+
+
+class Algod:
+    def __init__(self, chain):
+        self.chain = chain
+
+    def status(self):
+        return {"last-round": self.chain.round}
+
+    def block_info(self, block):
+        return {"block": {"ts": block * ROUND_TIME}}
+
+
+def make_amm_client(chain, n_pools, n_stable_swap_pools=0):
+    amm_client = SimpleNamespace(
+        indexer=chain,
+        algofi_client=SimpleNamespace(transport=SimpleNamespace(decoder=None)),
+    )
+    registry = PoolRegistry(amm_client)
+    for app_id in range(1, n_pools + 1):
+        pool = make_pool(
+            (
+                PoolType.NANOSWAP
+                if app_id <= n_stable_swap_pools
+                else PoolType.CONSTANT_PRODUCT_25BP_FEE
+            ),
+            asset1=BenchmarkAsset(2 * app_id),
+            asset2=BenchmarkAsset(2 * app_id + 1),
+            app_id=app_id,
+            indexer=chain,
+            amm_client=amm_client,
+        )
+        pool.algod = Algod(chain)
+        registry.add(pool)
+    amm_client.pool_registry = registry
+    return amm_client
+
+
+def get_tracked_state(pool, fields):
+    return dict([(key, getattr(pool, TRACKED_FIELDS[key])) for key in fields])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tracked_pools_match_chain(seed):
+    rng = random.Random(seed)
+    chain = Chain(rng, range(1, 31), range(1, 6))
+    amm_client = make_amm_client(chain, 30, n_stable_swap_pools=5)
+    tracker = PoolTracker(amm_client, reconcile_interval=20)
+    tracker.poll()
+    for _ in range(60):
+        for _ in range(rng.randint(0, 3)):
+            chain.advance(rng.randint(0, 40))
+        updated_pools = tracker.poll()
+        for pool in amm_client.pool_registry:
+            state = chain.states[pool.application_id]
+            assert get_tracked_state(pool, state) == state
+        assert updated_pools <= set(amm_client.pool_registry)
+    assert tracker.round == chain.round
+    assert tracker.reconciled_round is not None
+
+
+def test_search_by_tracked_app_id():
+    rng = random.Random(0)
+    # pools 11 to 20 are not tracked
+    chain = Chain(rng, range(1, 21), [])
+    amm_client = make_amm_client(chain, 10)
+    tracker = PoolTracker(amm_client, reconcile_interval=100)
+    tracker.poll()
+    chain.advance(50)
+    chain.advance(50)
+    tracker.poll()
+    assert sorted(chain.searches) == [
+        (app_id, chain.round - 1, chain.round) for app_id in range(1, 11)
+    ]
+    for pool in amm_client.pool_registry:
+        state = chain.states[pool.application_id]
+        assert get_tracked_state(pool, state) == state
+
+
+def test_transactions_calling_several_pools_returned_once():
+    rng = random.Random(0)
+    chain = Chain(rng, range(1, 6), [])
+    amm_client = make_amm_client(chain, 5)
+    tracker = PoolTracker(amm_client)
+    chain.advance(30)
+    transactions = tracker.get_transactions(chain.round, chain.round)
+    assert transactions == chain.transactions[chain.round]
+
+
+def test_untouched_stable_swap_pools_follow_round_time():
+    rng = random.Random(0)
+    chain = Chain(rng, range(1, 4), [1])
+    amm_client = make_amm_client(chain, 3, n_stable_swap_pools=1)
+    pool = amm_client.pool_registry.get_pool_by_app_id(1)
+    tracker = PoolTracker(amm_client, reconcile_interval=1000)
+    tracker.poll()
+    assert pool.amplification_factor == 100
+
+    # only the constant product pools are called
+    for _ in range(25):
+        chain.advance(5, app_ids=[2, 3])
+    updated_pools = tracker.poll()
+    assert pool.t == chain.round * ROUND_TIME
+    assert pool.amplification_factor == 150
+    assert pool in updated_pools
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from benchmarks.router_benchmark import make_router
+
+N_ASSETS = 30
+
+
+def exhaustive_best(registry, asset_in_id, asset_out_id, amount, max_hops):
+    pools_by_asset = {}
+    for pool in registry:
+        pools_by_asset.setdefault(pool.asset1.asset_id, []).append(pool)
+        pools_by_asset.setdefault(pool.asset2.asset_id, []).append(pool)
+
+    best = None
+
+    def search(asset_id, amount, visited, hops):
+        nonlocal best
+        for pool in pools_by_asset.get(asset_id, []):
+            next_asset_id = (
+                pool.asset2.asset_id
+                if pool.asset1.asset_id == asset_id
+                else pool.asset1.asset_id
+            )
+            if next_asset_id in visited:
+                continue
+            try:
+                quote = pool.get_swap_exact_for_quote(asset_id, amount)
+            except Exception:
+                continue
+            out = (
+                quote.asset2_delta
+                if pool.asset1.asset_id == asset_id
+                else quote.asset1_delta
+            )
+            if out <= 0:
+                continue
+            if next_asset_id == asset_out_id:
+                best = out if best is None else max(best, out)
+            elif hops + 1 < max_hops:
+                search(next_asset_id, out, visited | {next_asset_id}, hops + 1)
+
+    search(asset_in_id, amount, {asset_in_id}, 0)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_best_route_matches_exhaustive_search(seed):
+    router, registry = make_router(N_ASSETS, 60, seed=seed)
+    rng = random.Random(seed + 1)
+    for _ in range(50):
+        asset_in_id, asset_out_id = rng.sample(range(1, N_ASSETS + 1), 2)
+        amount = rng.randint(10**3, 10**10)
+        expected = exhaustive_best(
+            registry, asset_in_id, asset_out_id, amount, router.max_hops
+        )
+        route = router.get_best_route(asset_in_id, asset_out_id, amount)
+        assert route.amount_out == expected
+        assert route.asset_ids[0] == asset_in_id
+        assert route.asset_ids[-1] == asset_out_id
@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+
+from algofipy.amm.v1.amm_config import POOL_STRINGS
+from algofipy.amm.v1.pool import Pool
+from algofipy.archive import ArchiveIndexer
+from algofipy.lending.v2.market import Market
+
+from benchmarks._fixtures import make_pool
+from benchmarks.series_benchmark import (
+    BenchmarkIndexer,
+    make_lending_client,
+    make_states,
+)
+
+APP_IDS = [11, 12, 13]
+
+
+def check_series(series, states, app_id, rounds, fields):
+    assert list(series["round"]) == sorted(set(rounds))
+    for name, key in fields.items():
+        assert [int(value) for value in series[name]] == [
+            states[(app_id, round_num)][key] for round_num in series["round"]
+        ]
+
+
+@pytest.fixture
+def rounds():
+    rng = random.Random(0)
+    rounds = [rng.randint(10**7, 2 * 10**7) for _ in range(50)]
+    # duplicate rounds are fetched once
+    return rounds + rounds[:10]
+
+
+def test_pool_series(rounds):
+    states = make_states(random.Random(1), [1], rounds, Pool.series_fields)
+    indexer = BenchmarkIndexer(states, 0)
+    series = make_pool(app_id=1, indexer=indexer).load_series(rounds)
+    check_series(series, states, 1, rounds, Pool.series_fields)
+    assert indexer.n_calls == len(set(rounds))
+
+    # values past the int64 range are kept exactly
+    states[(1, rounds[0])][POOL_STRINGS.cumsum_volume_asset1] = 2**64 - 1
+    series = make_pool(app_id=1, indexer=BenchmarkIndexer(states, 0)).load_series(
+        rounds
+    )
+    assert series["cumsum_volume_asset1"].dtype == object
+    assert series["asset1_balance"].dtype == np.int64
+    check_series(series, states, 1, rounds, Pool.series_fields)
+
+
+def test_market_series(rounds):
+    states = make_states(random.Random(1), APP_IDS, rounds, Market.series_fields)
+    indexer = BenchmarkIndexer(states, 0)
+    lending_client = make_lending_client(APP_IDS, indexer)
+    all_series = lending_client.load_series(rounds)
+    assert indexer.n_calls == len(APP_IDS) * len(set(rounds))
+    for app_id in APP_IDS:
+        check_series(all_series[app_id], states, app_id, rounds, Market.series_fields)
+    market_series = lending_client.markets[12].load_series(rounds)
+    check_series(market_series, states, 12, rounds, Market.series_fields)
+
+
+def test_repeated_series_served_from_archive(rounds, tmp_path):
+    states = make_states(random.Random(1), APP_IDS, rounds, Market.series_fields)
+    indexer = BenchmarkIndexer(states, 0)
+    archive = ArchiveIndexer(str(tmp_path), fallback=indexer)
+    make_lending_client(APP_IDS, archive).load_series(rounds)
+    n_calls = indexer.n_calls
+    all_series = make_lending_client(APP_IDS, archive).load_series(rounds)
+    assert indexer.n_calls == n_calls
+    for app_id in APP_IDS:
+        check_series(all_series[app_id], states, app_id, rounds, Market.series_fields)
@@ -0,0 +1,38 @@
+import random
+
+from benchmarks.split_order_benchmark import (
+    get_output,
+    make_random_balances,
+    make_router,
+)
+
+
+def grid_best(pools, amount, steps):
+    best = 0
+    for i in range(steps + 1):
+        for j in range(steps + 1 - i):
+            amounts = [amount * i // steps, amount * j // steps]
+            amounts.append(amount - sum(amounts))
+            best = max(
+                best,
+                sum(get_output(pool, part) for pool, part in zip(pools, amounts)),
+            )
+    return best
+
+
+def test_split_order_beats_single_pools_and_grid_search():
+    rng = random.Random(0)
+    for _ in range(30):
+        router, pools = make_router(make_random_balances(rng))
+        amount = rng.randint(10**6, min(pool.asset1_balance for pool in pools))
+        split_order = router.get_split_order(1, 2, amount)
+        assert split_order.amount_in == amount
+        assert split_order.amount_out == sum(
+            get_output(pool, part)
+            for pool, part in zip(
+                [hop.venue for hop in split_order.hops], split_order.amounts
+            )
+        )
+        assert split_order.amount_out >= max(get_output(pool, amount) for pool in pools)
+        # the split is optimal up to the chunk size, compare against a coarser grid
+        assert split_order.amount_out >= grid_best(pools, amount, 20)
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from algofipy.amm.v1.amm_config import PoolType
+from algofipy.amm.v1.stable_swap_engine import StableSwapEngine
+from algofipy.amm.v1.stable_swap_math import get_D, get_y
+
+from benchmarks._fixtures import make_pool
+
+BALANCES = [10**12, 11 * 10**11]
+AMPLIFICATION_FACTOR = 10**7
+
+
+def make_nanoswap_pool(rng, stable_swap_engine=None):
+    balance = rng.randint(10**6, 10**14)
+    return make_pool(
+        PoolType.NANOSWAP,
+        balance,
+        int(balance * rng.uniform(0.5, 2)),
+        swap_fee=rng.randint(0, 1000) / 1e6,
+        amplification_factor=rng.choice([10**5, 10**6, 10**7, 10**8]),
+        stable_swap_engine=stable_swap_engine,
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_quotes_match_scalar_quotes(seed):
+    pool = make_nanoswap_pool(random.Random(seed))
+    # the scalar reference does not memoize
+    reference = make_nanoswap_pool(
+        random.Random(seed), stable_swap_engine=StableSwapEngine(cache_size=0)
+    )
+    rng = random.Random(seed + 1)
+    amounts = [rng.randint(1, pool.asset1_balance // 2) for _ in range(20)]
+    for asset_id in [1, 2]:
+        batch = pool.get_swap_exact_for_quotes(asset_id, amounts)
+        for i, amount in enumerate(amounts):
+            quote = reference.get_swap_exact_for_quote(asset_id, amount)
+            assert quote.asset1_delta == batch.asset1_delta[i]
+            assert quote.asset2_delta == batch.asset2_delta[i]
+            assert quote.num_iter == batch.num_iter[i]
+            assert quote.price_delta == batch.price_delta[i]
+        out_amounts = [amount // 4 for amount in amounts]
+        batch = pool.get_swap_for_exact_quotes(asset_id, out_amounts)
+        for i, amount in enumerate(out_amounts):
+            quote = reference.get_swap_for_exact_quote(asset_id, amount)
+            assert quote.asset1_delta == batch.asset1_delta[i]
+            assert quote.asset2_delta == batch.asset2_delta[i]
+            assert quote.num_iter == batch.num_iter[i]
+
+
+def get_xs(n_amounts):
+    rng = random.Random(0)
+    return [BALANCES[0] + rng.randint(10**6, 10**11) for _ in range(n_amounts)]
+
+
+def test_cold_solves_match_solver_and_keep_no_starting_points():
+    engine = StableSwapEngine()
+    D, _ = get_D(BALANCES, AMPLIFICATION_FACTOR)
+    for x in get_xs(200):
+        assert engine.get_y(0, 1, x, BALANCES, D, AMPLIFICATION_FACTOR) == get_y(
+            0, 1, x, BALANCES, D, AMPLIFICATION_FACTOR
+        )
+    assert len(engine._y_solutions) == 0
+
+
+def test_warm_start_solutions_are_capped():
+    engine = StableSwapEngine(max_warm_start_solutions=16)
+    D, _ = get_D(BALANCES, AMPLIFICATION_FACTOR)
+    xs = get_xs(200)
+    for x in xs + xs:
+        engine.get_y(0, 1, x, BALANCES, D, AMPLIFICATION_FACTOR, warm_start=True)
+    [solutions] = engine._y_solutions.values()
+    assert len(solutions) == 16
+    assert solutions == sorted(set(solutions))
+
+    # a cold solve of the same amounts adds no starting points
+    for x in xs:
+        engine.get_y(0, 1, x, BALANCES, D, AMPLIFICATION_FACTOR)
+    assert (
+        len(engine._y_solutions[(0, 1, tuple(BALANCES), D, AMPLIFICATION_FACTOR)]) == 16
+    )
+
+
+def test_warm_start_within_one_of_cold_solve():
+    engine = StableSwapEngine()
+    xs = get_xs(500)
+    _, _, cold = engine.get_y_batch(0, 1, xs, BALANCES, AMPLIFICATION_FACTOR)
+    engine.clear()
+    _, _, warm = engine.get_y_batch(
+        0, 1, xs, BALANCES, AMPLIFICATION_FACTOR, warm_start=True
+    )
+    for (y_cold, _), (y_warm, _) in zip(cold, warm):
+        assert abs(y_cold - y_warm) <= 1
+    # warm started iteration counts are not the on-chain counts
+    assert sum([n for (_, n) in warm]) < sum([n for (_, n) in cold])
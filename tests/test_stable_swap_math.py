@@ -0,0 +1,60 @@
+"""
+Property tests of the two asset stableswap solvers against the generic N asset solvers
+"""
+
+import random
+
+import pytest
+
+from algofipy.amm.v1.stable_swap_math import (
+    get_D_2,
+    get_D_initial_2,
+    get_D_n,
+    get_y_2,
+    get_y_initial_2,
+    get_y_n,
+)
+
+
+def make_cases(n_cases, seed=0):
+    # balanced and imbalanced pools across amplification factors, with a swap in balance
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n_cases):
+        x0 = rng.randint(10**3, 10**15)
+        ratio = rng.choice([rng.uniform(0.9, 1.1), rng.uniform(0.01, 100)])
+        x1 = max(int(x0 * ratio), 1)
+        amp = rng.choice([10**5, 10**6, 10**7, 10**8, 10**9])
+        x = rng.randint(1, x0 * 2)
+        cases.append((x0, x1, amp, x))
+    return cases
+
+
+CASES = make_cases(500)
+
+
+@pytest.mark.parametrize("x0, x1, amp, x", CASES)
+def test_get_D_2_matches_get_D_n(x0, x1, amp, x):
+    assert get_D_2(x0, x1, amp) == get_D_n([x0, x1], amp)
+
+
+@pytest.mark.parametrize("x0, x1, amp, x", CASES)
+def test_get_D_2_guessed_start(x0, x1, amp, x):
+    D, _ = get_D_n([x0, x1], amp)
+    D_guessed, _ = get_D_2(x0, x1, amp, D_initial=get_D_initial_2(x0, x1, amp))
+    assert abs(D_guessed - D) <= 1
+
+
+@pytest.mark.parametrize("x0, x1, amp, x", CASES)
+def test_get_y_2_matches_get_y_n(x0, x1, amp, x):
+    D, _ = get_D_n([x0, x1], amp)
+    for i, j in [(0, 1), (1, 0)]:
+        assert get_y_2(x, D, amp) == get_y_n(i, j, x, [x0, x1], D, amp)
+
+
+@pytest.mark.parametrize("x0, x1, amp, x", CASES)
+def test_get_y_2_guessed_start(x0, x1, amp, x):
+    D, _ = get_D_n([x0, x1], amp)
+    y, _ = get_y_n(0, 1, x, [x0, x1], D, amp)
+    y_guessed, _ = get_y_2(x, D, amp, y_initial=get_y_initial_2(x, D, amp))
+    assert abs(y_guessed - y) <= 1
@@ -0,0 +1,44 @@
+import random
+
+from algofipy.amm.v1.amm_config import PoolType
+
+from benchmarks._fixtures import make_pool
+from benchmarks.swap_bounds_benchmark import bisect_max_swap_in_amount, meets
+
+MAX_SLIPPAGES = [0.0005, 0.001, 0.005, 0.01, 0.05, 0.2]
+
+
+def test_bounds_meet_their_ratio_exactly():
+    rng = random.Random(0)
+    for _ in range(40):
+        pool_type = rng.choice([PoolType.CONSTANT_PRODUCT_25BP_FEE, PoolType.NANOSWAP])
+        balance = rng.randint(10**6, 10**13)
+        pool = make_pool(
+            pool_type,
+            balance,
+            int(balance * rng.uniform(0.3, 3)),
+            amplification_factor=rng.choice([10**5, 10**6, 10**7, 10**8]),
+        )
+        for swap_in_asset_id in [1, 2]:
+            spot_swap_rate = pool.get_spot_swap_rate(swap_in_asset_id)
+            bounds = pool.get_max_swap_in_amounts(
+                swap_in_asset_id, max_slippages=MAX_SLIPPAGES
+            )
+            for max_slippage, bound in zip(MAX_SLIPPAGES, bounds):
+                min_output_ratio = spot_swap_rate * (1 - max_slippage)
+                scalar_bound = pool.get_max_swap_in_amount(
+                    swap_in_asset_id, max_slippage=max_slippage
+                )
+                assert scalar_bound == pool.get_max_swap_in_amount(
+                    swap_in_asset_id, min_output_ratio=min_output_ratio
+                )
+                bisected = bisect_max_swap_in_amount(
+                    pool, swap_in_asset_id, min_output_ratio
+                )
+                for solved in [int(bound), scalar_bound]:
+                    assert meets(pool, swap_in_asset_id, solved, min_output_ratio)
+                    assert not meets(
+                        pool, swap_in_asset_id, solved + 1, min_output_ratio
+                    )
+                    # quotes round to whole units, so the edge is ragged
+                    assert abs(solved - bisected) / max(bisected, 1) < 1e-5